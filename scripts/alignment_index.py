@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Persistent EN ↔ target block alignment index.
+
+Pairs each markdown block of docs/en/<article>.md with its counterpart in
+docs/<lang>/<article>.md, so an English change can be applied to the exact
+paragraph of the translation that corresponds to it.
+
+Blocks are matched on language-independent structural fingerprints: block
+kind (heading level, list, table, code, quote, image, html, paragraph), line
+count, link targets and numbers. The two block sequences are aligned with
+difflib on the full fingerprints first; runs that differ are then aligned
+on block kind alone. Blocks with no counterpart are left unpaired.
+
+The index is stored in a local SQLite database (default:
+.cache/alignment.sqlite3; override with TRANSLATION_ALIGNMENT_INDEX, or set
+it to "off" to keep alignments in memory only). One entry per article and
+language holds the block ids, fingerprints and line offsets, and the hashes
+of the source and translation they were computed from. TranslationAgent
+refreshes the entry whenever it saves a translation. An entry whose hashes
+no longer match (e.g. after a reviewer edited the translation) is rebuilt
+on the next lookup.
+
+A fresh checkout starts with an empty index (the database is not committed):
+the first lookup of each article aligns it in full, locally, and stores the
+result. The auto-translate workflow restores and saves the database with
+actions/cache so CI update runs start warm; a cache miss only costs that
+one-off full alignment.
+
+Usage:
+    # Show the alignment of one article
+    python scripts/alignment_index.py --file docs/en/quick_start.md --language es
+
+    # Rebuild the index for every translated article
+    python scripts/alignment_index.py --rebuild
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import difflib
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from translation_memory import block_kind
+
+
+DEFAULT_INDEX_PATH = Path('.cache') / 'alignment.sqlite3'
+
+_HEADING = re.compile(r'^\ufeff?(#{1,6})\s')
+_FENCE = re.compile(r'^\s*(```|~~~)')
+_LINK_TARGET = re.compile(r'\]\(([^)\s]+)')
+_NUMBER = re.compile(r'\d[\d,. ]*\d|\d')
+
+
+def block_spans(lines: List[str]) -> List[Tuple[int, int]]:
+    """
+    Markdown blocks as [start, end) line ranges: runs of non-blank lines,
+    with every heading a block of its own and fenced code kept whole
+    """
+    blocks = []
+    start, fence = None, None
+    for index, line in enumerate(lines):
+        if fence:
+            if line.strip().startswith(fence):
+                fence = None
+            continue
+        fence_match = _FENCE.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+        if not line.strip():
+            if start is not None:
+                blocks.append((start, index))
+                start = None
+        elif _HEADING.match(line):
+            if start is not None:
+                blocks.append((start, index))
+            blocks.append((index, index + 1))
+            start = None
+        elif start is None:
+            start = index
+    if start is not None:
+        blocks.append((start, len(lines)))
+    return blocks
+
+
+def fingerprint(block: str) -> str:
+    """
+    Language-independent fingerprint of a block:
+    'kind|shape|link targets|numbers'. The shape is the line count of lists,
+    tables and code (paragraph wrapping differs between languages); digit
+    separators are ignored.
+    """
+    kind = block_kind(block.lstrip('\ufeff'))
+    shape = block.count('\n') + 1 if kind in ('list', 'table', 'code') else ''
+    links = ','.join(_LINK_TARGET.findall(block))
+    numbers = ','.join(re.sub(r'\D', '', n) for n in _NUMBER.findall(_LINK_TARGET.sub('](', block)))
+    return f"{kind}|{shape}|{links}|{numbers}"
+
+
+@dataclass(frozen=True)
+class BlockPair:
+    """One source block and its counterpart in the translation (target None if unpaired)"""
+    id: str
+    fingerprint: str
+    source: Tuple[int, int]
+    target: Optional[Tuple[int, int]]
+
+
+def _kind(fp: str) -> str:
+    return fp.split('|', 1)[0]
+
+
+def align(source_text: str, target_text: str) -> List[BlockPair]:
+    """Pair the blocks of a source document with the blocks of its translation"""
+    source_lines, target_lines = source_text.split('\n'), target_text.split('\n')
+    source_blocks, target_blocks = block_spans(source_lines), block_spans(target_lines)
+    source_fps = [fingerprint('\n'.join(source_lines[s:e])) for s, e in source_blocks]
+    target_fps = [fingerprint('\n'.join(target_lines[s:e])) for s, e in target_blocks]
+
+    mapping: Dict[int, int] = {}
+    matcher = difflib.SequenceMatcher(None, source_fps, target_fps, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            mapping.update(zip(range(i1, i2), range(j1, j2)))
+        elif tag == 'replace':
+            # Same structure, different details (reworded numbers, localized links)
+            kinds = difflib.SequenceMatcher(
+                None, [_kind(fp) for fp in source_fps[i1:i2]], [_kind(fp) for fp in target_fps[j1:j2]],
+                autojunk=False,
+            )
+            for block in kinds.get_matching_blocks():
+                mapping.update(zip(range(i1 + block.a, i1 + block.a + block.size),
+                                   range(j1 + block.b, j1 + block.b + block.size)))
+
+    pairs = []
+    for index, (start, end) in enumerate(source_blocks):
+        digest = hashlib.sha1('\n'.join(source_lines[start:end]).encode('utf-8')).hexdigest()[:8]
+        target = mapping.get(index)
+        pairs.append(BlockPair(
+            id=f"{index}-{digest}",
+            fingerprint=source_fps[index],
+            source=(start, end),
+            target=target_blocks[target] if target is not None else None,
+        ))
+    return pairs
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def index_path() -> Optional[Path]:
+    """Index database for this process, or None if persistence is disabled"""
+    configured = os.getenv('TRANSLATION_ALIGNMENT_INDEX')
+    if configured is None:
+        return DEFAULT_INDEX_PATH
+    if configured.strip().lower() in ('', 'off', 'none', '0'):
+        return None
+    return Path(configured)
+
+
+class Alignment:
+    """The block pairs of one article and language, with O(log n) line lookups"""
+
+    def __init__(self, pairs: List[BlockPair]):
+        self.pairs = pairs
+        self._starts = [pair.source[0] for pair in pairs]
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def block_at(self, line: int) -> Optional[int]:
+        """Index of the source block containing a line (None for blank lines)"""
+        index = bisect_right(self._starts, line) - 1
+        if index >= 0 and line < self.pairs[index].source[1]:
+            return index
+        return None
+
+    def block_before(self, line: int) -> Optional[int]:
+        """Index of the last source block ending at or before a line"""
+        index = bisect_right(self._starts, line) - 1
+        while index >= 0 and self.pairs[index].source[1] > line:
+            index -= 1
+        return index if index >= 0 else None
+
+    @property
+    def coverage(self) -> float:
+        return sum(pair.target is not None for pair in self.pairs) / len(self.pairs) if self.pairs else 1.0
+
+
+class AlignmentIndex:
+    """Persistent alignments keyed by (source path, language)"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite database file (default: index_path()). With persistence
+                  disabled, alignments are only kept for this process.
+        """
+        self.path = Path(path) if path else index_path()
+        self._conn = None
+        self._memory: Dict[Tuple[str, str], Tuple[str, str, List[BlockPair]]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alignments (
+                    source_path TEXT NOT NULL,
+                    language    TEXT NOT NULL,
+                    source_hash TEXT NOT NULL,
+                    target_hash TEXT NOT NULL,
+                    blocks      TEXT NOT NULL,
+                    updated_at  TEXT NOT NULL,
+                    PRIMARY KEY (source_path, language)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load(self, source_path: str, language: str) -> Optional[Tuple[str, str, List[BlockPair]]]:
+        key = (str(source_path), language)
+        if key in self._memory:
+            return self._memory[key]
+        conn = self._connect()
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT source_hash, target_hash, blocks FROM alignments WHERE source_path = ? AND language = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        pairs = [
+            BlockPair(b['id'], b['fingerprint'], tuple(b['source']),
+                      tuple(b['target']) if b['target'] is not None else None)
+            for b in json.loads(row[2])
+        ]
+        self._memory[key] = (row[0], row[1], pairs)
+        return self._memory[key]
+
+    def update(self, source_path: str, language: str, source_text: str, target_text: str) -> Alignment:
+        """Align a source and its translation and store the result"""
+        pairs = align(source_text, target_text)
+        key = (str(source_path), language)
+        entry = (_hash(source_text), _hash(target_text), pairs)
+        with self._lock:
+            self._memory[key] = entry
+            conn = self._connect()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO alignments VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, entry[0], entry[1], json.dumps([asdict(p) for p in pairs]),
+                     datetime.now().isoformat(timespec='seconds')),
+                )
+                conn.commit()
+        return Alignment(pairs)
+
+    def get(self, source_path: str, language: str, source_text: str, target_text: str) -> Alignment:
+        """
+        The alignment of a source and its translation: the stored one if it
+        was computed from these exact texts, otherwise a fresh (stored) one
+        """
+        with self._lock:
+            entry = self._load(source_path, language)
+        if entry and entry[0] == _hash(source_text) and entry[1] == _hash(target_text):
+            return Alignment(entry[2])
+        return self.update(source_path, language, source_text, target_text)
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        if conn is None:
+            return {'entries': len(self._memory)}
+        return {'entries': conn.execute("SELECT COUNT(*) FROM alignments").fetchone()[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show or rebuild EN ↔ target block alignments')
+    parser.add_argument('--file', help='English source document')
+    parser.add_argument('--language', choices=['es', 'fr', 'ar'], help='Target language')
+    parser.add_argument('--rebuild', action='store_true', help='Re-align every translated article')
+    parser.add_argument('--docs-root', default='docs', help='Docs root (default: docs)')
+    args = parser.parse_args()
+
+    index = AlignmentIndex()
+    docs = Path(args.docs_root)
+
+    if args.rebuild:
+        count = 0
+        for source in sorted((docs / 'en').glob('*.md')):
+            for lang in ('es', 'fr', 'ar'):
+                target = docs / lang / source.name
+                if target.exists():
+                    index.update(str(source), lang, source.read_text(encoding='utf-8'),
+                                 target.read_text(encoding='utf-8'))
+                    count += 1
+        print(f"✅ Aligned {count} translations ({index.path or 'in memory'})")
+        return
+
+    if not args.file or not args.language:
+        parser.error('--file and --language are required (or use --rebuild)')
+    target = docs / args.language / Path(args.file).name
+    alignment = index.get(args.file, args.language, Path(args.file).read_text(encoding='utf-8'),
+                          target.read_text(encoding='utf-8'))
+    print(f"🔗 {args.file} ↔ {target}: {len(alignment)} blocks, {alignment.coverage:.0%} paired")
+    for pair in alignment.pairs:
+        where = f"{pair.target[0] + 1}-{pair.target[1]}" if pair.target else "—"
+        print(f"  {pair.id:<14} {pair.source[0] + 1:>4}-{pair.source[1]:<4} → {where:<9} {pair.fingerprint}")
+
+
+if __name__ == '__main__':
+    main()
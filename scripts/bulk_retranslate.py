@@ -18,13 +18,40 @@ Usage:
   
   # Dry run to preview
   python scripts/bulk_retranslate.py --language es --dry-run
+
+  # Offline token, cost and time estimate (no API calls)
+  python scripts/bulk_retranslate.py --language es fr ar --estimate
+
+  # Translate each file's languages with at most 2 requests in flight
+  python scripts/bulk_retranslate.py --language es fr ar --concurrency 2
+
+  # Translate up to 8 file/language pairs at once, across files
+  python scripts/bulk_retranslate.py --language es fr ar --workers 8
+
+  # Submit everything as one Message Batch (half price, no rate limiting)
+  python scripts/bulk_retranslate.py --language es fr ar --batch
+
+  # Send simple articles to a faster, cheaper model
+  python scripts/bulk_retranslate.py --language es fr ar --route
+
+  # Continue an interrupted run: skip the pairs the job journal marks as done
+  python scripts/bulk_retranslate.py --language es fr ar --resume
+
+  # Only the pairs whose source, skill bundle or model changed since they were translated
+  python scripts/bulk_retranslate.py --language es fr ar --stale-only
+
+  # Unattended refresh: stop scheduling new translations once $20 has been spent
+  python scripts/bulk_retranslate.py --language es fr ar --workers 8 --max-cost 20
 """
 
+import io
 import os
 import sys
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 import time
 from datetime import datetime
 
@@ -35,20 +62,60 @@ if str(scripts_dir) not in sys.path:
 
 # Import the translation agent
 try:
-    from translation_agent import TranslationAgent
+    from translation_agent import TranslationAgent, DEFAULT_CONCURRENCY, SECTIONS_MEMORY_NOTICE, collect_usage
+    from translation_batch import BatchRunner, DEFAULT_POLL_INTERVAL
+    from model_routing import RouteTable, load_routes
+    from translation_manifest import source_hash
+    from job_journal import JobJournal
+    import usage_log
+    import run_estimate
 except ImportError:
     print("❌ Error: Could not import translation_agent.py", file=sys.stderr)
     print("Make sure you're running this script from the repository root or scripts directory.", file=sys.stderr)
     sys.exit(1)
 
 
+class _ThreadOutput(io.TextIOBase):
+    """
+    sys.stdout/sys.stderr stand-in for worker threads: text written by a
+    thread that is capturing goes to that thread's buffer, everything else
+    to the real stream
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
 class BulkRetranslator:
     """Handles bulk retranslation of documentation files"""
     
     def __init__(self, languages: List[str], dry_run: bool = False,
-                 verbose: bool = False, delay: float = 0.5,
+                 verbose: bool = False, delay: float = 0.0,
                  include_transifex: bool = False, auto_transifex: bool = False,
-                 include_collect: bool = False):
+                 include_collect: bool = False,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 use_cache: bool = True,
+                 use_memory: bool = False,
+                 ui_strings: str = 'full',
+                 sections: bool = False,
+                 batch: bool = False,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 routes: Optional[RouteTable] = None,
+                 estimate: bool = False,
+                 workers: Optional[int] = None,
+                 journal: Optional[JobJournal] = None,
+                 resume: bool = False,
+                 stale_only: bool = False,
+                 max_cost: Optional[float] = None,
+                 max_tokens: Optional[int] = None):
         """
         Initialize bulk retranslator
 
@@ -56,10 +123,29 @@ class BulkRetranslator:
             languages: List of target languages (e.g., ['es', 'fr', 'ar'])
             dry_run: If True, only show what would be translated without doing it
             verbose: Show detailed output
-            delay: Delay in seconds between translations (to avoid rate limits)
+            delay: Optional fixed delay in seconds between files (requests are
+                   already paced by the shared rate limiter)
             include_transifex: Always include Transifex UI strings for every file
             auto_transifex: Per-file heuristic — include Transifex only when needed
             include_collect: Always include KoboCollect strings
+            concurrency: Maximum number of a file's languages translated at the same time
+            use_cache: Reuse cached translations whose inputs are unchanged
+            use_memory: Reuse approved paragraph translations (translation memory)
+            ui_strings: 'full' or 'retrieval' (inject only the UI strings each file uses)
+            sections: Split long files at H2 headings and translate sections in parallel
+            batch: Submit every file/language pair as one Message Batch
+            poll_interval: Seconds between batch status checks (batch mode)
+            routes: Model route table (see model_routing.py); None for the standard model
+            estimate: Only estimate tokens, cost and time offline (see run_estimate.py)
+            workers: Translate up to this many file/language pairs at once in a
+                     thread pool, across files (None: file by file)
+            journal: Job journal recording the status of every pair (see job_journal.py)
+            resume: Skip pairs the journal marks as done for the same source and skill
+            stale_only: Only translate pairs whose inputs changed since the translation
+                        recorded in the manifest (see translation_manifest.py)
+            max_cost: Stop scheduling new pairs once this run has spent this many USD
+            max_tokens: Stop scheduling new pairs once this run has used this many
+                        tokens (uncached and cached prompt tokens plus output)
         """
         self.languages = languages
         self.dry_run = dry_run
@@ -68,10 +154,30 @@ class BulkRetranslator:
         self.include_transifex = include_transifex
         self.auto_transifex = auto_transifex
         self.include_collect = include_collect
+        self.concurrency = concurrency
+        self.use_cache = use_cache
+        self.use_memory = use_memory
+        self.ui_strings = ui_strings
+        self.sections = sections
+        self.batch = batch
+        self.poll_interval = poll_interval
+        self.routes = routes
+        self.estimate = estimate
+        self.workers = workers
+        self.journal = journal
+        self.resume = resume
+        self.stale_only = stale_only
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self._job_hashes = {}
         self.agent = None if dry_run else TranslationAgent(
             test_mode=True,
             include_transifex=include_transifex,
             include_collect=include_collect,
+            use_cache=use_cache,
+            use_memory=use_memory,
+            ui_strings=ui_strings,
+            routes=routes,
         )
         
         # Track statistics
@@ -81,11 +187,20 @@ class BulkRetranslator:
             'successful': 0,
             'failed': 0,
             'skipped': 0,
+            'up_to_date': 0,
+            'over_budget': 0,
             'total_cost': 0.0,
+            'total_tokens': 0,
             'start_time': None,
             'end_time': None,
         }
         self.failed_files = []
+        # Exact usage of this run's API calls per language and per file (see usage_log.py)
+        self.usage: Dict[str, Dict[str, Dict]] = {'language': {}, 'file': {}}
+        # Usage of the pairs that have finished, for the budget (updated as each one ends)
+        self._spent = usage_log.totals([])
+        self._budget_reason: Optional[str] = None
+        self._stats_lock = threading.Lock()
     
     def get_source_files(self, source_dir: Path = None, 
                         file_list: Optional[List[str]] = None) -> List[Path]:
@@ -117,7 +232,7 @@ class BulkRetranslator:
         
         return files
     
-    def translate_file(self, source_file: Path, target_lang: str) -> tuple[bool, float]:
+    def translate_file(self, source_file: Path, target_lang: str) -> tuple[bool, List[Dict]]:
         """
         Translate a single file to target language
         
@@ -126,53 +241,115 @@ class BulkRetranslator:
             target_lang: Target language code
         
         Returns:
-            Tuple of (success: bool, cost: float)
+            Tuple of (success: bool, usage records of the API calls it made)
         """
         if self.dry_run:
             print(f"  [DRY RUN] Would translate {source_file.name} → {target_lang}")
-            return True, 0.0
+            return True, []
+
+        agent = self._agent_for(source_file)
+
+        with collect_usage() as records:
+            try:
+                # Translate the file
+                if self.sections:
+                    translation = agent.translate_sections(
+                        str(source_file), target_lang, max_concurrency=self.concurrency
+                    )
+                else:
+                    translation = agent.translate_file(
+                        str(source_file),
+                        target_lang,
+                        complexity=None  # Auto-detect
+                    )
+                success = self._save(agent, translation, source_file, target_lang)
+
+            except Exception as e:
+                print(f"  ❌ Failed: {e}", file=sys.stderr)
+                success = False
+        self._charge(records)
+        return success, records
+
+    def translate_languages(self, source_file: Path,
+                            languages: Optional[List[str]] = None) -> Dict[str, tuple[bool, List[Dict]]]:
+        """
+        Translate a single file to every target language concurrently
+
+        Args:
+            source_file: Path to source file
+            languages: Languages to translate into (default: all of self.languages)
+
+        Returns:
+            Dictionary mapping language code to (success: bool, usage records
+            of the API calls made for that language)
+        """
+        languages = languages or self.languages
+        if self.dry_run:
+            for lang in languages:
+                print(f"  [DRY RUN] Would translate {source_file.name} → {lang}")
+            return {lang: (True, []) for lang in languages}
+
+        agent = self._agent_for(source_file)
 
-        # Per-file auto-transifex: rebuild agent if needed
+        with collect_usage() as records:
+            try:
+                translations = agent.translate_languages(
+                    str(source_file),
+                    languages,
+                    complexity=None,  # Auto-detect
+                    max_concurrency=self.concurrency,
+                    sections=self.sections,
+                )
+            except Exception as e:
+                print(f"  ❌ Failed: {e}", file=sys.stderr)
+                translations = None
+        self._charge(records)
+
+        results = {}
+        for lang in languages:
+            # Calls made before a failure are billed too
+            usage = [entry for entry in records if entry['language'] == lang]
+            if translations is None:
+                results[lang] = (False, usage)
+                continue
+            translation = translations[lang]
+            if isinstance(translation, Exception):
+                print(f"  ❌ Failed ({lang}): {translation}", file=sys.stderr)
+                results[lang] = (False, usage)
+                continue
+            try:
+                results[lang] = (self._save(agent, translation, source_file, lang), usage)
+            except Exception as e:
+                print(f"  ❌ Failed ({lang}): {e}", file=sys.stderr)
+                results[lang] = (False, usage)
+        return results
+
+    def _agent_for(self, source_file: Path) -> TranslationAgent:
+        """Return the agent to use for this file (per-file auto-transifex)"""
         agent = self.agent
-        if self.auto_transifex and not self.include_transifex:
+        if self.auto_transifex and not self.include_transifex and self.ui_strings == 'full':
             needs_tx = TranslationAgent.needs_transifex(str(source_file))
             if needs_tx != agent.include_transifex:
                 if self.verbose:
                     flag = "ON" if needs_tx else "OFF"
                     print(f"  🔍 auto-transifex {flag} for {source_file.name}", file=sys.stderr)
-                agent = TranslationAgent(
-                    test_mode=True,
-                    include_transifex=needs_tx,
-                    include_collect=self.include_collect,
-                )
+                # Pooled: shares the client, caches and skill files with the base agent
+                agent = agent.variant(include_transifex=needs_tx)
+        return agent
 
-        try:
-            # Translate the file
-            translation = agent.translate_file(
-                str(source_file),
-                target_lang,
-                complexity=None  # Auto-detect
-            )
-            
-            # Save translation
-            target_path = agent.save_translation(
-                translation,
-                str(source_file),
-                target_lang
-            )
-            
-            if self.verbose:
-                print(f"  ✅ Saved to: {target_path}", file=sys.stderr)
-            
-            # Estimate cost (rough approximation based on typical usage)
-            # You could enhance this by tracking actual costs from the agent
-            cost = 0.15  # Placeholder - actual cost varies by file size
-            
-            return True, cost
-            
-        except Exception as e:
-            print(f"  ❌ Failed: {e}", file=sys.stderr)
-            return False, 0.0
+    def _save(self, agent: TranslationAgent, translation: str, source_file: Path,
+              target_lang: str) -> bool:
+        """Save a translation and return True (saving errors are raised)"""
+        target_path = agent.save_translation(
+            translation,
+            str(source_file),
+            target_lang
+        )
+        
+        if self.verbose:
+            print(f"  ✅ Saved to: {target_path}", file=sys.stderr)
+        
+        return True
     
     def run(self, source_dir: Path = None, file_list: Optional[List[str]] = None):
         """
@@ -214,34 +391,260 @@ class BulkRetranslator:
                 print(f"  • {f.name}")
             print()
         
-        # Process each file
-        for i, source_file in enumerate(source_files, 1):
-            print(f"[{i}/{len(source_files)}] {source_file.name}")
+        jobs = self._plan(source_files)
+
+        if self.estimate and not self.dry_run:
+            self._print_estimate(jobs)
+            return
+
+        if self.batch and not self.dry_run:
+            self._run_batch(jobs)
+            self.stats['end_time'] = datetime.now()
+            self._print_summary()
+            return
+
+        if self.workers and not self.dry_run:
+            self._run_workers(jobs)
+            self.stats['end_time'] = datetime.now()
+            self._print_summary()
+            return
+
+        # Process each file; its languages are translated concurrently
+        pending: Dict[Path, List[str]] = {}
+        for source_file, lang in jobs:
+            pending.setdefault(source_file, []).append(lang)
+        for i, (source_file, languages) in enumerate(pending.items(), 1):
+            if self._over_budget():
+                self._stop_scheduling(sum(len(langs) for langs in list(pending.values())[i - 1:]))
+                break
+
+            print(f"[{i}/{len(pending)}] {source_file.name}")
             
-            # Translate to each language
-            for lang in self.languages:
-                print(f"  → {lang.upper()}", end=" ", flush=True)
-                
-                success, cost = self.translate_file(source_file, lang)
-                
-                if success:
-                    self.stats['successful'] += 1
-                    self.stats['total_cost'] += cost
-                    print("✅")
-                else:
-                    self.stats['failed'] += 1
-                    self.failed_files.append((source_file.name, lang))
-                    print("❌")
-                
-                # Delay between translations to avoid rate limits
-                if not self.dry_run and self.delay > 0:
-                    time.sleep(self.delay)
+            results = self.translate_languages(source_file, languages)
+            
+            for lang in languages:
+                success, usage = results[lang]
+                print(f"  → {lang.upper()}", end=" ")
+                self._record(source_file, lang, success, usage)
+                print("✅" if success else "❌")
+            
+            # Optional fixed delay between files (pacing is done by the rate limiter)
+            if not self.dry_run and self.delay > 0:
+                time.sleep(self.delay)
             
             print()
         
         self.stats['end_time'] = datetime.now()
         self._print_summary()
     
+    def _plan(self, source_files: List[Path]) -> List[tuple[Path, str]]:
+        """
+        The file/language pairs this run translates, in order. With stale_only,
+        pairs the manifest shows as up to date are left out. With a journal,
+        every pair is recorded as pending; with resume, pairs already done for
+        the same source and skill context are skipped.
+        """
+        if self.dry_run or (self.journal is None and not self.stale_only):
+            return [(source_file, lang) for source_file in source_files for lang in self.languages]
+
+        jobs = []
+        reasons: Dict[str, int] = {}
+        for source_file in source_files:
+            agent, source = self._agent_for(source_file), source_hash(source_file)
+            for lang in self.languages:
+                if self.stale_only:
+                    stale = agent.manifest.stale_reasons(
+                        str(source_file), lang, source, agent.skill_bundle_hash(lang),
+                        agent._file_model(str(source_file)),
+                    )
+                    if not stale:
+                        self.stats['up_to_date'] += 1
+                        continue
+                    for reason in stale:
+                        reasons[reason] = reasons.get(reason, 0) + 1
+                if self.journal is not None:
+                    hashes = (source, agent.skill_hash(lang))
+                    self._job_hashes[(source_file, lang)] = hashes
+                    if self.resume and self.journal.is_done(str(source_file), lang, *hashes):
+                        self.stats['skipped'] += 1
+                        continue
+                    self.journal.mark(str(source_file), lang, *hashes, 'pending')
+                jobs.append((source_file, lang))
+
+        if self.stale_only:
+            detail = ', '.join(f"{reason}: {count}" for reason, count in sorted(reasons.items()))
+            stale = self.stats['total_translations'] - self.stats['up_to_date']
+            print(f"🧾 Stale: {stale} of {self.stats['total_translations']} translations"
+                  + (f" ({detail})" if detail else ""))
+        if self.resume:
+            print(f"⏭️  Resuming: {self.stats['skipped']} translations already done, {len(jobs)} to go")
+        if self.stale_only or self.resume:
+            print()
+        return jobs
+
+    def _run_batch(self, pairs: List[tuple[Path, str]]):
+        """Translate every file/language pair through the Message Batches API"""
+        jobs = self._within_budget(
+            [(self._agent_for(source_file), str(source_file), lang) for source_file, lang in pairs]
+        )
+        if not jobs:
+            return
+        with collect_usage() as records:
+            results = BatchRunner(poll_interval=self.poll_interval).run(jobs)
+        self._charge(records)
+        print()
+
+        for agent, source_path, lang in jobs:
+            source_file = Path(source_path)
+            result = results[(source_path, lang)]
+            print(f"{source_file.name} → {lang.upper()}", end=" ")
+            success = False
+            if isinstance(result, Exception):
+                print(f"❌ {result}")
+            else:
+                try:
+                    success = self._save(agent, result, source_file, lang)
+                    print("✅")
+                except Exception as e:
+                    print(f"❌ {e}")
+
+            usage = [entry for entry in records if entry['file'] == source_path and entry['language'] == lang]
+            self._record(source_file, lang, success, usage)
+        print()
+
+    def _run_workers(self, jobs: List[tuple[Path, str]]):
+        """
+        Translate every file/language pair in a pool of self.workers threads.
+
+        Each pair's output is captured and printed as one block, in job order,
+        as soon as the pairs before it have finished. A failed pair is
+        reported and counted without affecting the others. Once the budget is
+        reached, pairs that have not started yet are not scheduled.
+        """
+        stdout, stderr = sys.stdout, sys.stderr
+        capture_out, capture_err = _ThreadOutput(stdout), _ThreadOutput(stderr)
+
+        def work(source_file: Path, lang: str):
+            # Checked when a worker picks the pair up, so pairs already running finish
+            if self._over_budget():
+                return None, [], ''
+            buffer = io.StringIO()
+            capture_out.local.buffer = capture_err.local.buffer = buffer
+            try:
+                try:
+                    success, usage = self.translate_file(source_file, lang)
+                except Exception as e:
+                    print(f"  ❌ Failed: {e}", file=sys.stderr)
+                    success, usage = False, []
+            finally:
+                capture_out.local.buffer = capture_err.local.buffer = None
+            return success, usage, buffer.getvalue()
+
+        print(f"🧵 {len(jobs)} translations on {self.workers} workers")
+        print()
+        not_scheduled = 0
+        sys.stdout, sys.stderr = capture_out, capture_err
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(work, source_file, lang) for source_file, lang in jobs]
+                for i, ((source_file, lang), future) in enumerate(zip(jobs, futures), 1):
+                    success, usage, output = future.result()
+                    if success is None:
+                        not_scheduled += 1
+                        continue
+                    stdout.write(f"[{i}/{len(jobs)}] {source_file.name} → {lang.upper()}\n{output}")
+                    stdout.write(f"  {'✅' if success else '❌'}\n\n")
+                    stdout.flush()
+                    self._record(source_file, lang, success, usage)
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+        if not_scheduled:
+            self._stop_scheduling(not_scheduled)
+
+    def _record(self, source_file: Path, lang: str, success: bool, records: List[Dict]):
+        """
+        Count one finished translation in the run statistics and the journal,
+        with the usage records of its API calls (failed pairs are paid for too)
+        """
+        usage = usage_log.totals(records)
+        hashes = self._job_hashes.get((source_file, lang))
+        if self.journal is not None and hashes:
+            self.journal.mark(str(source_file), lang, *hashes, 'done' if success else 'failed',
+                              usage['cost_usd'])
+        with self._stats_lock:
+            if success:
+                self.stats['successful'] += 1
+            else:
+                self.stats['failed'] += 1
+                self.failed_files.append((source_file.name, lang))
+            self.stats['total_cost'] += usage['cost_usd']
+            self.stats['total_tokens'] += usage_log.total_tokens(usage)
+            for group, key in (('language', lang), ('file', source_file.name)):
+                totals = self.usage[group].setdefault(key, usage_log.totals([]))
+                for field in ('calls', 'input_tokens', 'output_tokens', 'cache_read_tokens',
+                              'cache_write_tokens', 'cost_usd'):
+                    totals[field] += usage[field]
+
+    def _charge(self, records: List[Dict]):
+        """Add the usage of a finished job to what the run has spent"""
+        usage = usage_log.totals(records)
+        with self._stats_lock:
+            for field in ('calls', 'input_tokens', 'output_tokens', 'cache_read_tokens',
+                          'cache_write_tokens', 'cost_usd'):
+                self._spent[field] += usage[field]
+
+    def _over_budget(self) -> bool:
+        """True once the pairs that have finished have reached max_cost or max_tokens"""
+        if self.max_cost is None and self.max_tokens is None:
+            return False
+        with self._stats_lock:
+            if self._budget_reason is None:
+                spent = self._spent
+                tokens = usage_log.total_tokens(spent)
+                if self.max_cost is not None and spent['cost_usd'] >= self.max_cost:
+                    self._budget_reason = f"${spent['cost_usd']:.2f} spent, --max-cost ${self.max_cost:.2f}"
+                elif self.max_tokens is not None and tokens >= self.max_tokens:
+                    self._budget_reason = f"{tokens:,} tokens used, --max-tokens {self.max_tokens:,}"
+            return self._budget_reason is not None
+
+    def _stop_scheduling(self, remaining: int):
+        """Count the pairs left unscheduled because the budget was reached"""
+        self.stats['over_budget'] += remaining
+        print(f"🛑 Budget reached ({self._budget_reason}): "
+              f"{remaining} translations not scheduled")
+        print()
+
+    def _within_budget(self, jobs: List[tuple]) -> List[tuple]:
+        """
+        Batch mode: the leading jobs whose estimated usage fits the budget.
+        A batch is submitted at once, so the budget is applied to the offline
+        estimate (see run_estimate.py) before anything is sent.
+        """
+        if self.max_cost is None and self.max_tokens is None:
+            return jobs
+        estimates = run_estimate.estimate_jobs(jobs, self.concurrency, batch=True,
+                                               calibration=run_estimate.calibrate(self.agent))
+        cost = tokens = 0
+        for count, estimate in enumerate(estimates):
+            cost += estimate.cost_usd
+            tokens += estimate.prompt_tokens + estimate.output_tokens
+            if ((self.max_cost is not None and cost > self.max_cost)
+                    or (self.max_tokens is not None and tokens > self.max_tokens)):
+                self._budget_reason = (f"estimated ${cost:.2f} / {tokens:,} tokens for "
+                                       f"{count + 1} translations")
+                self._stop_scheduling(len(jobs) - count)
+                return jobs[:count]
+        return jobs
+
+    def _print_estimate(self, pairs: List[tuple[Path, str]]):
+        """Estimate the run offline: tokens, prompt-cache reads/writes, cost and time"""
+        jobs = [(self._agent_for(source_file), str(source_file), lang) for source_file, lang in pairs]
+        calibration = run_estimate.calibrate(self.agent)
+        estimates = run_estimate.estimate_jobs(jobs, self.concurrency, self.batch, calibration, self.workers)
+        run_estimate.print_estimate(estimates, self.concurrency, self.batch, calibration, self.verbose,
+                                    self.workers)
+        print("=" * 70)
+
     def _print_summary(self):
         """Print summary statistics"""
         duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
@@ -253,10 +656,29 @@ class BulkRetranslator:
         print(f"Total translations: {self.stats['total_translations']}")
         print(f"✅ Successful: {self.stats['successful']}")
         print(f"❌ Failed: {self.stats['failed']}")
+        if self.stats['skipped']:
+            print(f"⏭️  Skipped (already done): {self.stats['skipped']}")
+        if self.stats['up_to_date']:
+            print(f"🧾 Skipped (up to date): {self.stats['up_to_date']}")
+        if self.stats['over_budget']:
+            print(f"🛑 Not scheduled (budget reached): {self.stats['over_budget']} "
+                  f"— continue with --resume")
         print(f"⏱️  Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
         
         if not self.dry_run:
-            print(f"💰 Estimated cost: ${self.stats['total_cost']:.2f}")
+            print(f"💰 Cost: ${self.stats['total_cost']:.2f} ({self.stats['total_tokens']:,} tokens)")
+            for lang, totals in sorted(self.usage['language'].items()):
+                print(f"  • {lang.upper()}: ${totals['cost_usd']:.2f}, {totals['calls']} calls, "
+                      f"{totals['input_tokens']:,} in / {totals['output_tokens']:,} out, "
+                      f"cache {totals['cache_read_tokens']:,} read / {totals['cache_write_tokens']:,} write")
+            # Most expensive files first; all of them with --verbose
+            files = sorted(self.usage['file'].items(), key=lambda item: -item[1]['cost_usd'])
+            files = [(name, totals) for name, totals in files if totals['calls']]
+            if files:
+                print("  Most expensive files:" if not self.verbose and len(files) > 5 else "  Per file:")
+                for name, totals in files if self.verbose else files[:5]:
+                    print(f"    {name}: ${totals['cost_usd']:.4f} "
+                          f"({usage_log.total_tokens(totals):,} tokens, {totals['calls']} calls)")
             if self.stats['successful'] > 0:
                 avg_time = duration / self.stats['successful']
                 print(f"⚡ Avg time per translation: {avg_time:.1f} seconds")
@@ -287,6 +709,9 @@ Examples:
   
   # Dry run to see what would be translated
   python bulk_retranslate.py --language es --dry-run
+
+  # Estimate tokens, cost and time offline
+  python bulk_retranslate.py --language es fr ar --estimate
   
   # Retranslate with custom source directory
   python bulk_retranslate.py --language es --source-dir docs/en
@@ -319,6 +744,13 @@ Examples:
         action='store_true',
         help='Show what would be translated without actually translating'
     )
+
+    parser.add_argument(
+        '--estimate',
+        action='store_true',
+        help='Estimate prompt/output tokens, prompt-cache reads and writes, cost and '
+             'time offline (no API calls), calibrated against the usage log'
+    )
     
     parser.add_argument(
         '--verbose', '-v',
@@ -329,14 +761,15 @@ Examples:
     parser.add_argument(
         '--delay',
         type=float,
-        default=0.5,
-        help='Delay in seconds between translations (default: 0.5, to avoid rate limits)'
+        default=0.0,
+        help='Fixed delay in seconds between files (default: 0; requests are paced '
+             'by the rate limiter from the API rate-limit headers)'
     )
     
     parser.add_argument(
         '--no-delay',
         action='store_true',
-        help='Disable delay between translations (use with caution)'
+        help='Disable any delay between files'
     )
     parser.add_argument(
         '--include-transifex',
@@ -355,9 +788,122 @@ Examples:
         action='store_true',
         help='Include KoboCollect Android strings for every file (~60-70k chars per call).'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Maximum concurrent API requests per file (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='Translate up to N file/language pairs at once, across files, in a thread '
+             'pool (requests are paced by the shared rate limiter). Default: file by file'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip file/language pairs the job journal marks as done for the same source '
+             'and skill context; retry failed and pending ones'
+    )
+    parser.add_argument(
+        '--stale-only',
+        action='store_true',
+        help='Only translate pairs whose source, skill bundle or model changed since the '
+             'translation recorded in docs/translation-manifest.json (or with no entry)'
+    )
+    parser.add_argument(
+        '--max-cost',
+        type=float,
+        metavar='USD',
+        help='Stop scheduling new translations once the finished ones have cost this much. '
+             'Only checked before a translation starts: the ones already in flight still '
+             'finish, so the run can spend more than USD. With --batch, applied to the estimate'
+    )
+    parser.add_argument(
+        '--max-tokens',
+        type=int,
+        metavar='N',
+        help='Stop scheduling new translations once the finished ones have used this many '
+             'tokens (prompt, cached prompt and output). Checked like --max-cost'
+    )
+    parser.add_argument(
+        '--journal',
+        metavar='PATH',
+        help='Job journal file (default: .cache/bulk_journal.sqlite3)'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Submit all file/language pairs as one Message Batch and wait for the results '
+             '(half price, no per-request rate limiting; may take up to 24h)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f'Seconds between batch status checks (default: {DEFAULT_POLL_INTERVAL})'
+    )
+    parser.add_argument(
+        '--sections',
+        action='store_true',
+        help='Split long files at H2 headings and translate the sections in parallel'
+    )
+    parser.add_argument(
+        '--ui-strings',
+        choices=['full', 'retrieval'],
+        default='full',
+        help="'retrieval': inject only the Transifex/KoboCollect rows whose English string "
+             "appears in each file, instead of the full tables (default: full)"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always call the API, ignoring cached translations in .cache/'
+    )
+    parser.add_argument(
+        '--translation-memory',
+        action='store_true',
+        help='Reuse approved paragraph translations from docs/<lang> '
+             '(do not use when retranslating to apply skill changes)'
+    )
+    parser.add_argument(
+        '--route',
+        nargs='?',
+        const='',
+        metavar='ROUTES_JSON',
+        help='Pick model and max_tokens by complexity (simple articles go to a faster '
+             'model). Optionally a JSON file overriding routes; see model_routing.py'
+    )
 
     args = parser.parse_args()
 
+    try:
+        routes = load_routes(args.route) if args.route is not None else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid --route table: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.batch and args.sections:
+        print("❌ --batch cannot be combined with --sections", file=sys.stderr)
+        sys.exit(1)
+    if args.sections and args.translation_memory:
+        print(SECTIONS_MEMORY_NOTICE, file=sys.stderr)
+
+    if args.stale_only and args.dry_run:
+        print("❌ --stale-only needs the skill context; preview with --estimate or "
+              "python scripts/translation_manifest.py --stale", file=sys.stderr)
+        sys.exit(1)
+
+    if any(limit is not None and limit <= 0 for limit in (args.max_cost, args.max_tokens)):
+        print("❌ --max-cost and --max-tokens must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers is not None and args.workers < 1:
+        print("❌ --workers must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
     # Handle delay
     delay = 0 if args.no_delay else args.delay
 
@@ -367,6 +913,10 @@ Examples:
         print(f"❌ Source directory not found: {source_dir}", file=sys.stderr)
         sys.exit(1)
 
+    if args.estimate:
+        # Requests are only built, never sent: no real key is needed
+        os.environ.setdefault('ANTHROPIC_API_KEY', 'offline-estimate')
+
     # Create retranslator
     retranslator = BulkRetranslator(
         languages=args.language,
@@ -376,6 +926,21 @@ Examples:
         include_transifex=args.include_transifex,
         auto_transifex=args.auto_transifex,
         include_collect=args.include_collect,
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        use_memory=args.translation_memory,
+        ui_strings=args.ui_strings,
+        sections=args.sections,
+        batch=args.batch,
+        poll_interval=args.poll_interval,
+        routes=routes,
+        estimate=args.estimate,
+        workers=args.workers,
+        journal=None if args.dry_run or args.estimate else JobJournal(args.journal),
+        resume=args.resume,
+        stale_only=args.stale_only,
+        max_cost=args.max_cost,
+        max_tokens=args.max_tokens,
     )
     
     # Run bulk retranslation
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Cached feature profile of a source document.
+
+The translation heuristics (needs_transifex, determine_complexity, section
+mode) all look at the same source file. Instead of each one re-reading the
+file and running its own scans, a DocumentProfile runs every scan once
+per document content (one regex pass per feature) and is cached by
+content hash:
+
+  - length, lines, headings, section sizes (H2 sections, see split_sections)
+  - fenced code blocks, markdown links, UI templates ({{ui:...}}, {{collect:...}})
+  - brand-term and UI-term counts used for the complexity level
+  - quoted / bold / explicit / all-caps UI marker counts used for Transifex
+
+Source files are read through read_document(), which keeps the text of each
+file until its mtime or size changes, so preflight over the whole corpus
+reads every file once.
+
+Usage:
+    # Profile every English article
+    python scripts/document_profile.py docs/en/*.md
+
+    # As JSON
+    python scripts/document_profile.py docs/en/quick_start.md --json
+"""
+
+import re
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+# Terms counted for the complexity level
+BRAND_TERMS = ('KoboToolbox', 'Formbuilder', 'Question Library',
+               'Global Server', 'European Union', 'XLSForm')
+UI_TERMS = ('DEPLOY', 'NEW', 'FORM', 'DATA', 'Settings', 'Save')
+
+# Complexity thresholds
+SIMPLE_MAX_CHARS = 1000     # shorter documents without brand terms are 'simple'
+COMPLEX_MIN_CHARS = 3000    # longer documents are 'complex'
+COMPLEX_MIN_TERMS = 5       # as are documents with more brand or UI terms
+
+# needs_transifex: weighted UI marker score at which the Transifex table is loaded
+TRANSIFEX_MIN_SCORE = 10
+
+# Profiles and file contents kept in memory (the docs corpus is a few hundred files)
+MAX_CACHED = 1024
+
+# Quoted UI element names (e.g. 'Export log data', "SETTINGS")
+_QUOTED_UI = re.compile(r"[\"'`‘’“”][A-Z][^\"'`\n]{2,40}[\"'`‘’“”]")
+# Bold UI element references: **SETTINGS**, **Deploy**
+_BOLD_UI = re.compile(r'\*\*[A-Z][A-Za-z ]{1,30}\*\*')
+# Explicit UI tab/button/menu markers
+_EXPLICIT_UI = re.compile(
+    r'\b(?:tab|button|menu|dialog|dropdown|modal|toggle|sidebar|panel|page|section)\b',
+    re.IGNORECASE)
+# All-caps UI strings (DATA, FORM, SETTINGS, DEPLOY…)
+_ALLCAPS_UI = re.compile(r'\b[A-Z]{3,}\b')
+_LINK = re.compile(r'\[[^\]\n]*\]\(')
+_TEMPLATE = re.compile(r'\{\{(?:ui|collect):[^}]*\}\}')
+
+
+@dataclass(frozen=True)
+class DocumentProfile:
+    """Features of one source document, computed once per content and cached"""
+    content_hash: str
+    length: int
+    lines: int
+    headings: int
+    section_sizes: Tuple[int, ...]   # characters per H2 section (see split_sections)
+    code_blocks: int
+    links: int
+    templates: int
+    brand_terms: int
+    ui_terms: int
+    quoted_ui: int
+    bold_ui: int
+    explicit_ui: int
+    allcaps_ui: int
+
+    @property
+    def transifex_score(self) -> int:
+        return self.quoted_ui * 3 + self.bold_ui * 2 + self.explicit_ui + self.allcaps_ui
+
+    @property
+    def needs_transifex(self) -> bool:
+        """Does the document reference enough UI elements to load the full Transifex table?"""
+        return self.transifex_score >= TRANSIFEX_MIN_SCORE
+
+    @property
+    def complexity(self) -> str:
+        """'simple', 'standard' or 'complex'"""
+        # Simple: Short with no brand terms
+        if self.length < SIMPLE_MAX_CHARS and self.brand_terms == 0:
+            return 'simple'
+        # Complex: Long or many brand/UI terms
+        if (self.length > COMPLEX_MIN_CHARS or self.brand_terms > COMPLEX_MIN_TERMS
+                or self.ui_terms > COMPLEX_MIN_TERMS):
+            return 'complex'
+        # Standard: Most documents
+        return 'standard'
+
+
+def _section_starts(content: str) -> Tuple[List[int], int, int]:
+    """
+    One pass over the lines of a markdown document.
+
+    Returns:
+        (offsets where H2 sections start, fenced code blocks, headings)
+        Headings inside fenced code are ignored; the first section starts at 0.
+    """
+    starts = [0]
+    offset = 0
+    in_fence = False
+    code_blocks = 0
+    headings = 0
+    for line in content.splitlines(keepends=True):
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+            code_blocks += in_fence
+        elif not in_fence and line.startswith('#'):
+            headings += 1
+            if line.startswith('## ') and offset > starts[-1]:
+                starts.append(offset)
+        offset += len(line)
+    return starts, code_blocks, headings
+
+
+def split_sections(content: str) -> List[str]:
+    """
+    Split markdown at H2 headings (ignoring headings inside fenced code).
+    The first section holds everything before the first H2.
+    Joining the sections returns the original content.
+    """
+    starts, _, _ = _section_starts(content)
+    ends = starts[1:] + [len(content)]
+    return [content[start:end] for start, end in zip(starts, ends)]
+
+
+_profiles: 'OrderedDict[str, DocumentProfile]' = OrderedDict()
+_documents: 'OrderedDict[str, Tuple[int, int, str]]' = OrderedDict()
+_lock = threading.Lock()
+
+
+def _remember(cache: OrderedDict, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHED:
+        cache.popitem(last=False)
+
+
+def profile_text(content: str) -> DocumentProfile:
+    """Profile of a document's text (cached by content hash)"""
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    with _lock:
+        cached = _profiles.get(content_hash)
+    if cached is not None:
+        return cached
+
+    starts, code_blocks, headings = _section_starts(content)
+    ends = starts[1:] + [len(content)]
+    profile = DocumentProfile(
+        content_hash=content_hash,
+        length=len(content),
+        lines=content.count('\n') + (1 if content and not content.endswith('\n') else 0),
+        headings=headings,
+        section_sizes=tuple(end - start for start, end in zip(starts, ends)),
+        code_blocks=code_blocks,
+        links=len(_LINK.findall(content)),
+        templates=len(_TEMPLATE.findall(content)),
+        brand_terms=sum(content.count(term) for term in BRAND_TERMS),
+        ui_terms=sum(content.count(term) for term in UI_TERMS),
+        quoted_ui=len(_QUOTED_UI.findall(content)),
+        bold_ui=len(_BOLD_UI.findall(content)),
+        explicit_ui=len(_EXPLICIT_UI.findall(content)),
+        allcaps_ui=len(_ALLCAPS_UI.findall(content)),
+    )
+    with _lock:
+        _remember(_profiles, content_hash, profile)
+    return profile
+
+
+def read_document(path) -> str:
+    """Text of a source file, re-read only when its mtime or size changes"""
+    path = Path(path)
+    stat = path.stat()
+    key = str(path.resolve())
+    with _lock:
+        cached = _documents.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    content = path.read_text(encoding='utf-8')
+    with _lock:
+        _remember(_documents, key, (stat.st_mtime_ns, stat.st_size, content))
+    return content
+
+
+def profile_file(path) -> DocumentProfile:
+    """Profile of a source file"""
+    return profile_text(read_document(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the feature profile of source documents')
+    parser.add_argument('files', nargs='+', help='Markdown files to profile')
+    parser.add_argument('--json', action='store_true', help='Print the profiles as JSON')
+    args = parser.parse_args()
+
+    profiles: Dict[str, Dict] = {}
+    for file_path in args.files:
+        try:
+            profile = profile_file(file_path)
+        except OSError as e:
+            print(f"❌ {file_path}: {e}", file=sys.stderr)
+            continue
+        profiles[file_path] = {**asdict(profile), 'complexity': profile.complexity,
+                               'needs_transifex': profile.needs_transifex}
+
+    if args.json:
+        print(json.dumps(profiles, indent=2, ensure_ascii=False))
+        return
+
+    for file_path, p in profiles.items():
+        transifex = '🔤 transifex' if p['needs_transifex'] else ''
+        print(f"📄 {file_path}: {p['complexity']}, {p['length']:,} chars, "
+              f"{len(p['section_sizes'])} sections, {p['code_blocks']} code blocks, "
+              f"{p['links']} links, {p['templates']} templates {transifex}".rstrip())
+
+
+if __name__ == '__main__':
+    main()
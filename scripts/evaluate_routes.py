@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation of a model route table (see model_routing.py).
+
+Replays a fixed corpus through two tables, the candidate (built-in --route
+table or a JSON file) and the baseline (the standard model everywhere), and
+reports per route: model, calls, validation pass-rate, mean latency and cost.
+
+The corpus is the first --per-class files of each complexity level, in name
+order, so repeated runs measure the same documents. For diff mode, each
+document's first prose paragraph is replayed as a diff. Requests whose route
+is the same in both tables are sent once and counted for both.
+
+Full files are checked with TranslationAgent.validate_translation(); diffs
+with validate_diff() below. Nothing is saved and the translation cache is
+bypassed, but every call is recorded in the usage log.
+
+Usage:
+    # Which documents and routes would be evaluated (no API calls)
+    python scripts/evaluate_routes.py --dry-run
+
+    # Evaluate the built-in table on Spanish and French
+    python scripts/evaluate_routes.py --language es fr
+
+    # Evaluate a custom table, results as JSON
+    python scripts/evaluate_routes.py --routes routes.json --json
+"""
+
+import sys
+import json
+import time
+import argparse
+import contextlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+import usage_log
+from document_profile import profile_file, profile_text, read_document
+from model_routing import FIXED_ROUTES, COMPLEXITIES, RouteTable, load_routes, route_for
+
+
+# Diff samples: first prose paragraph of at least this many characters
+MIN_DIFF_CHARS = 80
+
+# Markdown blocks that are not prose
+NON_PROSE_PREFIXES = ('#', '!', '|', '```', '<', '-', '*', '>')
+
+
+def select_corpus(files: List[str], per_class: int) -> List[str]:
+    """The first per_class files (in name order) of each complexity level"""
+    by_class: Dict[str, List[str]] = {complexity: [] for complexity in COMPLEXITIES}
+    for path in sorted(files):
+        selected = by_class[profile_file(path).complexity]
+        if len(selected) < per_class:
+            selected.append(path)
+    return [path for complexity in COMPLEXITIES for path in by_class[complexity]]
+
+
+def diff_sample(content: str) -> Optional[str]:
+    """A document's first prose paragraph, replayed as a small diff"""
+    for block in content.split('\n\n'):
+        block = block.strip()
+        if len(block) >= MIN_DIFF_CHARS and not block.startswith(NON_PROSE_PREFIXES):
+            return block
+    return None
+
+
+def validate_diff(diff: str, translation: str) -> Dict:
+    """Basic checks on a translated diff (cf. TranslationAgent.validate_translation)"""
+    ratio = len(translation) / max(1, len(diff))
+    checks = {
+        'has_content': len(translation.strip()) > 0,
+        'no_markers': 'BEGIN DIFF' not in translation and 'END DIFF' not in translation,
+        'preserves_links': translation.count('](') >= diff.count(']('),
+        'preserves_bold': translation.count('**') == diff.count('**'),
+        'similar_length': 0.5 <= ratio <= 2.0,
+    }
+    checks['passed'] = all(checks.values())
+    return checks
+
+
+def _default_agent(routes: RouteTable):
+    from translation_agent import TranslationAgent
+    return TranslationAgent(test_mode=True, use_cache=False, routes=routes)
+
+
+def evaluate(corpus: List[str], languages: List[str], tables: Dict[str, RouteTable],
+             modes=('new', 'diff'),
+             agent_factory: Callable[[RouteTable], object] = _default_agent) -> List[Dict]:
+    """
+    Translate the corpus with each route table.
+
+    Returns:
+        One result per (table, file, mode, language): route, latency, cost,
+        validation checks and error (if the request failed)
+    """
+    results = []
+    measured = {}  # (mode, file, language, route) → result
+    for table, routes in tables.items():
+        agent = agent_factory(routes)
+        for path in corpus:
+            content = read_document(path)
+            for mode in modes:
+                text = content if mode == 'new' else diff_sample(content)
+                if text is None:
+                    continue
+                complexity = profile_text(text).complexity
+                route = route_for(routes, mode, complexity)
+                for lang in languages:
+                    key = (mode, path, lang, route)
+                    if key not in measured:
+                        measured[key] = _replay(agent, path, lang, mode, text)
+                    results.append({
+                        'table': table, 'file': path, 'language': lang, 'mode': mode,
+                        'complexity': complexity, 'model': route.model,
+                        'max_tokens': route.max_tokens, **measured[key],
+                    })
+    return results
+
+
+def _replay(agent, path: str, lang: str, mode: str, text: str) -> Dict:
+    """Send one request and measure it; progress output goes to stderr"""
+    print(f"🧪 {Path(path).name} → {lang.upper()} ({mode})", file=sys.stderr)
+    seen = len(usage_log.session_records(path, lang))
+    started = time.monotonic()
+    checks, error = {}, None
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if mode == 'new':
+                translation = agent.translate_file(path, lang)
+                checks = agent.validate_translation(path, translation, lang)
+            else:
+                translation = agent.translate_diff(text, lang, source_path=path)
+                checks = validate_diff(text, translation)
+        except Exception as e:
+            error = str(e)
+            print(f"  ❌ {error}", file=sys.stderr)
+    records = usage_log.session_records(path, lang)[seen:]
+    return {
+        'latency_s': round(time.monotonic() - started, 3),
+        'cost_usd': round(sum(r['cost_usd'] for r in records), 6),
+        'output_tokens': sum(r['output_tokens'] for r in records),
+        'passed': bool(checks.get('passed')) and error is None,
+        'failed_checks': sorted(k for k, ok in checks.items() if k != 'passed' and not ok),
+        'error': error,
+    }
+
+
+def summarize_results(results: List[Dict]) -> Dict[str, Dict]:
+    """Totals per table and route ('table: mode/complexity')"""
+    groups: Dict[str, Dict] = {}
+    for result in results:
+        key = f"{result['table']}: {result['mode']}/{result['complexity']}"
+        totals = groups.setdefault(key, {
+            'model': result['model'], 'calls': 0, 'passed': 0,
+            'latency_s': 0.0, 'cost_usd': 0.0,
+        })
+        totals['calls'] += 1
+        totals['passed'] += result['passed']
+        totals['latency_s'] += result['latency_s']
+        totals['cost_usd'] += result['cost_usd']
+    for totals in groups.values():
+        totals['pass_rate'] = totals['passed'] / totals['calls']
+        totals['mean_latency_s'] = totals['latency_s'] / totals['calls']
+        totals['mean_cost_usd'] = totals['cost_usd'] / totals['calls']
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure a model route table against the standard model')
+    parser.add_argument('--files', nargs='+', help='Candidate corpus (default: docs/en/*.md)')
+    parser.add_argument('--per-class', type=int, default=3,
+                        help='Documents per complexity level (default: 3)')
+    parser.add_argument('--language', nargs='+', default=['es'], choices=['es', 'fr', 'ar'],
+                        help='Target languages (default: es)')
+    parser.add_argument('--routes', help='JSON file overriding built-in routes (see model_routing.py)')
+    parser.add_argument('--modes', nargs='+', default=['new', 'diff'], choices=['new', 'diff'])
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show the corpus and its routes without calling the API')
+    parser.add_argument('--json', action='store_true', help='Print results and totals as JSON')
+    args = parser.parse_args()
+
+    files = args.files or [str(p) for p in Path('docs/en').glob('*.md')]
+    corpus = select_corpus(files, args.per_class)
+    tables = {'routed': load_routes(args.routes), 'baseline': FIXED_ROUTES}
+
+    if args.dry_run:
+        print(f"🧪 {len(corpus)} documents × {len(args.language)} languages")
+        for path in corpus:
+            content = read_document(path)
+            for mode in args.modes:
+                text = content if mode == 'new' else diff_sample(content)
+                if text is None:
+                    continue
+                complexity = profile_text(text).complexity
+                route = route_for(tables['routed'], mode, complexity)
+                print(f"  • {path} [{mode}/{complexity}] → {route.model} "
+                      f"(max_tokens {route.max_tokens})")
+        return
+
+    results = evaluate(corpus, args.language, tables, args.modes)
+    groups = summarize_results(results)
+
+    if args.json:
+        print(json.dumps({'results': results, 'routes': groups}, indent=2, ensure_ascii=False))
+        return
+
+    print(f"\n📊 Route evaluation ({len(corpus)} documents, {', '.join(args.language)})")
+    for key, totals in sorted(groups.items()):
+        print(f"  • {key} → {totals['model']}: {totals['calls']} calls, "
+              f"{totals['pass_rate']:.0%} passed, "
+              f"{totals['mean_latency_s']:.1f}s mean latency, "
+              f"${totals['mean_cost_usd']:.4f} mean cost (${totals['cost_usd']:.4f} total)")
+    errors = [r for r in results if r['error']]
+    if errors:
+        print(f"  ⚠️  {len(errors)} requests failed", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
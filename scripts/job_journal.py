@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+On-disk job journal for resumable bulk runs.
+
+bulk_retranslate.py records every file/language job it plans and finishes
+in a local SQLite database (default: .cache/bulk_journal.sqlite3). A job is
+identified by its source file and language, and stores the hashes of the
+source content and of the skill context it was (or will be) translated
+with, its status ('pending', 'done' or 'failed') and its cost.
+
+With --resume, jobs whose last status is 'done' for the same source and
+skill hashes are skipped, so an interrupted run (Ctrl-C, CI job timeout)
+continues where it stopped. Editing the source or the language's skill
+makes its jobs due again.
+
+Usage:
+    # Status counts of the journal
+    python scripts/job_journal.py --stats
+
+    # Jobs that are not done yet
+    python scripts/job_journal.py --pending
+
+    # Forget every job
+    python scripts/job_journal.py --clear
+"""
+
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_JOURNAL_PATH = Path('.cache') / 'bulk_journal.sqlite3'
+
+STATUSES = ('pending', 'done', 'failed')
+
+
+class JobJournal:
+    """Status of every bulk translation job, keyed by (source file, language)"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite database file (default: .cache/bulk_journal.sqlite3).
+                  The file and its directory are created on first use.
+        """
+        self.path = Path(path) if path else DEFAULT_JOURNAL_PATH
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    source_path TEXT NOT NULL,
+                    language    TEXT NOT NULL,
+                    source_hash TEXT NOT NULL,
+                    skill_hash  TEXT NOT NULL,
+                    status      TEXT NOT NULL,
+                    cost_usd    REAL,
+                    updated_at  TEXT NOT NULL,
+                    PRIMARY KEY (source_path, language)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def is_done(self, source_path: str, language: str, source_hash: str, skill_hash: str) -> bool:
+        """True if the job last finished successfully with these exact inputs"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status, source_hash, skill_hash FROM jobs WHERE source_path = ? AND language = ?",
+                (str(source_path), language),
+            ).fetchone()
+        return row == ('done', source_hash, skill_hash)
+
+    def mark(self, source_path: str, language: str, source_hash: str, skill_hash: str,
+             status: str, cost: Optional[float] = None):
+        """Record the status of a job (replacing its previous entry)"""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown job status {status!r}")
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(source_path), language, source_hash, skill_hash, status, cost,
+                 datetime.now().isoformat(timespec='seconds')),
+            )
+            conn.commit()
+
+    def jobs(self, status: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """(source_path, language, status) of every job, optionally of one status"""
+        query = "SELECT source_path, language, status FROM jobs"
+        params: Tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            return self._connect().execute(query + " ORDER BY source_path, language", params).fetchall()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: dict(rows).get(status, 0) for status in STATUSES}
+
+    def clear(self) -> int:
+        """Remove every job; returns how many were removed"""
+        with self._lock:
+            conn = self._connect()
+            count = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            conn.execute("DELETE FROM jobs")
+            conn.commit()
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the bulk retranslation job journal')
+    parser.add_argument('--journal', help=f'Journal file (default: {DEFAULT_JOURNAL_PATH})')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--stats', action='store_true', help='Show job counts per status')
+    action.add_argument('--pending', action='store_true', help='List jobs that are not done')
+    action.add_argument('--clear', action='store_true', help='Remove every job')
+    args = parser.parse_args()
+
+    journal = JobJournal(Path(args.journal) if args.journal else None)
+    if args.clear:
+        print(f"🗑️  Removed {journal.clear()} jobs from {journal.path}")
+    elif args.pending:
+        for source_path, language, status in journal.jobs():
+            if status != 'done':
+                print(f"  • {source_path} → {language.upper()}: {status}")
+    else:
+        stats = journal.stats()
+        print(f"📒 Job journal: {journal.path}")
+        for status in STATUSES:
+            print(f"  {status}: {stats[status]}")
+
+
+if __name__ == '__main__':
+    main()
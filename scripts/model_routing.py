@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Model routing for translation requests.
+
+A route table maps (mode, complexity) to the model and max_tokens of a
+request, so short simple articles and tiny diffs can go to a faster,
+cheaper model while everything else stays on the standard model:
+
+  mode        'new' (full file or section) or 'diff'
+  complexity  'simple', 'standard' or 'complex' (DocumentProfile.complexity
+              of the source file, or of the diff text for diffs)
+
+Routing is opt-in (translation_agent.py / bulk_retranslate.py --route).
+Without it every request uses STANDARD_MODEL, as before. A JSON file can
+override single routes:
+
+    {"new/simple": {"model": "claude-haiku-4-5-20251001", "max_tokens": 4096}}
+
+Measure a table before switching it on with scripts/evaluate_routes.py.
+
+A route's max_tokens is a ceiling. Each request asks for output_budget():
+the expected output size of its source text, from the median length ratio
+of the existing docs/en ↔ docs/<lang> article pairs, plus headroom.
+Responses that still stop at max_tokens are continued by the agent.
+
+Usage:
+    # Show the route table (built-in or from a file)
+    python scripts/model_routing.py [--routes routes.json]
+"""
+
+import json
+import argparse
+import statistics
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+STANDARD_MODEL = "claude-sonnet-4-5-20250929"
+FAST_MODEL = "claude-haiku-4-5-20251001"
+
+MODES = ('new', 'diff')
+COMPLEXITIES = ('simple', 'standard', 'complex')
+
+# max_tokens used for every request when routing is off
+MAX_TOKENS = {'new': 16000, 'diff': 8000}
+
+# Output budget: characters per output token (Arabic script tokenizes denser),
+# translation/source length ratio without a measured corpus, headroom and floor
+OUTPUT_CHARS_PER_TOKEN = {'es': 3.2, 'fr': 3.2, 'ar': 2.2}
+DEFAULT_CHARS_PER_TOKEN = 3.0
+DEFAULT_EXPANSION = 1.2
+BUDGET_HEADROOM = 1.3
+MIN_OUTPUT_TOKENS = 1024
+
+
+@dataclass(frozen=True)
+class Route:
+    """Model and output budget of one kind of request"""
+    model: str
+    max_tokens: int
+
+
+RouteTable = Dict[Tuple[str, str], Route]
+
+# Without routing: the standard model for everything
+FIXED_ROUTES: RouteTable = {
+    (mode, complexity): Route(STANDARD_MODEL, MAX_TOKENS[mode])
+    for mode in MODES for complexity in COMPLEXITIES
+}
+
+# Built-in table for --route. Simple articles are under 1,000 characters,
+# so a few thousand output tokens leave plenty of headroom.
+DEFAULT_ROUTES: RouteTable = {
+    **FIXED_ROUTES,
+    ('new', 'simple'): Route(FAST_MODEL, 4096),
+    ('diff', 'simple'): Route(FAST_MODEL, 2048),
+}
+
+
+def route_for(routes: RouteTable, mode: str, complexity: str) -> Route:
+    """Route of a request; modes other than 'diff' route like full files"""
+    mode = 'diff' if mode == 'diff' else 'new'
+    return routes.get((mode, complexity)) or FIXED_ROUTES[(mode, complexity)]
+
+
+def load_routes(path: Optional[str] = None) -> RouteTable:
+    """
+    The built-in route table, with the routes in a JSON file (if given)
+    replacing the built-in ones.
+
+    Raises:
+        ValueError: if the file names an unknown mode/complexity or misses a field
+    """
+    routes = dict(DEFAULT_ROUTES)
+    if not path:
+        return routes
+    overrides = json.loads(Path(path).read_text(encoding='utf-8'))
+    for key, value in overrides.items():
+        mode, _, complexity = key.partition('/')
+        if mode not in MODES or complexity not in COMPLEXITIES:
+            raise ValueError(f"Unknown route {key!r} in {path} (expected e.g. 'new/simple')")
+        try:
+            routes[(mode, complexity)] = Route(value['model'], int(value['max_tokens']))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Route {key!r} in {path} needs 'model' and 'max_tokens'") from e
+    return routes
+
+
+@lru_cache(maxsize=None)
+def expansion_ratio(language: str, docs_root: str = 'docs') -> float:
+    """
+    Median translation/source length ratio of the articles translated into a
+    language (unfinished translations do not skew a median)
+    """
+    ratios = []
+    for source in Path(docs_root, 'en').glob('*.md'):
+        target = Path(docs_root, language, source.name)
+        if target.exists():
+            source_chars = len(source.read_text(encoding='utf-8'))
+            if source_chars:
+                ratios.append(len(target.read_text(encoding='utf-8')) / source_chars)
+    return statistics.median(ratios) if ratios else DEFAULT_EXPANSION
+
+
+def expected_output_tokens(source_chars: int, language: str) -> float:
+    """Expected output tokens of a translation of source_chars characters"""
+    chars_per_token = OUTPUT_CHARS_PER_TOKEN.get(language, DEFAULT_CHARS_PER_TOKEN)
+    return source_chars * expansion_ratio(language) / chars_per_token
+
+
+def output_budget(source_chars: int, language: str, ceiling: int) -> int:
+    """max_tokens for translating source_chars characters: the estimate plus headroom, up to ceiling"""
+    estimate = expected_output_tokens(source_chars, language)
+    return max(min(MIN_OUTPUT_TOKENS, ceiling), min(ceiling, int(estimate * BUDGET_HEADROOM) + 256))
+
+
+def format_routes(routes: RouteTable) -> str:
+    lines = []
+    for mode in MODES:
+        for complexity in COMPLEXITIES:
+            route = route_for(routes, mode, complexity)
+            lines.append(f"  {mode + '/' + complexity:<14} → {route.model} (max_tokens {route.max_tokens})")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the model route table')
+    parser.add_argument('--routes', help='JSON file overriding built-in routes')
+    args = parser.parse_args()
+    print("🧭 Routes:")
+    print(format_routes(load_routes(args.routes)))
+
+
+if __name__ == '__main__':
+    main()
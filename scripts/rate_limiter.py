@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware scheduler for Claude API requests.
+
+Every request made by TranslationAgent and SRTTranslationAgent goes through
+one process-wide RateLimiter (see shared_limiter()), which
+
+  - keeps token buckets for requests, input tokens and output tokens per
+    minute and delays a request only as long as its bucket needs to refill;
+  - learns the bucket sizes and current levels from the
+    anthropic-ratelimit-* response headers, so no limits need configuring;
+  - retries 429 (rate limited), 529 (overloaded), 5xx and connection errors
+    with jittered exponential backoff, honouring retry-after.
+
+The SDK clients are created with max_retries=0 so retries happen here, where
+the buckets can see them. Buckets work by reservation, so the same limiter
+paces blocking calls, threads and asyncio tasks.
+"""
+
+import sys
+import time
+import random
+import asyncio
+import inspect
+import threading
+from typing import Callable, Dict, Optional
+
+
+DEFAULT_MAX_RETRIES = 8
+BASE_DELAY = 1.0    # seconds, first retry
+MAX_DELAY = 60.0    # seconds, cap for a single backoff
+
+# Rough characters per token, for reserving input/output tokens before a call
+CHARS_PER_TOKEN = 3.5
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Header prefix → bucket name
+HEADER_BUCKETS = {
+    'anthropic-ratelimit-requests': 'requests',
+    'anthropic-ratelimit-input-tokens': 'input_tokens',
+    'anthropic-ratelimit-output-tokens': 'output_tokens',
+}
+
+
+class TokenBucket:
+    """Token bucket refilled continuously to `capacity` once per minute"""
+
+    def __init__(self, capacity: Optional[float] = None):
+        """
+        Args:
+            capacity: Units per minute, or None while the limit is unknown
+                      (an unknown bucket never delays a request)
+        """
+        self.capacity = capacity
+        self.level = capacity or 0.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.capacity:
+            rate = self.capacity / 60.0
+            self.level = min(self.capacity, self.level + (now - self.updated) * rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take amount from the bucket (the level may go negative).
+
+        Returns:
+            Seconds until the reservation is covered (0 if available now)
+        """
+        self._refill(now)
+        if not self.capacity:
+            return 0.0
+        amount = min(amount, self.capacity)  # a single request can always run eventually
+        self.level -= amount
+        return max(0.0, -self.level / (self.capacity / 60.0))
+
+    def refund(self, amount: float, now: float):
+        """Return (or with a negative amount, take) units after the actual cost is known"""
+        self._refill(now)
+        if self.capacity:
+            self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], now: float):
+        """Adopt the limit and remaining units reported by the API"""
+        self._refill(now)
+        if limit:
+            if not self.capacity:
+                self.level = limit
+            self.capacity = limit
+        if remaining is not None and self.capacity:
+            self.level = min(self.level, remaining)
+
+
+def estimate_tokens(request: Dict) -> Dict[str, float]:
+    """Rough input/output token counts of a messages.create() request"""
+    chars = 0
+    last_block = ''
+    system = request.get('system') or ''
+    chars += len(system) if isinstance(system, str) else sum(len(b.get('text', '')) for b in system)
+    for message in request.get('messages', []):
+        content = message.get('content', '')
+        blocks = [{'text': content}] if isinstance(content, str) else content
+        for block in blocks:
+            last_block = block.get('text', '')
+            # Cached prefixes are normally cache reads, which the input limit ignores
+            if 'cache_control' not in block:
+                chars += len(last_block)
+    input_tokens = chars / CHARS_PER_TOKEN
+    # Translations are about as long as the document at the end of the prompt
+    output_tokens = min(request.get('max_tokens', 4096), len(last_block) / CHARS_PER_TOKEN)
+    return {'requests': 1, 'input_tokens': input_tokens, 'output_tokens': output_tokens}
+
+
+def raw_create(messages):
+    """
+    messages.create, through with_raw_response when available so the
+    rate-limit headers can be read (test doubles only provide create)
+    """
+    if hasattr(type(messages), 'with_raw_response'):
+        return messages.with_raw_response.create
+    return messages.create
+
+
+def _retry_after(headers) -> Optional[float]:
+    if not headers:
+        return None
+    for name, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                continue
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    import anthropic  # only needed once a request has failed
+    if isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+class RateLimiter:
+    """Paces requests with token buckets and retries transient API errors"""
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 input_tokens_per_minute: Optional[float] = None,
+                 output_tokens_per_minute: Optional[float] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY):
+        """
+        Args:
+            requests_per_minute / input_tokens_per_minute / output_tokens_per_minute:
+                Initial limits; None to learn them from response headers
+            max_retries: Retries per request before the error is raised
+            base_delay / max_delay: Exponential backoff bounds in seconds
+        """
+        self.buckets = {
+            'requests': TokenBucket(requests_per_minute),
+            'input_tokens': TokenBucket(input_tokens_per_minute),
+            'output_tokens': TokenBucket(output_tokens_per_minute),
+        }
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, estimate: Dict[str, float]) -> float:
+        """Reserve a request's estimated usage; returns seconds to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            return max(bucket.reserve(estimate[name], now) for name, bucket in self.buckets.items())
+
+    def settle(self, estimate: Dict[str, float], usage):
+        """Correct the token buckets once the actual usage of a request is known"""
+        # Cache reads do not count towards the input-token rate limit
+        actual = {
+            'input_tokens': usage.input_tokens + (getattr(usage, 'cache_creation_input_tokens', 0) or 0),
+            'output_tokens': usage.output_tokens,
+        }
+        with self._lock:
+            now = time.monotonic()
+            for name, used in actual.items():
+                self.buckets[name].refund(estimate[name] - used, now)
+
+    def observe(self, headers):
+        """Update the buckets from anthropic-ratelimit-* response headers"""
+        if not headers:
+            return
+        with self._lock:
+            now = time.monotonic()
+            for prefix, name in HEADER_BUCKETS.items():
+                limit = _number(headers.get(f'{prefix}-limit'))
+                remaining = _number(headers.get(f'{prefix}-remaining'))
+                if limit or remaining is not None:
+                    self.buckets[name].sync(limit, remaining, now)
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Jittered exponential backoff delay for a retry, honouring retry-after"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        self.observe(headers)
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+        retry_after = _retry_after(headers)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, send: Callable, request: Dict):
+        """
+        Send a request with the blocking client.
+
+        Args:
+            send: Callable performing the API call with the request's arguments,
+                  e.g. raw_create(client.messages)
+            request: messages.create() keyword arguments
+        """
+        estimate = estimate_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            wait = self.reserve(estimate)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                result = send(**request)
+            except Exception as e:
+                self._refund_failed(estimate)
+                if not _is_retryable(e) or attempt == self.max_retries:
+                    raise
+                delay = self._announce_retry(attempt, e)
+                time.sleep(delay)
+                continue
+            response = self._unwrap(result)
+            self.settle(estimate, response.usage)
+            return response
+
+    async def call_async(self, send: Callable, request: Dict):
+        """Async counterpart of call() for an AsyncAnthropic client"""
+        estimate = estimate_tokens(request)
+        for attempt in range(self.max_retries + 1):
+            wait = self.reserve(estimate)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await send(**request)
+            except Exception as e:
+                self._refund_failed(estimate)
+                if not _is_retryable(e) or attempt == self.max_retries:
+                    raise
+                delay = self._announce_retry(attempt, e)
+                await asyncio.sleep(delay)
+                continue
+            response = self._unwrap(result)
+            if inspect.isawaitable(response):
+                response = await response
+            self.settle(estimate, response.usage)
+            return response
+
+    def _unwrap(self, result):
+        """Parse a raw response after reading its rate-limit headers"""
+        if hasattr(result, 'http_response'):
+            self.observe(result.headers)
+            return result.parse()
+        return result
+
+    def _refund_failed(self, estimate: Dict[str, float]):
+        """A failed request used no tokens (but still counts as a request)"""
+        with self._lock:
+            now = time.monotonic()
+            for name in ('input_tokens', 'output_tokens'):
+                self.buckets[name].refund(estimate[name], now)
+
+    def _announce_retry(self, attempt: int, error: Exception) -> float:
+        delay = self.backoff(attempt, error)
+        self.retries += 1
+        status = getattr(error, 'status_code', None) or type(error).__name__
+        print(f"  ⏳ API {status} — retrying in {delay:.1f}s "
+              f"(attempt {attempt + 1}/{self.max_retries})", file=sys.stderr)
+        return delay
+
+
+def _number(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> RateLimiter:
+    """The process-wide limiter shared by every agent and client"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter()
+        return _shared
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Offline token, cost and time estimate for a translation run.
+
+Builds the exact request of every file/language job (skill prefix, optional
+Transifex/KoboCollect blocks, instructions and source) without sending it,
+and estimates:
+
+  - prompt tokens, with a local tokenizer approximation
+  - prompt-cache reads vs writes: the jobs are replayed in run order against
+    a simulated ephemeral cache (one entry per cache breakpoint and model,
+    5-minute lifetime refreshed on every read)
+  - output tokens, from the measured per-language expansion ratios
+    (model_routing.expected_output_tokens)
+  - cost (usage_log pricing, batch discount in batch mode) and wall-clock
+    time at the configured concurrency or number of workers
+
+Jobs whose translation is already in the translation cache cost nothing.
+The tokenizer and the latency model are calibrated against the usage log:
+logged prompt and output tokens of earlier full-file translations are
+compared with the estimates for the same file and language, and logged
+latencies give the output throughput. Without a usage log the uncalibrated
+defaults are used.
+
+Usage (through bulk_retranslate.py):
+    python scripts/bulk_retranslate.py --language es fr ar --estimate
+"""
+
+import io
+import re
+import sys
+import heapq
+import hashlib
+import statistics
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from model_routing import FAST_MODEL, expected_output_tokens
+import usage_log
+
+
+# Ephemeral prompt-cache lifetime, and the shortest prefix each model caches
+CACHE_TTL_S = 300
+MIN_CACHEABLE_TOKENS = {FAST_MODEL: 4096}
+DEFAULT_MIN_CACHEABLE_TOKENS = 1024
+
+# Latency model without a usage log: fixed overhead plus output throughput
+DEFAULT_OVERHEAD_S = 2.0
+DEFAULT_TOKENS_PER_S = 50.0
+
+# Pre-tokenizer pieces: ASCII words, other letter runs (accented, Arabic),
+# digit runs, punctuation runs and whitespace
+_PIECE = re.compile(r"[A-Za-z]+|[^\W\d_A-Za-z]+|\d+|[^\w\s]+|\s+")
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Approximate token count of text: common ASCII words are one token and
+    long ones are split every six letters; other scripts take a token every
+    two letters, digits every three, punctuation every two. Single spaces
+    merge into the following word.
+    """
+    count = 0
+    for piece in _PIECE.findall(text):
+        first = piece[0]
+        if first.isspace():
+            count += piece != ' '
+        elif first.isdigit():
+            count += (len(piece) + 2) // 3
+        elif first.isascii() and first.isalpha():
+            count += 1 + (len(piece) - 1) // 6
+        elif first.isalpha():
+            count += (len(piece) + 1) // 2
+        else:
+            count += (len(piece) + 1) // 2
+    return count
+
+
+def _request_blocks(request: Dict) -> List[Dict]:
+    """Content blocks of a request's user turn"""
+    content = request['messages'][0]['content']
+    return [{'text': content}] if isinstance(content, str) else content
+
+
+@dataclass
+class Calibration:
+    """Scale factors fitted against logged usage (1.0 and defaults when uncalibrated)"""
+    input_scale: float = 1.0
+    output_scale: Dict[str, float] = field(default_factory=dict)
+    overhead_s: float = DEFAULT_OVERHEAD_S
+    tokens_per_s: float = DEFAULT_TOKENS_PER_S
+    samples: int = 0
+
+    def output_tokens(self, source_chars: int, language: str) -> float:
+        return expected_output_tokens(source_chars, language) * self.output_scale.get(language, 1.0)
+
+    def latency(self, output_tokens: float) -> float:
+        return self.overhead_s + output_tokens / self.tokens_per_s
+
+    @classmethod
+    def from_log(cls, records: Iterable[Dict], agent) -> 'Calibration':
+        """
+        Fit against the full-file translations in a usage log whose source
+        file still exists; agent rebuilds their requests.
+        """
+        calibration = cls()
+        input_ratios, output_ratios = [], {}
+        generated = generating = 0.0
+        for record in records:
+            if record.get('mode') != 'new' or record.get('truncated') or not record.get('file'):
+                continue
+            source = Path(record['file'])
+            language = record.get('language')
+            if not source.exists() or not language:
+                continue
+            with redirect_stdout(io.StringIO()):
+                source_content = agent._prepare_source(str(source), language)
+                request = agent._build_file_request(str(source), source_content, language)
+            prompt = (record.get('input_tokens') or 0) + (record.get('cache_read_tokens') or 0) \
+                + (record.get('cache_write_tokens') or 0)
+            estimated = sum(approx_tokens(block['text']) for block in _request_blocks(request))
+            if prompt and estimated:
+                input_ratios.append(prompt / estimated)
+            expected = expected_output_tokens(len(source_content), language)
+            if record.get('output_tokens') and expected:
+                output_ratios.setdefault(language, []).append(record['output_tokens'] / expected)
+            if record.get('latency_s'):
+                generated += record.get('output_tokens') or 0
+                generating += max(record['latency_s'] - DEFAULT_OVERHEAD_S, 0.1)
+            calibration.samples += 1
+
+        if input_ratios:
+            calibration.input_scale = statistics.median(input_ratios)
+        calibration.output_scale = {lang: statistics.median(r) for lang, r in output_ratios.items()}
+        if generated and generating:
+            calibration.tokens_per_s = generated / generating
+        return calibration
+
+
+@dataclass
+class JobEstimate:
+    """Estimated usage of one file/language translation"""
+    file: str
+    language: str
+    model: str
+    cached: bool = False          # served by the translation cache, no API call
+    input_tokens: int = 0         # uncached prompt tokens
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    start_s: float = 0.0          # when the request is sent, from the start of the run
+    latency_s: float = 0.0
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+
+class PromptCacheModel:
+    """Simulated ephemeral prompt cache: entry key → time it expires"""
+
+    def __init__(self):
+        self.expires: Dict[Tuple[str, str], float] = {}
+
+    def request(self, model: str, blocks: List[Tuple[str, int, bool]], start: float,
+                end: float) -> Tuple[int, int, int]:
+        """
+        Account for one request sent at start and finished at end.
+
+        Args:
+            blocks: (text, tokens, is_breakpoint) of each content block
+
+        Returns:
+            Tuple of (uncached input, cache read, cache write) tokens
+        """
+        minimum = MIN_CACHEABLE_TOKENS.get(model, DEFAULT_MIN_CACHEABLE_TOKENS)
+        digest = hashlib.sha256()
+        prefix_tokens, read_upto, last_breakpoint = 0, 0, 0
+        keys = []
+        for text, tokens, breakpoint in blocks:
+            digest.update(text.encode('utf-8'))
+            prefix_tokens += tokens
+            if not breakpoint or prefix_tokens < minimum:
+                continue
+            key = (model, digest.hexdigest())
+            keys.append(key)
+            last_breakpoint = prefix_tokens
+            if self.expires.get(key, -1.0) >= start:
+                read_upto = prefix_tokens
+        for key in keys:
+            # Written (or refreshed) by this request once it has been processed
+            self.expires[key] = end + CACHE_TTL_S
+        total = sum(tokens for _, tokens, _ in blocks)
+        return total - last_breakpoint, read_upto, last_breakpoint - read_upto
+
+
+def estimate_jobs(jobs: List[Tuple[object, str, str]], concurrency: int, batch: bool = False,
+                  calibration: Optional[Calibration] = None,
+                  workers: Optional[int] = None) -> List[JobEstimate]:
+    """
+    Estimate every job of a run, in run order.
+
+    Jobs are (agent, source_path, language) and are scheduled the way
+    bulk_retranslate.py runs them: with workers, each job starts as soon as
+    one of the workers is free; otherwise file by file, each file's
+    languages in waves of up to concurrency requests. In batch mode every
+    request is sent at once.
+    """
+    calibration = calibration or Calibration()
+    cache = PromptCacheModel()
+    estimates = []
+
+    if batch or workers:
+        free = [0.0] * (workers or 1)
+        for agent, source_path, language in jobs:
+            start = 0.0 if batch else heapq.heappop(free)
+            estimate = _estimate_job(agent, source_path, language, calibration, cache, start, batch)
+            estimates.append(estimate)
+            if not batch:
+                heapq.heappush(free, start + estimate.latency_s)
+        return estimates
+
+    files: Dict[str, List[Tuple[object, str, str]]] = {}
+    for job in jobs:
+        files.setdefault(job[1], []).append(job)
+
+    clock = 0.0
+    step = max(1, concurrency)
+    for file_jobs in files.values():
+        for i in range(0, len(file_jobs), step):
+            wave_time = 0.0
+            for agent, source_path, language in file_jobs[i:i + step]:
+                estimate = _estimate_job(agent, source_path, language, calibration, cache, clock, batch)
+                estimates.append(estimate)
+                wave_time = max(wave_time, estimate.latency_s)
+            clock += wave_time
+    return estimates
+
+
+def _estimate_job(agent, source_path: str, language: str, calibration: Calibration,
+                  cache: PromptCacheModel, start: float, batch: bool) -> JobEstimate:
+    with redirect_stdout(io.StringIO()):
+        source_content = agent._prepare_source(source_path, language)
+        model = agent._file_model(source_path)
+        _, cached = agent._cache_lookup(source_content, language, model)
+        request = None if cached is not None else agent._build_file_request(
+            source_path, source_content, language)
+
+    estimate = JobEstimate(file=source_path, language=language, model=model, start_s=start)
+    if request is None:
+        estimate.cached = True
+        return estimate
+
+    estimate.output_tokens = round(min(calibration.output_tokens(len(source_content), language),
+                                       request['max_tokens']))
+    estimate.latency_s = calibration.latency(estimate.output_tokens)
+    blocks = [
+        (block['text'], round(approx_tokens(block['text']) * calibration.input_scale), 'cache_control' in block)
+        for block in _request_blocks(request)
+    ]
+    (estimate.input_tokens, estimate.cache_read_tokens,
+     estimate.cache_write_tokens) = cache.request(model, blocks, start, start + estimate.latency_s)
+    estimate.cost_usd = usage_log.estimate_cost({
+        'input_tokens': estimate.input_tokens,
+        'output_tokens': estimate.output_tokens,
+        'cache_read_tokens': estimate.cache_read_tokens,
+        'cache_write_tokens': estimate.cache_write_tokens,
+    }, model, batch)
+    return estimate
+
+
+def wall_clock(estimates: List[JobEstimate]) -> float:
+    """Run time of the estimated jobs"""
+    return max((e.start_s + e.latency_s for e in estimates), default=0.0)
+
+
+def print_estimate(estimates: List[JobEstimate], concurrency: int, batch: bool,
+                   calibration: Calibration, verbose: bool = False, workers: Optional[int] = None):
+    """Print per-job (verbose) and total estimates"""
+    if verbose:
+        for e in estimates:
+            if e.cached:
+                print(f"  • {Path(e.file).name} → {e.language.upper()}: translation cache hit")
+                continue
+            print(f"  • {Path(e.file).name} → {e.language.upper()}: {e.prompt_tokens:,} prompt "
+                  f"({e.cache_read_tokens:,} read / {e.cache_write_tokens:,} write / {e.input_tokens:,} uncached), "
+                  f"{e.output_tokens:,} out, ${e.cost_usd:.4f}")
+        print()
+
+    sent = [e for e in estimates if not e.cached]
+    totals = {name: sum(getattr(e, name) for e in sent)
+              for name in ('input_tokens', 'cache_read_tokens', 'cache_write_tokens', 'output_tokens')}
+    prompt = sum(e.prompt_tokens for e in sent)
+    reads = sum(1 for e in sent if e.cache_read_tokens)
+    writes = sum(1 for e in sent if e.cache_write_tokens)
+    cost = sum(e.cost_usd for e in sent)
+
+    print("🧮 ESTIMATE (offline, no API calls)")
+    if calibration.samples:
+        print(f"  Calibrated on {calibration.samples} logged translations "
+              f"(prompt ×{calibration.input_scale:.2f}, {calibration.tokens_per_s:.0f} tok/s)")
+    else:
+        print("  Uncalibrated (no usable usage log records)")
+    print(f"  Requests: {len(sent)} ({len(estimates) - len(sent)} served by the translation cache)")
+    print(f"  Prompt tokens: {prompt:,} — {totals['cache_read_tokens']:,} cache read, "
+          f"{totals['cache_write_tokens']:,} cache write, {totals['input_tokens']:,} uncached")
+    print(f"  Cache: {reads} requests read a cached prefix, {writes} write one")
+    print(f"  Output tokens: {totals['output_tokens']:,}")
+    print(f"  💰 Cost: ${cost:.2f}{' (batch)' if batch else ''}")
+    if batch:
+        print("  ⏱️  Time: batch results arrive within 24 hours (usually much sooner)")
+    else:
+        duration = wall_clock(estimates)
+        pace = f"{workers} workers" if workers else f"concurrency {concurrency}"
+        print(f"  ⏱️  Time: {duration / 60:.1f} minutes with {pace}")
+
+
+def calibrate(agent, path: Optional[Path] = None) -> Calibration:
+    """Calibration from the usage log (default: $TRANSLATION_USAGE_LOG or .cache/usage.jsonl)"""
+    path = path or usage_log.log_path() or usage_log.DEFAULT_LOG_PATH
+    return Calibration.from_log(usage_log.read_records(Path(path)), agent)
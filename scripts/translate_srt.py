@@ -7,6 +7,7 @@ Minimizes hallucinations by processing appropriately-sized chunks with overlap
 import os
 import sys
 import json
+import time
 import argparse
 from pathlib import Path
 from typing import List, Dict, Tuple
@@ -18,6 +19,8 @@ load_dotenv()
 try:
     import anthropic
     from srt_helper import SRTParser, SRTSubtitle, SRTWriter, SRTConverter
+    import usage_log
+    from rate_limiter import shared_limiter, raw_create
 except ImportError:
     print("❌ Missing dependencies. Install with: pip install -r requirements.txt")
     sys.exit(1)
@@ -33,6 +36,8 @@ class SRTTranslationAgent:
     # Based on testing: 20-30 subtitles per chunk works well for most content
     DEFAULT_CHUNK_SIZE = 25
     DEFAULT_OVERLAP = 3  # Number of subtitles to overlap between chunks for context
+
+    MODEL = "claude-sonnet-4-5-20250929"
     
     def __init__(self, api_key: str = None, chunk_size: int = None, overlap: int = None):
         """
@@ -47,7 +52,9 @@ class SRTTranslationAgent:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        self.claude = anthropic.Anthropic(api_key=self.api_key)
+        # Retries and pacing are handled by the shared rate limiter
+        self.claude = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+        self.limiter = shared_limiter()
         
         self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
         self.overlap = overlap or self.DEFAULT_OVERLAP
@@ -167,7 +174,8 @@ class SRTTranslationAgent:
         return chunks
     
     def translate_chunk(self, chunk: Dict, target_lang: str, 
-                       total_chunks: int, video_title: str = None) -> List[SRTSubtitle]:
+                       total_chunks: int, video_title: str = None,
+                       source_path: str = None) -> List[SRTSubtitle]:
         """
         Translate a single chunk of subtitles
         
@@ -176,6 +184,7 @@ class SRTTranslationAgent:
             target_lang: Target language code
             total_chunks: Total number of chunks (for context)
             video_title: Optional video title for better context
+            source_path: Source SRT file (for usage records)
         
         Returns:
             List of translated SRTSubtitle objects
@@ -307,8 +316,9 @@ Translation:"""
                 }
             ]
             
-            response = self.claude.messages.create(
-                model="claude-sonnet-4-5-20250929",
+            started = time.monotonic()
+            response = self.limiter.call(raw_create(self.claude.messages), dict(
+                model=self.MODEL,
                 max_tokens=8000,
                 temperature=0.3,
                 system="""You are a precise subtitle translator. You MUST:
@@ -321,7 +331,7 @@ Translation:"""
                     "role": "user",
                     "content": message_content
                 }]
-            )
+            ))
             
             # Extract translation
             translation = ""
@@ -331,6 +341,8 @@ Translation:"""
             
             # Track usage (including cache metrics)
             usage = response.usage
+            usage_log.record(source_path, target_lang, 'srt chunk', usage, self.MODEL,
+                             time.monotonic() - started)
             self.total_input_tokens += usage.input_tokens
             self.total_output_tokens += usage.output_tokens
             
@@ -479,7 +491,8 @@ Translation:"""
                 chunk, 
                 target_lang, 
                 len(chunks),
-                video_title
+                video_title,
+                source_path
             )
             all_translated.extend(translated_chunk)
         
@@ -506,6 +519,9 @@ Translation:"""
         print(f"=" * 60, file=sys.stderr)
         print(f"Total input tokens: {self.total_input_tokens:,}", file=sys.stderr)
         print(f"Total output tokens: {self.total_output_tokens:,}", file=sys.stderr)
+
+        # Per-million-token prices (shared with the usage log)
+        prices = usage_log.PRICING.get(self.MODEL, usage_log.DEFAULT_PRICING)
         
         # Show cache statistics if caching was used
         if self.total_cache_read_tokens > 0 or self.total_cache_write_tokens > 0:
@@ -513,21 +529,14 @@ Translation:"""
             print(f"💾 Cache write tokens: {self.total_cache_write_tokens:,}", file=sys.stderr)
             
             # Calculate savings
-            cache_savings = (self.total_cache_read_tokens * 3.00 / 1_000_000) * 0.9  # 90% saved
+            cache_savings = self.total_cache_read_tokens / 1_000_000 * (prices['input'] - prices['cache_read'])
             print(f"💰 Cache savings: ${cache_savings:.4f}", file=sys.stderr)
         
-        # Cost calculation (Claude Sonnet 4 pricing with prompt caching)
-        # Regular input tokens
-        input_cost = self.total_input_tokens / 1_000_000 * 3.00
-        
-        # Cache write tokens (25% premium: $3.75/MTok)
-        cache_write_cost = self.total_cache_write_tokens / 1_000_000 * 3.75
-        
-        # Cache read tokens (90% discount: $0.30/MTok)
-        cache_read_cost = self.total_cache_read_tokens / 1_000_000 * 0.30
-        
-        # Output tokens
-        output_cost = self.total_output_tokens / 1_000_000 * 15.00
+        # Cost calculation with prompt caching
+        input_cost = self.total_input_tokens / 1_000_000 * prices['input']
+        cache_write_cost = self.total_cache_write_tokens / 1_000_000 * prices['cache_write']
+        cache_read_cost = self.total_cache_read_tokens / 1_000_000 * prices['cache_read']
+        output_cost = self.total_output_tokens / 1_000_000 * prices['output']
         
         total_cost = input_cost + cache_write_cost + cache_read_cost + output_cost
         
@@ -6,44 +6,173 @@ Translates documentation using Claude API with embedded kobo-translation skill
 
 import os
 import sys
+import copy
 import json
+import asyncio
 import hashlib
 import argparse
+import importlib
 import re
+import time
+import threading
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from datetime import datetime
+from functools import lru_cache
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from translation_cache import TranslationCache
+from translation_memory import TranslationMemory, MEMORY_INSTRUCTIONS
+from ui_string_index import load_index
+from document_profile import profile_file, profile_text, read_document, split_sections
+from model_routing import (STANDARD_MODEL, FIXED_ROUTES, Route, RouteTable, route_for, load_routes,
+                           output_budget)
+import usage_log
+from rate_limiter import shared_limiter, raw_create
+from apply_diff_translation import apply_translation
+from alignment_index import AlignmentIndex
+from translation_manifest import TranslationManifest, source_hash
+
+
+def _require(name: str):
+    """Import a third-party dependency, exiting with an install hint if it is missing"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        print("❌ Missing dependencies. Install with: pip install -r requirements.txt")
+        sys.exit(1)
+
+
+class _LazyModule:
+    """
+    Stand-in for a heavy dependency that is imported on first attribute access.
+    Importing anthropic takes seconds; --help, dry runs and the heuristics never need it.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(_require(self._name), attr)
+
+
+anthropic = _LazyModule('anthropic')
+
+
+def _is_fatal_api_error(error: Exception) -> bool:
+    """
+    Authentication and permission errors: every further request would fail the
+    same way. Rate limits (429) are transient and retried by rate_limiter.py.
+    """
+    return isinstance(error, (anthropic.AuthenticationError, anthropic.PermissionDeniedError))
 
-from dotenv import load_dotenv
-load_dotenv()  # This loads .env file automatically
 
-try:
-    import anthropic
-    from github import Github
-except ImportError:
-    print("❌ Missing dependencies. Install with: pip install -r requirements.txt")
-    sys.exit(1)
+_env_loaded = False
 
-# Template resolver import (optional - only needed if using templates)
-try:
-    from resolve_ui_templates import TemplateResolver, TEMPLATE_PATTERN
-    HAS_TEMPLATE_SUPPORT = True
-except ImportError:
-    HAS_TEMPLATE_SUPPORT = False
+
+def _load_env():
+    """Load .env into the environment (once, before the first agent reads its keys)"""
+    global _env_loaded
+    if not _env_loaded:
+        _require('dotenv').load_dotenv()
+        _env_loaded = True
+
+
+@lru_cache(maxsize=None)
+def _template_support():
+    """
+    (TemplateResolver, TEMPLATE_PATTERN), or None if template support is not available.
+    Imported on first use: the resolver pulls in polib.
+    """
+    try:
+        from resolve_ui_templates import TemplateResolver, TEMPLATE_PATTERN
+    except ImportError:
+        return None
+    return TemplateResolver, TEMPLATE_PATTERN
+
+
+# Claude model and sampling settings shared by every translation request
+MODEL = STANDARD_MODEL
+TEMPERATURE = 0.3  # Lower for consistency
+
+# Maximum number of translation requests in flight at once (async engine)
+DEFAULT_CONCURRENCY = 6
+
+# Documents at least this long are split at H2 headings in section mode
+SECTION_MIN_CHARS = 10_000
+SECTIONS_MEMORY_NOTICE = ("⚠️  --translation-memory is not used for documents split into sections; "
+                          "it only applies to those translated in one request")
+
+# Usage records of the API calls made inside collect_usage()
+_collected_usage: ContextVar[Optional[List[Dict]]] = ContextVar('collected_usage', default=None)
+
+# Follow-up requests sent when a response stops at max_tokens
+MAX_CONTINUATIONS = 3
+
+# Diff segments sent per request by translate_diff_batch()
+DIFF_BATCH_MAX_CHARS = 16_000
+
+# One translated segment in a batched diff response
+_SEGMENT = re.compile(r'<segment id="(?P<id>\d+)"[^>]*>\n?(?P<text>.*?)</segment>', re.S)
+
+# Cached prompt prefix shared by full-file, section and diff requests: the
+# skill context as ordered blocks, from the most to the least stable, each
+# ending on a cache breakpoint (the API allows four). A request that adds
+# the optional Transifex/KoboCollect tables still reads the first three
+# blocks from cache. Mode-specific instructions always come after the prefix.
+PROMPT_BLOCKS = (
+    ('skill', [('main', None)]),
+    ('official', [
+        ('article_titles', 'ARTICLE TITLES (OFFICIAL — use verbatim when cross-referencing articles)'),
+        ('brand', 'BRAND TERMINOLOGY REFERENCE (OFFICIAL)'),
+        ('ui', 'UI TERMINOLOGY REFERENCE (OFFICIAL)'),
+        ('forms', 'FORM BUILDING TERMS (OFFICIAL)'),
+    ]),
+    ('preferred', [
+        ('sentences', 'SENTENCE STRUCTURES (PREFERRED)'),
+        ('data', 'DATA COLLECTION TERMS (PREFERRED)'),
+        ('data_mgmt', 'DATA MANAGEMENT TERMS (PREFERRED)'),
+        ('questions', 'QUESTION TYPES (PREFERRED)'),
+        ('course', 'COURSE TERMINOLOGY (PREFERRED)'),
+        ('docs', 'DOCUMENTATION TERMINOLOGY (PREFERRED)'),
+    ]),
+    ('ui_strings', [
+        ('transifex', 'TRANSIFEX UI STRINGS (AUTHORITATIVE — check here first for any UI element)'),
+        ('collect', 'KOBOCOLLECT ANDROID UI STRINGS (AUTHORITATIVE)'),
+    ]),
+)
+
+
+# Parsed article-titles.md per path, with the mtime it was parsed at
+_ARTICLE_TITLES_CACHE: Dict[Path, Tuple[int, dict]] = {}
 
 
 def _load_article_titles(skill_root: Path) -> dict:
     """
     Parse article-titles.md into {filename: {lang_code: title}}.
     Returns empty dict if the file is missing or unparseable.
+    The file is parsed once per process and again only when its mtime changes.
     """
     titles_path = skill_root / "references" / "article-titles.md"
-    if not titles_path.exists():
+    try:
+        mtime = titles_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
 
+    cached = _ARTICLE_TITLES_CACHE.get(titles_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    titles = _parse_article_titles(titles_path.read_text(encoding="utf-8"))
+    _ARTICLE_TITLES_CACHE[titles_path] = (mtime, titles)
+    return titles
+
+
+def _parse_article_titles(markdown: str) -> dict:
     titles = {}
     header = None
-    for line in titles_path.read_text(encoding="utf-8").splitlines():
+    for line in markdown.splitlines():
         line = line.strip()
         if not line.startswith("|"):
             continue
@@ -71,26 +200,76 @@ def _load_article_titles(skill_root: Path) -> dict:
     return titles
 
 
-def _fix_es_worksheet_labels(translation: str) -> tuple[str, bool]:
+# Regex post-processors run by TranslationAgent.postprocess_translation().
+# Each entry is (languages, group_name, pattern, replace, message); every
+# pattern for a language is combined into one regex so the text is scanned
+# once. Patterns use named groups (unique across all post-processors) and
+# scoped inline flags such as (?i:...).
+_POSTPROCESSORS: List[Tuple[Tuple[str, ...], str, str, Callable[[re.Match], str], str]] = []
+
+
+def postprocessor(languages: List[str], pattern: str, message: str):
+    """Register a regex fix applied to every saved translation in these languages"""
+    def register(replace: Callable[[re.Match], str]):
+        group = f"_fix{len(_POSTPROCESSORS)}"
+        _POSTPROCESSORS.append((tuple(languages), group, pattern, replace, message))
+        _postprocessor_pipeline.cache_clear()
+        return replace
+    return register
+
+
+@lru_cache(maxsize=None)
+def _postprocessor_pipeline(target_lang: str) -> Tuple[Optional[re.Pattern], Dict[str, tuple]]:
+    """Combined regex and {group_name: (replace, message)} for one language"""
+    active = [p for p in _POSTPROCESSORS if target_lang in p[0]]
+    if not active:
+        return None, {}
+    combined = re.compile("|".join(f"(?P<{group}>{pattern})" for _, group, pattern, _, _ in active))
+    return combined, {group: (replace, message) for _, group, _, replace, message in active}
+
+
+def _run_postprocessors(translation: str, target_lang: str) -> Tuple[str, List[str]]:
+    """
+    Apply every registered fix for a language in a single pass.
+    Returns (updated_text, messages_of_fixes_that_changed_something).
+    """
+    combined, fixes = _postprocessor_pipeline(target_lang)
+    if combined is None:
+        return translation, []
+
+    changed = []
+
+    def dispatch(match: re.Match) -> str:
+        replace, message = fixes[match.lastgroup]
+        replacement = replace(match)
+        if replacement != match.group(0) and message not in changed:
+            changed.append(message)
+        return replacement
+
+    return combined.sub(dispatch, translation), changed
+
+
+@postprocessor(['es'], r'(?i:\*\*hoja de trabajo (?P<es_sheet>\w+)\*\*)',
+               "Worksheet labels normalised (ES)")
+def _fix_es_worksheet_label(match: re.Match) -> str:
     """
     Replace incorrect ES worksheet label translations.
     '**hoja de trabajo survey**' → '**hoja survey**' etc.
-    Returns (updated_text, was_changed).
     """
-    pattern = re.compile(r'\*\*hoja de trabajo (\w+)\*\*', re.IGNORECASE)
-    updated = pattern.sub(r'**hoja \1**', translation)
-    return updated, updated != translation
+    return f"**hoja {match.group('es_sheet')}**"
 
 
-def _fix_fr_worksheet_labels(translation: str) -> tuple[str, bool]:
+@postprocessor(['fr'], r'(?i:\*\*hoja (?P<fr_sheet>[\w-]+)(?P<fr_colon> :)?\*\*)',
+               "Worksheet labels normalised (FR)")
+def _fix_fr_worksheet_label(match: re.Match) -> str:
     """
     Replace Spanish hoja worksheet labels hallucinated into French output.
     '**hoja survey**' / '**hoja survey :**' → '**onglet survey**' / '**onglet survey :**' etc.
-    Returns (updated_text, was_changed).
     """
-    pattern = re.compile(r'\*\*hoja ([\w-]+)( :)?\*\*', re.IGNORECASE)
-    updated = pattern.sub(lambda m: f'**onglet {m.group(1)}{m.group(2) or ""}**', translation)
-    return updated, updated != translation
+    return f"**onglet {match.group('fr_sheet')}{match.group('fr_colon') or ''}**"
+
+
+_H1_LINE = re.compile(r'^# [^\n]*', re.MULTILINE)
 
 
 def _apply_official_h1(translation: str, filename: str, target_lang: str,
@@ -106,15 +285,29 @@ def _apply_official_h1(translation: str, filename: str, target_lang: str,
     if not official:
         return translation, False
 
-    lines = translation.split("\n")
-    for i, line in enumerate(lines):
-        if line.startswith("# "):
-            current = line[2:].strip()
-            if current == official:
-                return translation, False
-            lines[i] = f"# {official}"
-            return "\n".join(lines), True
-    return translation, False
+    match = _H1_LINE.search(translation)
+    if not match or match.group(0)[2:].strip() == official:
+        return translation, False
+    return f"{translation[:match.start()]}# {official}{translation[match.end():]}", True
+
+
+def _section_outline(sections: List[str], index: int, radius: int = 2) -> str:
+    """Headings of the sections around sections[index], with that section marked"""
+    headings = []
+    for section in sections:
+        first_line = section.lstrip().split('\n', 1)[0]
+        headings.append(first_line if first_line.startswith('#') else '(introduction)')
+
+    lines = []
+    if index > radius and headings[0].startswith('# '):
+        lines.append(f"1. {headings[0]}")
+        lines.append("...")
+    for j in range(max(0, index - radius), min(len(sections), index + radius + 1)):
+        marker = "   ← THIS SECTION" if j == index else ""
+        lines.append(f"{j + 1}. {headings[j]}{marker}")
+    if index + radius + 1 < len(sections):
+        lines.append("...")
+    return "\n".join(lines)
 
 
 def _format_collect_strings(json_text: str, target_lang: str) -> str:
@@ -153,7 +346,13 @@ class TranslationAgent:
     def __init__(self, test_mode: bool = False, use_templates: bool = False,
                  po_repo_path: Optional[str] = None,
                  include_transifex: bool = False,
-                 include_collect: bool = False):
+                 include_collect: bool = False,
+                 use_cache: bool = True,
+                 cache_path: Optional[str] = None,
+                 use_memory: bool = False,
+                 memory_root: str = 'docs',
+                 ui_strings: str = 'full',
+                 routes: Optional[RouteTable] = None):
         """
         Initialize the translation agent
 
@@ -167,16 +366,32 @@ class TranslationAgent:
             include_collect: Include collect-strings.json (rendered as a table, ~60-70k chars)
                              in the prompt. Useful when translating KoboCollect-specific content.
                              Off by default to avoid overloading the context window.
+            use_cache: If True, reuse stored translations when the source, skill context,
+                       model and temperature are unchanged (no API call on a hit)
+            cache_path: SQLite cache file (default: .cache/translations.sqlite3)
+            use_memory: If True, reuse approved paragraph translations from docs/<lang>
+                        and only send the remaining paragraphs to Claude
+            memory_root: Docs root holding en/ and <lang>/ for the translation memory
+            ui_strings: 'full' pastes the Transifex/KoboCollect tables selected by
+                        include_transifex/include_collect into the cached prefix;
+                        'retrieval' injects only the rows whose English string appears
+                        in the content being translated (both sources, every document)
+            routes: Route table mapping (mode, complexity) to model and max_tokens
+                    (see model_routing.py); None sends everything to MODEL
         """
         self.test_mode = test_mode
         self.use_templates = use_templates
         self.po_repo_path = Path(po_repo_path) if po_repo_path else None
         self.include_transifex = include_transifex
         self.include_collect = include_collect
+        if ui_strings not in ('full', 'retrieval'):
+            raise ValueError(f"ui_strings must be 'full' or 'retrieval', not {ui_strings!r}")
+        self.ui_strings = ui_strings
+        self.routes = routes
         
         # Validate template configuration
         if use_templates:
-            if not HAS_TEMPLATE_SUPPORT:
+            if _template_support() is None:
                 raise ImportError(
                     "Template support not available. "
                     "Make sure resolve_ui_templates.py is in the same directory."
@@ -191,11 +406,15 @@ class TranslationAgent:
                 )
         
         # Load API key
+        _load_env()
         api_key = os.getenv('ANTHROPIC_API_KEY')
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        self.claude = anthropic.Anthropic(api_key=api_key)
+        self.api_key = api_key
+        # Retries and pacing are handled by the shared rate limiter
+        self.claude = anthropic.Anthropic(api_key=api_key, max_retries=0)
+        self.limiter = shared_limiter()
         
         # GitHub integration (only if not in test mode)
         if not test_mode:
@@ -203,7 +422,7 @@ class TranslationAgent:
             if not github_token:
                 raise ValueError("GITHUB_TOKEN environment variable not set")
             
-            self.github = Github(github_token)
+            self.github = _require('github').Github(github_token)
             repo_name = os.getenv('GITHUB_REPOSITORY')
             if repo_name:
                 self.repo = self.github.get_repo(repo_name)
@@ -215,6 +434,33 @@ class TranslationAgent:
         
         # Skill context cache (will be loaded per-language as needed)
         self.skill_cache = {}
+
+        # Skill files read from disk, shared with every variant of this agent
+        self.skill_files: Dict[Path, Optional[str]] = {}
+        self._skill_files_lock = threading.Lock()
+
+        # Agents per UI-string option set (see variant()), shared by all of them
+        self.variants = {(include_transifex, include_collect): self}
+        self._variants_lock = threading.Lock()
+
+        # Persistent translation cache (content-addressed, opened on first use)
+        self.cache = TranslationCache(Path(cache_path) if cache_path else None) if use_cache else None
+
+        # Paragraph-level translation memory (built per language on first use)
+        self.use_memory = use_memory
+        self.memory_root = Path(memory_root)
+        self.memories = {}
+
+        # UI template resolvers (built per language on first use)
+        self.resolvers = {}
+
+        # EN ↔ target block alignments, refreshed whenever a translation is saved
+        self.alignment = AlignmentIndex()
+
+        # Inputs of every saved translation, for --stale-only runs
+        self.manifest = TranslationManifest()
+        # Model of each (source path, language) full-file translation, for the manifest
+        self.models_used: Dict[Tuple[str, str], str] = {}
     
     def _get_skill_context(self, target_lang: str) -> Dict[str, str]:
         """
@@ -232,6 +478,33 @@ class TranslationAgent:
             print(f"✅ Skill loaded successfully ({len(self.skill_cache[target_lang])} files)", file=sys.stderr)
         
         return self.skill_cache[target_lang]
+
+    def _read_skill_file(self, path: Path) -> Optional[str]:
+        """Contents of a skill file (None if missing), read once per agent and its variants"""
+        with self._skill_files_lock:
+            if path not in self.skill_files:
+                self.skill_files[path] = path.read_text(encoding='utf-8') if path.exists() else None
+            return self.skill_files[path]
+
+    def variant(self, include_transifex: Optional[bool] = None,
+                include_collect: Optional[bool] = None) -> 'TranslationAgent':
+        """
+        This agent with other optional UI-string tables in its prompt.
+
+        Variants are pooled per option set and share the API client, rate
+        limiter, caches and skill files with this agent; a variant only reads
+        the optional tables it adds, on first use.
+        """
+        key = (self.include_transifex if include_transifex is None else include_transifex,
+               self.include_collect if include_collect is None else include_collect)
+        with self._variants_lock:
+            agent = self.variants.get(key)
+            if agent is None:
+                agent = copy.copy(self)
+                agent.include_transifex, agent.include_collect = key
+                agent.skill_cache = {}
+                self.variants[key] = agent
+        return agent
     
     def _load_skill_context(self, target_lang: str = None) -> Dict[str, str]:
         """
@@ -263,10 +536,8 @@ class TranslationAgent:
         context = {}
 
         # Read main skill file from the selected skill
-        main_skill = skill_base / 'SKILL.md'
-        if main_skill.exists():
-            context['main'] = main_skill.read_text(encoding='utf-8')
-        else:
+        context['main'] = self._read_skill_file(skill_base / 'SKILL.md')
+        if context['main'] is None:
             raise FileNotFoundError(f"SKILL.md not found in {skill_base}")
 
         # Reference files: prefer language-specific skill, fall back to base skill
@@ -288,9 +559,11 @@ class TranslationAgent:
         # Files that are optional (not yet generated in all environments)
         optional = {'transifex', 'article_titles', 'sentences'}
         # Large files excluded from the prompt unless explicitly opted in
+        # (in retrieval mode only the relevant rows are injected per document)
+        retrieval = self.ui_strings == 'retrieval'
         gated = {
-            'transifex': self.include_transifex,
-            'collect':   self.include_collect,
+            'transifex': self.include_transifex and not retrieval,
+            'collect':   self.include_collect and not retrieval,
         }
 
         for key, filename in ref_files.items():
@@ -304,23 +577,81 @@ class TranslationAgent:
             candidates.append(base_skill / 'references' / filename)
 
             for candidate in candidates:
-                if candidate.exists():
-                    context[key] = candidate.read_text(encoding='utf-8')
+                text = self._read_skill_file(candidate)
+                if text is not None:
+                    context[key] = text
                     break
             else:
                 if key not in optional:
                     print(f"⚠️  Reference file not found: {filename}", file=sys.stderr)
 
         # collect-strings.json lives in the base skill; render to markdown for the LLM
-        if self.include_collect:
-            collect_path = base_skill / 'references' / 'collect-strings.json'
-            if collect_path.exists():
-                context['collect'] = _format_collect_strings(
-                    collect_path.read_text(encoding='utf-8'), target_lang
-                )
+        if gated['collect']:
+            collect_strings = self._read_skill_file(base_skill / 'references' / 'collect-strings.json')
+            if collect_strings is not None:
+                context['collect'] = _format_collect_strings(collect_strings, target_lang)
 
         return context
     
+    def _skill_blocks(self, target_lang: str) -> List[str]:
+        """
+        The skill context for a language as the ordered, non-empty text
+        blocks of PROMPT_BLOCKS (the cacheable prompt prefix)
+        """
+        skill_context = self._get_skill_context(target_lang)
+        blocks = []
+        for _, parts in PROMPT_BLOCKS:
+            sections = [
+                skill_context[key] if heading is None else f"## {heading}\n{skill_context[key]}"
+                for key, heading in parts
+                if skill_context.get(key)
+            ]
+            if sections:
+                blocks.append("\n\n".join(sections))
+        return blocks
+
+    def _prompt_prefix(self, target_lang: str) -> List[Dict]:
+        """Content blocks of the cached prefix, one cache breakpoint per block"""
+        return [
+            {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+            for text in self._skill_blocks(target_lang)
+        ]
+
+    def skill_hash(self, target_lang: str) -> str:
+        """Hash of the assembled skill context for a language"""
+        material = "\n\n".join(self._skill_blocks(target_lang))
+        if self.ui_strings == 'retrieval':
+            material += load_index().digest
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def skill_bundle_hash(self, target_lang: str) -> str:
+        """
+        Hash of a language's skill bundle (skill, official and preferred
+        references), independent of the optional UI-string tables
+        """
+        skill_context = self._get_skill_context(target_lang)
+        material = "\n\n".join(
+            skill_context.get(key) or ''
+            for name, parts in PROMPT_BLOCKS if name != 'ui_strings'
+            for key, _ in parts
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _ui_strings_section(self, text: str, target_lang: str) -> str:
+        """
+        In retrieval mode, the Transifex/KoboCollect rows whose English string
+        appears in text, formatted as a prompt section. Empty otherwise.
+        """
+        if self.ui_strings != 'retrieval':
+            return ''
+        rows = load_index().render(text, target_lang)
+        if not rows:
+            return ''
+        return f"""
+## UI STRINGS IN THIS CONTENT (AUTHORITATIVE — use these exact translations)
+{rows}
+"""
+
     @staticmethod
     def needs_transifex(file_path: str) -> bool:
         """
@@ -330,60 +661,37 @@ class TranslationAgent:
         Scans for patterns that indicate button/menu/tab names that won't
         translate correctly without the authoritative Transifex strings.
         """
-        content = Path(file_path).read_text(encoding='utf-8')
-
-        # Quoted UI element names (e.g. 'Export log data', "SETTINGS")
-        quoted_ui = len(re.findall(r"[\"'`‘’“”][A-Z][^\"'`\n]{2,40}[\"'`‘’“”]", content))
-
-        # Bold UI element references: **SETTINGS**, **Deploy**
-        bold_ui = len(re.findall(r'\*\*[A-Z][A-Za-z ]{1,30}\*\*', content))
-
-        # Explicit UI tab/button/menu markers
-        explicit_ui = len(re.findall(
-            r'\b(tab|button|menu|dialog|dropdown|modal|toggle|sidebar|panel|page|section)\b',
-            content, re.IGNORECASE
-        ))
-
-        # All-caps UI strings (DATA, FORM, SETTINGS, DEPLOY…)
-        allcaps_ui = len(re.findall(r'\b[A-Z]{3,}\b', content))
-
-        score = quoted_ui * 3 + bold_ui * 2 + explicit_ui + allcaps_ui
-        return score >= 10
+        return profile_file(file_path).needs_transifex
 
     def determine_complexity(self, file_path: str) -> str:
         """
         Determine translation complexity based on file content
+        (brand terms, UI terms and length; see document_profile.py)
         
         Returns: 'simple', 'standard', or 'complex'
         """
-        content = Path(file_path).read_text(encoding='utf-8')
-        
-        # Count brand terms
-        brand_terms = [
-            'KoboToolbox', 'Formbuilder', 'Question Library',
-            'Global Server', 'European Union', 'XLSForm'
-        ]
-        brand_count = sum(content.count(term) for term in brand_terms)
-        
-        # Count UI elements
-        ui_elements = ['DEPLOY', 'NEW', 'FORM', 'DATA', 'Settings', 'Save']
-        ui_count = sum(content.count(term) for term in ui_elements)
-        
-        length = len(content)
-        
-        # Simple: Short with no brand terms
-        if length < 1000 and brand_count == 0:
-            return 'simple'
-        
-        # Complex: Long or many brand/UI terms
-        if length > 3000 or brand_count > 5 or ui_count > 5:
-            return 'complex'
-        
-        # Standard: Most documents
-        return 'standard'
+        return profile_file(file_path).complexity
+
+    def route(self, mode: str, complexity: str) -> Route:
+        """Model and max_tokens for a request ('new' or 'diff' mode)"""
+        return route_for(self.routes or FIXED_ROUTES, mode, complexity)
+
+    def _translation_model(self, source_path: str, target_lang: str, complexity: str = None) -> str:
+        """
+        Model a full-file translation is sent to, remembered so that
+        save_translation() records the model that actually produced it
+        (a forced complexity can route away from _file_model()'s choice)
+        """
+        model = self._file_model(source_path, complexity)
+        self.models_used[(str(source_path), target_lang)] = model
+        return model
+
+    def _file_model(self, source_path: str, complexity: str = None) -> str:
+        """Model a full-file translation of source_path is routed to"""
+        return self.route('new', complexity or self.determine_complexity(source_path)).model
     
     def translate_diff(self, diff_content: str, target_lang: str,
-                      context: str = None) -> str:
+                      context: str = None, source_path: str = None) -> str:
         """
         Translate only a diff (changed content) using Claude
         
@@ -391,12 +699,12 @@ class TranslationAgent:
             diff_content: Only the changed lines/paragraphs to translate
             target_lang: Target language (es, fr, ar)
             context: Optional surrounding context for better translation
+            source_path: Source file the diff belongs to (for usage records)
         """
         print(f"  📊 Translation mode: DIFF-BASED (changes only)", file=sys.stderr)
         
-        # Load language-specific skill context
-        skill_context = self._get_skill_context(target_lang)
-        
+        ui_strings_note = self._ui_strings_section(diff_content, target_lang)
+
         # Build context note
         context_note = ""
         if context:
@@ -407,57 +715,16 @@ SURROUNDING CONTEXT (for reference only - DO NOT translate):
 ```
 """
         
-        # Build message content with prompt caching
-        message_content = [
-            {
-                "type": "text",
-                "text": f"""{skill_context.get('main', '')}
-
-## BRAND TERMINOLOGY REFERENCE
-{skill_context.get('brand', '')}
-
-## TRANSIFEX UI STRINGS (AUTHORITATIVE — check here first for any UI element)
-{skill_context.get('transifex', '')}
-
-## KOBOCOLLECT ANDROID UI STRINGS (AUTHORITATIVE)
-{skill_context.get('collect', '')}
-
-## UI TERMINOLOGY REFERENCE
-{skill_context.get('ui', '')}
-
-## ARTICLE TITLES (OFFICIAL — use verbatim when cross-referencing articles)
-{skill_context.get('article_titles', '')}
-
-## SENTENCE STRUCTURES (PREFERRED)
-{skill_context.get('sentences', '')}
-
-## DATA COLLECTION TERMS
-{skill_context.get('data', '')}
-
-## DATA MANAGEMENT TERMS
-{skill_context.get('data_mgmt', '')}
-
-## FORM BUILDING TERMS
-{skill_context.get('forms', '')}
-
-## QUESTION TYPES
-{skill_context.get('questions', '')}
-
-## COURSE TERMINOLOGY
-{skill_context.get('course', '')}
-
-## DOCUMENTATION TERMINOLOGY
-{skill_context.get('docs', '')}""",
-                "cache_control": {"type": "ephemeral"}  # Cache skill content
-            },
+        # Cached skill prefix (shared with full-file requests), then the diff instructions
+        message_content = self._prompt_prefix(target_lang) + [
             {
                 "type": "text",
                 "text": f"""
 TARGET LANGUAGE: {target_lang.upper()}
-
+{ui_strings_note}
 🚨🚨🚨 CRITICAL INSTRUCTION 🚨🚨🚨
 
-You are translating ONLY A DIFF - NOT a full document.
+You are a precise translation tool, and you are translating ONLY A DIFF - NOT a full document.
 
 RULES:
 1. Translate ONLY the exact content between the markers below
@@ -482,25 +749,29 @@ Now provide ONLY the translated diff content (nothing else):"""
             }
         ]
         
+        return self._send_diff_request(message_content, diff_content, target_lang, source_path)
+
+    def _send_diff_request(self, message_content: List[Dict], diff_content: str,
+                           target_lang: str, source_path: str = None, mode: str = 'diff') -> str:
+        """Send a diff-mode request (routed by the complexity of diff_content); returns its text"""
+        route = self.route('diff', profile_text(diff_content).complexity)
+        if self.routes:
+            print(f"  🧭 Route: {route.model} (max_tokens {route.max_tokens})", file=sys.stderr)
         print(f"  🤖 Calling Claude API...", file=sys.stderr)
         
         try:
-            # Call Claude API with system message to reinforce diff-only behavior
-            response = self.claude.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=8000,
-                temperature=0.3,  # Lower for consistency
-                system="""You are a precise translation tool. When translating a DIFF (partial content), you MUST:
-1. Translate ONLY the content between the BEGIN and END markers
-2. Output ONLY the translated text with NO additional content
-3. NOT translate anything outside the markers
-4. NOT add explanations, comments, or metadata
-This is critical - translate ONLY what is explicitly marked for translation.""",
+            # No system prompt: it would precede (and so change) the cached prefix
+            started = time.monotonic()
+            request = dict(
+                model=route.model,
+                max_tokens=output_budget(len(diff_content), target_lang, route.max_tokens),
+                temperature=TEMPERATURE,
                 messages=[{
                     "role": "user",
                     "content": message_content
                 }]
             )
+            response = self.limiter.call(raw_create(self.claude.messages), request)
             
             # Extract translation
             translation = ""
@@ -509,28 +780,105 @@ This is critical - translate ONLY what is explicitly marked for translation.""",
                     translation += block.text
             
             # Report token usage (including cache metrics)
-            usage = response.usage
-            cache_read = getattr(usage, 'cache_read_input_tokens', 0)
-            cache_write = getattr(usage, 'cache_creation_input_tokens', 0)
-            
-            print(f"  📊 Tokens used: {usage.input_tokens} input, {usage.output_tokens} output", file=sys.stderr)
-            if cache_read > 0 or cache_write > 0:
-                print(f"  💾 Cache: {cache_read} read, {cache_write} write", file=sys.stderr)
-            
-            # Calculate cost with prompt caching
-            input_cost = usage.input_tokens / 1_000_000 * 3
-            cache_write_cost = cache_write / 1_000_000 * 3.75  # 25% premium
-            cache_read_cost = cache_read / 1_000_000 * 0.30  # 90% discount
-            output_cost = usage.output_tokens / 1_000_000 * 15
-            
-            cost = input_cost + cache_write_cost + cache_read_cost + output_cost
-            print(f"  💰 Estimated cost: ${cost:.4f}", file=sys.stderr)
+            self._report_usage(response, source_path, target_lang, mode,
+                               time.monotonic() - started, out=sys.stderr)
             
+            _, translation = self._continue_truncated(request, response, translation,
+                                                      source_path, target_lang, out=sys.stderr)
             return translation
             
         except Exception as e:
             print(f"  ❌ Translation failed: {e}", file=sys.stderr)
             raise
+
+    def translate_diff_batch(self, hunks: List[Tuple[str, str]], target_lang: str) -> List[Optional[str]]:
+        """
+        Translate the changed content of many files into one language with as
+        few requests as possible.
+
+        Hunks are packed into requests of up to DIFF_BATCH_MAX_CHARS, each hunk
+        sent as an id-tagged segment after the shared cached prefix. Segments
+        missing from a response are retried one by one with translate_diff(),
+        unless the API rejected the request for a reason every retry would hit
+        too (authentication, permission, quota).
+
+        Args:
+            hunks: (source_path, diff_content) pairs
+            target_lang: Target language (es, fr, ar)
+
+        Returns:
+            The translated diff of each hunk, in order (None if it failed)
+        """
+        results: List[Optional[str]] = [None] * len(hunks)
+        batches, batch, size = [], [], 0
+        for index, (_, diff_content) in enumerate(hunks):
+            if batch and size + len(diff_content) > DIFF_BATCH_MAX_CHARS:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(index)
+            size += len(diff_content)
+        if batch:
+            batches.append(batch)
+
+        print(f"  📦 {len(hunks)} diffs → {target_lang.upper()} in {len(batches)} request(s)", file=sys.stderr)
+        for batch in batches:
+            segments = "\n\n".join(
+                f'<segment id="{index}" file="{Path(hunks[index][0]).name}">\n'
+                f'{hunks[index][1]}\n</segment>'
+                for index in batch
+            )
+            text = "\n\n".join(hunks[index][1] for index in batch)
+            message_content = self._prompt_prefix(target_lang) + [
+                {
+                    "type": "text",
+                    "text": f"""
+TARGET LANGUAGE: {target_lang.upper()}
+{self._ui_strings_section(text, target_lang)}
+🚨🚨🚨 CRITICAL INSTRUCTION 🚨🚨🚨
+
+You are a precise translation tool, and you are translating SEVERAL DIFFS - NOT full documents.
+Each <segment> below is a change to an existing translation; the file name is for context only.
+
+RULES:
+1. Translate the content of EVERY segment, and nothing else
+2. Answer with the same segments, in the same order, with the same id attributes:
+   <segment id="N">translated content</segment>
+3. Keep each segment's markdown, links and line breaks
+4. Do NOT merge, split, skip or add segments
+5. Do NOT add any explanations, comments, or meta-text outside the segments
+
+---BEGIN DIFFS TO TRANSLATE---
+{segments}
+---END DIFFS TO TRANSLATE---
+
+Now provide ONLY the translated segments:"""
+                }
+            ]
+            try:
+                response = self._send_diff_request(message_content, text, target_lang, mode='diff batch')
+            except anthropic.APIError as e:
+                print(f"  ⚠️  Diff batch request failed ({len(batch)} segments → {target_lang.upper()}): {e}",
+                      file=sys.stderr)
+                if _is_fatal_api_error(e):
+                    print("  ⚠️  Not retrying the segments one by one", file=sys.stderr)
+                    return results
+                response = ''
+            translated = {int(m.group('id')): m.group('text').strip('\n')
+                          for m in _SEGMENT.finditer(response)}
+            for index in batch:
+                results[index] = translated.get(index) or None
+
+        for index, (source_path, diff_content) in enumerate(hunks):
+            if results[index] is None:
+                print(f"  ⚠️  Segment {index} ({Path(source_path).name}) missing — translating it alone",
+                      file=sys.stderr)
+                try:
+                    results[index] = self.translate_diff(diff_content, target_lang, source_path=source_path)
+                except anthropic.APIError as e:
+                    print(f"  ⚠️  Segment {index} ({Path(source_path).name}) failed: {e}", file=sys.stderr)
+                    if _is_fatal_api_error(e):
+                        break
+        return results
     
     def translate_file(self, source_path: str, target_lang: str,
                       complexity: str = None, is_update: bool = False,
@@ -561,19 +909,193 @@ This is critical - translate ONLY what is explicitly marked for translation.""",
                 if response.lower() != 'y':
                     raise ValueError("Translation cancelled by user")
             
-            return self.translate_diff(diff_content, target_lang)
+            return self.translate_diff(diff_content, target_lang, source_path=source_path)
         
         # Full file translation (NEW content)
+        source_content = self._prepare_source(source_path, target_lang)
+
+        model = self._translation_model(source_path, target_lang, complexity)
+        cache_key, cached = self._cache_lookup(source_content, target_lang, model)
+        if cached is not None:
+            return cached
+
+        request, memory_matches = self._file_request_with_memory(
+            source_path, source_content, target_lang, complexity
+        )
+
+        print(f"  🤖 Calling Claude API...")
+        
+        try:
+            # Call Claude API
+            response, translation = self._create(request, source_path, target_lang)
+
+            if memory_matches:
+                stitched = self._stitch_memory(translation, memory_matches)
+                if stitched is None:
+                    request = self._build_file_request(source_path, source_content, target_lang, complexity)
+                    response, translation = self._create(request, source_path, target_lang)
+                else:
+                    translation = stitched
+        except Exception as e:
+            print(f"  ❌ Translation failed: {e}")
+            raise
+
+        self._cache_store(cache_key, translation, response, source_path, target_lang, model)
+        return translation
+
+    def translate_file_streaming(self, source_path: str, target_lang: str,
+                                 complexity: str = None) -> Tuple[str, Path]:
+        """
+        Translate a complete file with a streaming request and write it to docs/<lang>/.
+
+        Text is appended to a temporary .part file next to the target as it
+        arrives, so long articles never hit the non-streaming request timeout
+        and progress is visible on disk. When the response is complete the
+        translation is post-processed and atomically renamed over the target;
+        an interrupted or truncated stream never replaces an existing file.
+
+        Returns:
+            Tuple of (translation, target_path)
+        """
+        source_content = self._prepare_source(source_path, target_lang)
+
+        model = self._translation_model(source_path, target_lang, complexity)
+        cache_key, cached = self._cache_lookup(source_content, target_lang, model)
+        if cached is not None:
+            return cached, self.save_translation(cached, source_path, target_lang)
+
+        request, memory_matches = self._file_request_with_memory(
+            source_path, source_content, target_lang, complexity
+        )
+        part_path = _part_path(self._target_path(source_path, target_lang))
+
+        print(f"  🤖 Streaming from Claude API → {part_path}")
+
+        try:
+            response, translation = self._stream_complete(request, part_path, source_path, target_lang)
+
+            if memory_matches:
+                stitched = self._stitch_memory(translation, memory_matches)
+                if stitched is None:
+                    request = self._build_file_request(source_path, source_content, target_lang, complexity)
+                    response, translation = self._stream_complete(request, part_path, source_path, target_lang)
+                else:
+                    translation = stitched
+
+            if response.stop_reason == 'max_tokens':
+                raise RuntimeError(
+                    f"Output truncated at max_tokens — partial translation left in {part_path}"
+                )
+        except Exception as e:
+            print(f"  ❌ Translation failed: {e}")
+            raise
+
+        self._cache_store(cache_key, translation, response, source_path, target_lang, model)
+        return translation, self.save_translation(translation, source_path, target_lang)
+
+    def _stream_complete(self, request: Dict, part_path: Path, source_path: str, target_lang: str):
+        """
+        Stream a request to part_path, continuing it (up to MAX_CONTINUATIONS
+        times) while the output stops at max_tokens.
+
+        Returns:
+            Tuple of (final_message, translation)
+        """
+        response, translation = self._stream_to_file(request, part_path, source_path, target_lang)
+        for _ in range(MAX_CONTINUATIONS):
+            if getattr(response, 'stop_reason', None) != 'max_tokens':
+                break
+            translation = translation.rstrip()
+            print(f"  ✂️  Output stopped at max_tokens after {len(translation)} chars — continuing")
+            response, more = self._stream_to_file(
+                _continuation(request, translation), part_path, source_path, target_lang,
+                mode='continuation', written=translation,
+            )
+            translation += more
+        return response, translation
+
+    def _stream_to_file(self, request: Dict, part_path: Path, source_path: str, target_lang: str,
+                        mode: str = 'new', written: str = ''):
+        """
+        Send a streaming request, appending text to part_path as it arrives.
+        Reports time-to-first-token and output throughput.
+
+        Args:
+            written: Output of earlier requests this one continues; the part
+                     file starts with it
+
+        Returns:
+            Tuple of (final_message, text of this response)
+        """
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        started = first_token = None
+
+        def send(**request):
+            # A retried stream starts over with an empty part file
+            nonlocal started, first_token
+            started, first_token = time.monotonic(), None
+            with open(part_path, 'w', encoding='utf-8') as part, \
+                    self.claude.messages.stream(**request) as stream:
+                part.write(written)
+                self.limiter.observe(getattr(getattr(stream, 'response', None), 'headers', None))
+                for text in stream.text_stream:
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                        print(f"  ⏱️  Time to first token: {first_token:.2f}s")
+                    part.write(text)
+                    part.flush()
+                return stream.get_final_message()
+
+        try:
+            response = self.limiter.call(send, request)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        elapsed = time.monotonic() - started
+        generating = elapsed - (first_token or 0)
+        rate = response.usage.output_tokens / generating if generating > 0 else 0
+        print(f"  ⚡ Streamed in {elapsed:.1f}s ({rate:.0f} tokens/sec)")
+
+        return response, self._handle_file_response(response, source_path, target_lang, mode, elapsed)
+
+    def _cache_lookup(self, source_content: str, target_lang: str,
+                      model: str = MODEL) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a full-file translation made with model in the translation cache.
+
+        Returns:
+            Tuple of (cache_key, cached_translation); both None when caching is off
+        """
+        if self.cache is None:
+            return None, None
+        key = TranslationCache.make_key(
+            source_content, target_lang, self.skill_hash(target_lang), model, TEMPERATURE
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            print(f"  💾 Translation cache hit — no API call needed")
+        return key, cached
+
+    def _cache_store(self, cache_key: Optional[str], translation: str, response,
+                     source_path: str, target_lang: str, model: str = MODEL):
+        """Store a completed translation; truncated output is never cached"""
+        if cache_key is None or getattr(response, 'stop_reason', None) == 'max_tokens':
+            return
+        self.cache.put(cache_key, translation, source_path, target_lang, model)
+
+    def _prepare_source(self, source_path: str, target_lang: str) -> str:
+        """Read the source document and resolve UI templates if enabled"""
         # Read source file
-        source_content = Path(source_path).read_text(encoding='utf-8')
+        source_content = read_document(source_path)
         
         # NEW: Resolve UI templates if enabled
         if self.use_templates:
             print(f"  🔄 Resolving UI templates...", file=sys.stderr)
-            template_count = len(re.findall(TEMPLATE_PATTERN, source_content))
+            template_count = len(re.findall(_template_support()[1], source_content))
             
             if template_count > 0:
-                resolver = TemplateResolver(self.po_repo_path, target_lang)
+                resolver = self._get_resolver(target_lang)
                 source_content = resolver.resolve_file(source_content)
                 
                 if resolver.unresolved:
@@ -584,118 +1106,422 @@ This is critical - translate ONLY what is explicitly marked for translation.""",
                     print(f"  ✅ All {template_count} templates resolved", file=sys.stderr)
             else:
                 print(f"  ℹ️  No templates found", file=sys.stderr)
-        
+
+        return source_content
+
+    def _get_resolver(self, target_lang: str):
+        """Template resolver for a language, parsed from the PO files once"""
+        if target_lang not in self.resolvers:
+            resolver_class, _ = _template_support()
+            self.resolvers[target_lang] = resolver_class(self.po_repo_path, target_lang)
+        return self.resolvers[target_lang]
+
+    def _get_memory(self, target_lang: str) -> TranslationMemory:
+        """Translation memory for a language, built once from approved docs/<lang> output"""
+        if target_lang not in self.memories:
+            self.memories[target_lang] = TranslationMemory(target_lang, self.memory_root)
+            memory = self.memories[target_lang]
+            print(f"  📚 Translation memory for {target_lang.upper()}: {len(memory)} blocks "
+                  f"from {memory.articles_used} aligned articles", file=sys.stderr)
+        return self.memories[target_lang]
+
+    def _file_request_with_memory(self, source_path: str, source_content: str,
+                                  target_lang: str, complexity: str = None) -> Tuple[Dict, Dict[str, str]]:
+        """
+        Build a full-file request, replacing blocks with approved translations
+        by placeholders when the translation memory is enabled.
+
+        Returns:
+            Tuple of (request, {placeholder_id: translation}); the dict is empty
+            when nothing was reused
+        """
+        matches = {}
+        if self.use_memory:
+            masked, matches = self._get_memory(target_lang).mask(source_content)
+            if matches:
+                print(f"  🔁 Translation memory: reusing {len(matches)} blocks "
+                      f"({len(source_content) - len(masked)} of {len(source_content)} chars)")
+                source_content = masked
+        request = self._build_file_request(
+            source_path, source_content, target_lang, complexity, memory=bool(matches)
+        )
+        return request, matches
+
+    def _stitch_memory(self, translation: str, matches: Dict[str, str]) -> Optional[str]:
+        """Replace placeholders with approved translations; None if the model broke them"""
+        stitched = TranslationMemory.unmask(translation, matches)
+        if stitched is None:
+            print(f"  ⚠️  Translation memory placeholders were not preserved — retranslating in full")
+        return stitched
+
+    def _build_file_request(self, source_path: str, source_content: str,
+                            target_lang: str, complexity: str = None,
+                            memory: bool = False, section: str = None) -> Dict:
+        """
+        Build the messages.create() arguments for a full-file translation.
+
+        Shared by the blocking and the async code paths so both send
+        byte-identical prompts (and therefore hit the same prompt cache).
+        With section set (a position/outline note), source_content is one
+        section of a longer document rather than the whole document.
+        """
         # Determine complexity if not specified
         if complexity is None:
             complexity = self.determine_complexity(source_path)
         
+        route = self.route('new', complexity)
         print(f"  📊 Complexity level: {complexity}")
+        if self.routes:
+            print(f"  🧭 Route: {route.model} (max_tokens {route.max_tokens})")
+
+        if section:
+            instructions = f"""{section}
+Now translate ONLY the section below following ALL rules above. Keep its heading
+levels and markdown structure; do not add a title or content from other sections.
+Provide ONLY the translated markdown. No explanations, comments, or meta-text."""
+            label = "SOURCE SECTION"
+        else:
+            instructions = """Now translate this COMPLETE NEW document following ALL rules above.
+Provide ONLY the translated markdown. No explanations, comments, or meta-text."""
+            label = "SOURCE DOCUMENT"
         
-        # Load language-specific skill context
-        skill_context = self._get_skill_context(target_lang)
-        
-        # Build final prompt with prompt caching
-        message_content = [
+        # Cached skill prefix (shared with diff requests), then the file instructions
+        message_content = self._prompt_prefix(target_lang) + [
             {
                 "type": "text",
-                "text": f"""{skill_context.get('main', '')}
+                "text": f"""
+TARGET LANGUAGE: {target_lang.upper()}
+{self._ui_strings_section(source_content, target_lang)}
+{instructions}
+{MEMORY_INSTRUCTIONS if memory else ''}
+---BEGIN {label}---
+{source_content}
+---END {label}---
+
+Translation:"""
+            }
+        ]
+
+        return {
+            "model": route.model,
+            "max_tokens": output_budget(len(source_content), target_lang, route.max_tokens),
+            "temperature": TEMPERATURE,
+            "messages": [{
+                "role": "user",
+                "content": message_content
+            }],
+        }
+
+    def prepare_batch_request(self, source_path: str, target_lang: str,
+                              complexity: str = None) -> Dict:
+        """
+        Prepare a full-file translation for submission in a Message Batch.
+
+        Returns:
+            Job state for complete_batch_result(): 'request' holds the
+            messages.create() arguments, or is None when 'cached' already
+            holds the translation
+        """
+        source_content = self._prepare_source(source_path, target_lang)
+        model = self._translation_model(source_path, target_lang, complexity)
+        cache_key, cached = self._cache_lookup(source_content, target_lang, model)
+        state = {'source_path': source_path, 'target_lang': target_lang,
+                 'model': model, 'cache_key': cache_key, 'cached': cached,
+                 'request': None, 'memory_matches': {}}
+        if cached is None:
+            state['request'], state['memory_matches'] = self._file_request_with_memory(
+                source_path, source_content, target_lang, complexity
+            )
+        return state
 
-## BRAND TERMINOLOGY REFERENCE
-{skill_context.get('brand', '')}
+    def complete_batch_result(self, state: Dict, message) -> Optional[str]:
+        """
+        Turn a succeeded batch result into a translation (see prepare_batch_request).
 
-## TRANSIFEX UI STRINGS (AUTHORITATIVE — check here first for any UI element)
-{skill_context.get('transifex', '')}
+        Returns:
+            The translation, or None if translation memory placeholders were
+            not preserved and the file must be retranslated in full
+        """
+        translation = self._handle_file_response(
+            message, state['source_path'], state['target_lang'], 'batch', batch=True
+        )
+        # Truncated batch output is finished with regular (cached-prefix) requests
+        message, translation = self._continue_truncated(
+            state['request'], message, translation, state['source_path'], state['target_lang']
+        )
+        if state['memory_matches']:
+            translation = self._stitch_memory(translation, state['memory_matches'])
+            if translation is None:
+                return None
+        self._cache_store(state['cache_key'], translation, message,
+                          state['source_path'], state['target_lang'], state['model'])
+        return translation
+
+    def _create(self, request: Dict, source_path: str, target_lang: str,
+                mode: str = 'new') -> Tuple[object, str]:
+        """Send a request with the blocking client; returns (response, translation)"""
+        started = time.monotonic()
+        response = self.limiter.call(raw_create(self.claude.messages), request)
+        latency = time.monotonic() - started
+        translation = self._handle_file_response(response, source_path, target_lang, mode, latency)
+        return self._continue_truncated(request, response, translation, source_path, target_lang)
+
+    async def _create_async(self, client, request: Dict, source_path: str, target_lang: str,
+                            mode: str = 'new') -> Tuple[object, str]:
+        """Send a request with an async client; returns (response, translation)"""
+        started = time.monotonic()
+        response = await self.limiter.call_async(raw_create(client.messages), request)
+        latency = time.monotonic() - started
+        translation = self._handle_file_response(response, source_path, target_lang, mode, latency)
+        for _ in range(MAX_CONTINUATIONS):
+            if getattr(response, 'stop_reason', None) != 'max_tokens':
+                break
+            translation = translation.rstrip()
+            print(f"  ✂️  Output stopped at max_tokens after {len(translation)} chars — continuing")
+            started = time.monotonic()
+            response = await self.limiter.call_async(raw_create(client.messages),
+                                                     _continuation(request, translation))
+            translation += self._handle_file_response(response, source_path, target_lang, 'continuation',
+                                                      time.monotonic() - started)
+        return response, translation
+
+    def _continue_truncated(self, request: Dict, response, translation: str,
+                            source_path: str, target_lang: str, out=None) -> Tuple[object, str]:
+        """
+        Continue a response that stopped at max_tokens: the same (cached)
+        prompt with the output so far as assistant prefill, up to
+        MAX_CONTINUATIONS times.
 
-## KOBOCOLLECT ANDROID UI STRINGS (AUTHORITATIVE)
-{skill_context.get('collect', '')}
+        Returns:
+            Tuple of (last_response, complete translation); the response still
+            has stop_reason 'max_tokens' if the output never finished
+        """
+        for _ in range(MAX_CONTINUATIONS):
+            if getattr(response, 'stop_reason', None) != 'max_tokens':
+                break
+            translation = translation.rstrip()
+            print(f"  ✂️  Output stopped at max_tokens after {len(translation)} chars — continuing", file=out)
+            started = time.monotonic()
+            response = self.limiter.call(raw_create(self.claude.messages), _continuation(request, translation))
+            translation += self._handle_file_response(response, source_path, target_lang, 'continuation',
+                                                      time.monotonic() - started, out=out)
+        return response, translation
+
+    def _handle_file_response(self, response, source_path: str = None, target_lang: str = None,
+                              mode: str = 'new', latency: float = None,
+                              batch: bool = False, out=None) -> str:
+        """Extract the translated text from a response and report usage/cost."""
+        # Extract translation
+        translation = ""
+        for block in response.content:
+            if block.type == "text":
+                translation += block.text
+
+        self._report_usage(response, source_path, target_lang, mode, latency, batch, out=out)
+        return translation
+
+    def _report_usage(self, response, source_path: Optional[str], target_lang: Optional[str],
+                      mode: str, latency: float = None, batch: bool = False,
+                      out=None) -> Dict:
+        """
+        Print token usage and cost for one API call and append it to the usage log
+        (out defaults to sys.stdout at call time, so redirected output is honoured)
+        """
+        entry = usage_log.record(
+            source_path, target_lang, mode, response.usage,
+            getattr(response, 'model', None) or MODEL, latency, batch,
+            stop_reason=getattr(response, 'stop_reason', None),
+        )
+        collected = _collected_usage.get()
+        if collected is not None:
+            collected.append(entry)
+
+        print(f"  📊 Tokens used: {entry['input_tokens']} input, {entry['output_tokens']} output", file=out)
+        if entry['cache_read_tokens'] > 0 or entry['cache_write_tokens'] > 0:
+            print(f"  💾 Cache: {entry['cache_read_tokens']} read, {entry['cache_write_tokens']} write", file=out)
+        print(f"  💰 Estimated cost: ${entry['cost_usd']:.4f}{' (batch)' if batch else ''}", file=out)
+        return entry
+
+    async def translate_file_async(self, client, source_path: str, target_lang: str,
+                                   complexity: str = None) -> str:
+        """
+        Async counterpart of translate_file() for full-file translation.
 
-## UI TERMINOLOGY REFERENCE
-{skill_context.get('ui', '')}
+        Args:
+            client: anthropic.AsyncAnthropic client to send the request with
+            source_path: Path to source markdown file
+            target_lang: Target language (es, fr, ar)
+            complexity: Force complexity level, or auto-detect if None
+        """
+        source_content = self._prepare_source(source_path, target_lang)
 
-## ARTICLE TITLES (OFFICIAL — use verbatim when cross-referencing articles)
-{skill_context.get('article_titles', '')}
+        model = self._translation_model(source_path, target_lang, complexity)
+        cache_key, cached = self._cache_lookup(source_content, target_lang, model)
+        if cached is not None:
+            return cached
 
-## SENTENCE STRUCTURES (PREFERRED)
-{skill_context.get('sentences', '')}
+        request, memory_matches = self._file_request_with_memory(
+            source_path, source_content, target_lang, complexity
+        )
 
-## DATA COLLECTION TERMS
-{skill_context.get('data', '')}
+        print(f"  🤖 Calling Claude API ({Path(source_path).name} → {target_lang.upper()})...")
 
-## DATA MANAGEMENT TERMS
-{skill_context.get('data_mgmt', '')}
+        try:
+            response, translation = await self._create_async(client, request, source_path, target_lang)
 
-## FORM BUILDING TERMS
-{skill_context.get('forms', '')}
+            if memory_matches:
+                stitched = self._stitch_memory(translation, memory_matches)
+                if stitched is None:
+                    request = self._build_file_request(source_path, source_content, target_lang, complexity)
+                    response, translation = await self._create_async(client, request, source_path, target_lang)
+                else:
+                    translation = stitched
+        except Exception as e:
+            print(f"  ❌ Translation failed ({Path(source_path).name} → {target_lang.upper()}): {e}")
+            raise
 
-## QUESTION TYPES
-{skill_context.get('questions', '')}
+        self._cache_store(cache_key, translation, response, source_path, target_lang, model)
+        return translation
 
-## COURSE TERMINOLOGY
-{skill_context.get('course', '')}
+    async def translate_sections_async(self, client, source_path: str, target_lang: str,
+                                       complexity: str = None,
+                                       semaphore: asyncio.Semaphore = None) -> str:
+        """
+        Translate a long document section by section, in parallel.
 
-## DOCUMENTATION TERMINOLOGY
-{skill_context.get('docs', '')}""",
-                "cache_control": {"type": "ephemeral"}  # Cache skill content
-            },
-            {
-                "type": "text",
-                "text": f"""
-TARGET LANGUAGE: {target_lang.upper()}
+        The document is split at H2 headings; every section is sent as its own
+        request against the same cached skill prefix, with a short outline of
+        the neighbouring headings for context. The translated sections are
+        reassembled in order; like the other modes, post-processing is left to
+        save_translation(). Documents shorter than SECTION_MIN_CHARS, or without
+        H2 headings, are translated in one request. The translation memory only
+        applies to those: sections are sent without placeholders.
 
-Now translate this COMPLETE NEW document following ALL rules above.
-Provide ONLY the translated markdown. No explanations, comments, or meta-text.
+        Args:
+            client: anthropic.AsyncAnthropic client to send the requests with
+            semaphore: Shared limit on requests in flight (one per section)
+        """
+        semaphore = semaphore or asyncio.Semaphore(DEFAULT_CONCURRENCY)
+        source_content = self._prepare_source(source_path, target_lang)
+        sections = split_sections(source_content)
 
----BEGIN SOURCE DOCUMENT---
-{source_content}
----END SOURCE DOCUMENT---
+        if len(source_content) < SECTION_MIN_CHARS or len(sections) < 2:
+            async with semaphore:
+                return await self.translate_file_async(client, source_path, target_lang, complexity)
 
-Translation:"""
-            }
-        ]
+        model = self._translation_model(source_path, target_lang, complexity)
+        cache_key, cached = self._cache_lookup(source_content, target_lang, model)
+        if cached is not None:
+            return cached
 
-        print(f"  🤖 Calling Claude API...")
-        
-        try:
-            # Call Claude API
-            response = self.claude.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=16000,
-                temperature=0.3,  # Lower for consistency
-                messages=[{
-                    "role": "user",
-                    "content": message_content
-                }]
+        if complexity is None:
+            complexity = self.determine_complexity(source_path)
+        name = Path(source_path).name
+        print(f"  ✂️  Section mode: {name} → {target_lang.upper()} in {len(sections)} sections")
+
+        async def run(index: int, section: str):
+            note = (f"This is section {index + 1} of {len(sections)} of a longer document; "
+                    f"the sections are translated separately and reassembled in order.\n"
+                    f"Document outline:\n{_section_outline(sections, index)}\n")
+            request = self._build_file_request(
+                source_path, section, target_lang, complexity, section=note
             )
-            
-            # Extract translation
-            translation = ""
-            for block in response.content:
-                if block.type == "text":
-                    translation += block.text
-            
-            # Report token usage (including cache metrics)
-            usage = response.usage
-            cache_read = getattr(usage, 'cache_read_input_tokens', 0)
-            cache_write = getattr(usage, 'cache_creation_input_tokens', 0)
-            
-            print(f"  📊 Tokens used: {usage.input_tokens} input, {usage.output_tokens} output")
-            if cache_read > 0 or cache_write > 0:
-                print(f"  💾 Cache: {cache_read} read, {cache_write} write")
-            
-            # Calculate cost with prompt caching
-            input_cost = usage.input_tokens / 1_000_000 * 3
-            cache_write_cost = cache_write / 1_000_000 * 3.75  # 25% premium
-            cache_read_cost = cache_read / 1_000_000 * 0.30  # 90% discount
-            output_cost = usage.output_tokens / 1_000_000 * 15
-            
-            cost = input_cost + cache_write_cost + cache_read_cost + output_cost
-            print(f"  💰 Estimated cost: ${cost:.4f}")
-            
-            return translation
-            
+            async with semaphore:
+                return await self._create_async(client, request, source_path, target_lang, 'section')
+
+        try:
+            results = await asyncio.gather(*(run(i, section) for i, section in enumerate(sections)))
         except Exception as e:
-            print(f"  ❌ Translation failed: {e}")
+            print(f"  ❌ Translation failed ({name} → {target_lang.upper()}): {e}")
             raise
+
+        parts = []
+        for section, (_, translated) in zip(sections, results):
+            # Keep the source's blank lines between sections
+            parts.append(translated.strip('\n') + section[len(section.rstrip()):])
+        translation = ''.join(parts)
+
+        truncated = [r for r, _ in results if getattr(r, 'stop_reason', None) == 'max_tokens']
+        self._cache_store(cache_key, translation, truncated[0] if truncated else results[0][0],
+                          source_path, target_lang, model)
+        return translation
+
+    def translate_sections(self, source_path: str, target_lang: str, complexity: str = None,
+                           max_concurrency: int = DEFAULT_CONCURRENCY) -> str:
+        """Blocking wrapper around translate_sections_async()"""
+        async def run():
+            async with anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0) as client:
+                return await self.translate_sections_async(
+                    client, source_path, target_lang, complexity,
+                    asyncio.Semaphore(max(1, max_concurrency)),
+                )
+        return asyncio.run(run())
+
+    async def _translate_many_async(self, jobs: List[Tuple[str, str]],
+                                    complexity: str = None,
+                                    max_concurrency: int = DEFAULT_CONCURRENCY,
+                                    sections: bool = False) -> Dict:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async with anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0) as client:
+            async def run(source_path: str, target_lang: str) -> str:
+                if sections:
+                    # Section requests acquire the semaphore individually
+                    return await self.translate_sections_async(
+                        client, source_path, target_lang, complexity, semaphore
+                    )
+                async with semaphore:
+                    return await self.translate_file_async(
+                        client, source_path, target_lang, complexity
+                    )
+
+            results = await asyncio.gather(
+                *(run(source_path, target_lang) for source_path, target_lang in jobs),
+                return_exceptions=True,
+            )
+
+        return dict(zip(jobs, results))
+
+    def translate_many(self, jobs: List[Tuple[str, str]], complexity: str = None,
+                       max_concurrency: int = DEFAULT_CONCURRENCY,
+                       sections: bool = False) -> Dict:
+        """
+        Translate several (source_path, target_lang) pairs concurrently.
+
+        Requests are sent through the async client with at most
+        max_concurrency in flight, so wall-clock time is bounded by the
+        slowest requests rather than their sum. With sections=True long
+        documents are additionally split at H2 headings (see
+        translate_sections_async).
+
+        Returns:
+            Dictionary mapping each (source_path, target_lang) job to its
+            translation, or to the exception raised for that job. One failed
+            job never cancels the others.
+        """
+        jobs = list(dict.fromkeys(jobs))  # drop duplicates, keep order
+        if not jobs:
+            return {}
+        return asyncio.run(self._translate_many_async(jobs, complexity, max_concurrency, sections))
+
+    def translate_languages(self, source_path: str, languages: List[str] = None,
+                            complexity: str = None,
+                            max_concurrency: int = DEFAULT_CONCURRENCY,
+                            sections: bool = False) -> Dict:
+        """
+        Translate one document into several languages at the same time.
+
+        Returns:
+            Dictionary mapping language code to translation (or exception)
+        """
+        languages = languages or self.languages
+        results = self.translate_many(
+            [(source_path, lang) for lang in languages],
+            complexity=complexity,
+            max_concurrency=max_concurrency,
+            sections=sections,
+        )
+        return {lang: result for (_, lang), result in results.items()}
     
     def apply_translated_diff(self, existing_translation: str, 
                              translated_diff: str,
@@ -738,7 +1564,7 @@ Translation:"""
         
         Returns: Dictionary with validation results
         """
-        source_content = Path(source_path).read_text(encoding='utf-8')
+        source_content = read_document(source_path)
         
         checks = {
             'has_content': len(translation.strip()) > 0,
@@ -766,17 +1592,17 @@ Translation:"""
         
         return checks
     
-    def save_translation(self, translation: str, source_path: str,
-                        target_lang: str) -> Path:
-        """
-        Save translation to appropriate location.
-        Applies official H1 title from article-titles.md if available.
+    def _target_path(self, source_path: str, target_lang: str) -> Path:
+        """Path of the translation of source_path in docs/<lang>/"""
+        return Path('docs') / target_lang / Path(source_path).name
 
-        Returns: Path where translation was saved
+    def postprocess_translation(self, translation: str, source_path: str,
+                                target_lang: str) -> str:
+        """
+        Apply the deterministic fixes made before a translation is written:
+        official H1 title from article-titles.md and worksheet label normalisation.
         """
         source = Path(source_path)
-        target_dir = Path('docs') / target_lang
-        target_dir.mkdir(parents=True, exist_ok=True)
 
         # Enforce official H1 title — never rely on LLM for verbatim title matching
         titles = _load_article_titles(Path('skills/kobo-translation'))
@@ -784,39 +1610,253 @@ Translation:"""
         if changed:
             print(f"  📌 H1 corrected from article-titles.md: {source.name}", file=sys.stderr)
 
-        # Fix ES worksheet label translations: '**hoja de trabajo survey**' → '**hoja survey**'
-        if target_lang == 'es':
-            translation, changed = _fix_es_worksheet_labels(translation)
-            if changed:
-                print(f"  📌 Worksheet labels normalised (ES): {source.name}", file=sys.stderr)
+        # Registered fixes (worksheet labels, ...) in one pass over the text
+        translation, fixed = _run_postprocessors(translation, target_lang)
+        for message in fixed:
+            print(f"  📌 {message}: {source.name}", file=sys.stderr)
+
+        return translation
+
+    def save_translation(self, translation: str, source_path: str,
+                        target_lang: str, model: Optional[str] = None) -> Path:
+        """
+        Save translation to appropriate location.
+        Applies official H1 title from article-titles.md if available.
+        The file is written to a temporary .part file and renamed into place,
+        so readers never see a half-written translation.
 
-        # Fix FR worksheet label hallucinations: '**hoja survey**' → '**onglet survey**'
-        if target_lang == 'fr':
-            translation, changed = _fix_fr_worksheet_labels(translation)
-            if changed:
-                print(f"  📌 Worksheet labels normalised (FR): {source.name}", file=sys.stderr)
+        model is recorded in the staleness manifest; by default, the model this
+        agent last translated the file into target_lang with, else its route.
 
-        target_path = target_dir / source.name
-        target_path.write_text(translation, encoding='utf-8')
+        Returns: Path where translation was saved
+        """
+        translation = self.postprocess_translation(translation, source_path, target_lang)
+
+        target_path = self._target_path(source_path, target_lang)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = _part_path(target_path)
+        part_path.write_text(translation, encoding='utf-8')
+        os.replace(part_path, target_path)
+        self.alignment.update(str(source_path), target_lang, read_document(source_path), translation)
+        if self.manifest.path is not None:
+            model = (model or self.models_used.get((str(source_path), target_lang))
+                     or self._file_model(str(source_path)))
+            self.manifest.record(str(source_path), target_lang, source_hash(source_path),
+                                 self.skill_bundle_hash(target_lang), model)
 
         return target_path
 
 
+def _continuation(request: Dict, partial: str) -> Dict:
+    """
+    Follow-up to a request whose output stopped at max_tokens: the same user
+    turn (so the prompt prefix is read from cache) with the output so far as
+    assistant prefill. partial must not end with whitespace.
+    """
+    return {**request, 'messages': request['messages'][:1] + [{'role': 'assistant', 'content': partial}]}
+
+
+@contextmanager
+def collect_usage():
+    """
+    Collect the usage record (see usage_log.record) of every API call made in
+    the block: by this thread and by the asyncio tasks it starts, whichever
+    agent sends it. Yields the list the records are appended to.
+    """
+    records: List[Dict] = []
+    token = _collected_usage.set(records)
+    try:
+        yield records
+    finally:
+        _collected_usage.reset(token)
+
+
+def _part_path(target_path: Path) -> Path:
+    """Temporary file a translation is written to before being renamed into place"""
+    return target_path.with_name(f".{target_path.name}.part")
+
+
+def _report_validation(agent: TranslationAgent, source_path: str, translation: str,
+                       target_lang: str) -> Dict:
+    """Run validate_translation() and print the results"""
+    print(f"\n🔍 Validating translation...")
+    validation = agent.validate_translation(source_path, translation, target_lang)
+    
+    print("\nValidation Results:")
+    for check, passed in validation.items():
+        if check == 'passed':
+            continue
+        status = "✅" if passed else "❌"
+        print(f"  {status} {check}")
+    
+    if validation['passed']:
+        print(f"\n✅ All validation checks passed!")
+    else:
+        print(f"\n⚠️  Some validation checks failed - review translation carefully", file=sys.stderr)
+    
+    return validation
+
+
+def _run_concurrent_jobs(args, jobs: List[Tuple[str, str]]):
+    """Translate several file/language pairs concurrently (full-file mode only)"""
+    print("🚀 KoboToolbox Translation Agent - Concurrent Mode", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+    print(f"📄 Jobs: {len(jobs)} (max {args.concurrency} concurrent requests)", file=sys.stderr)
+    for file_path, lang in jobs:
+        print(f"   • {file_path} → {lang.upper()}", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+    # Group jobs by transifex need so each group shares one agent
+    groups: Dict[bool, List[Tuple[str, str]]] = {}
+    for file_path, lang in jobs:
+        use_transifex = args.include_transifex
+        if args.auto_transifex and not use_transifex:
+            use_transifex = TranslationAgent.needs_transifex(file_path)
+        groups.setdefault(use_transifex, []).append((file_path, lang))
+
+    failed = 0
+    try:
+        for use_transifex, group_jobs in groups.items():
+            agent = TranslationAgent(
+                test_mode=True,
+                use_templates=args.use_templates,
+                po_repo_path=args.po_repo if args.use_templates else None,
+                include_transifex=use_transifex,
+                include_collect=args.include_collect,
+                use_cache=not args.no_cache,
+                use_memory=args.translation_memory,
+                ui_strings=args.ui_strings,
+                routes=args.routes,
+            )
+            results = agent.translate_many(
+                group_jobs,
+                complexity=args.complexity,
+                max_concurrency=args.concurrency,
+                sections=args.sections,
+            )
+
+            for (file_path, lang), result in results.items():
+                label = f"{Path(file_path).name} → {lang.upper()}"
+                if isinstance(result, Exception):
+                    failed += 1
+                    print(f"\n❌ JOB FAILED: {label}: {result}", file=sys.stderr)
+                    continue
+
+                print(f"\n✓ Translation complete: {label}")
+                _report_validation(agent, file_path, result, lang)
+                if args.save:
+                    target_path = agent.save_translation(result, file_path, lang)
+                    print(f"💾 Translation saved to: {target_path}", file=sys.stderr)
+                else:
+                    print("\n" + "=" * 60, file=sys.stderr)
+                    print(f"TRANSLATION OUTPUT ({label}):", file=sys.stderr)
+                    print("=" * 60, file=sys.stderr)
+                    print(result)
+                    print("=" * 60, file=sys.stderr)
+                print(f"✅ JOB OK: {label}", file=sys.stderr)
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+    print(f"\n✨ {len(jobs) - failed}/{len(jobs)} translations complete!", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+def _run_diff_batch(args):
+    """
+    Translate every hunk of a --diff-batch file, one batched request per
+    language, and apply the translated hunks to docs/<lang>/ with --save
+    """
+    hunks = [json.loads(line) for line in Path(args.diff_batch).read_text(encoding='utf-8').splitlines()
+             if line.strip()]
+    by_lang: Dict[str, List[Dict]] = {}
+    for hunk in hunks:
+        by_lang.setdefault(hunk['language'], []).append(hunk)
+
+    print("🚀 KoboToolbox Translation Agent - Batched Diff Mode", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+    print(f"📄 Hunks: {len(hunks)} in {len({h['file'] for h in hunks})} files, "
+          f"languages: {', '.join(l.upper() for l in by_lang)}", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+    use_transifex = args.include_transifex or (
+        args.auto_transifex and any(TranslationAgent.needs_transifex(h['file']) for h in hunks)
+    )
+    failed = 0
+    try:
+        agent = TranslationAgent(
+            test_mode=True,
+            include_transifex=use_transifex,
+            include_collect=args.include_collect,
+            use_cache=not args.no_cache,
+            ui_strings=args.ui_strings,
+            routes=args.routes,
+        )
+        for lang, lang_hunks in by_lang.items():
+            translations = agent.translate_diff_batch([(h['file'], h['diff']) for h in lang_hunks], lang)
+            for hunk, translation in zip(lang_hunks, translations):
+                label = f"{Path(hunk['file']).name} → {lang.upper()}"
+                ok = translation is not None
+                if ok and args.save:
+                    ok = apply_translation(agent._target_path(hunk['file'], lang),
+                                           hunk.get('old_content') or '', translation, mode='smart')
+                elif ok:
+                    print(json.dumps({**hunk, 'translation': translation}, ensure_ascii=False))
+                if ok:
+                    print(f"✅ HUNK OK: {label}", file=sys.stderr)
+                else:
+                    failed += 1
+                    print(f"❌ HUNK FAILED: {label}", file=sys.stderr)
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+    print(f"\n✨ {len(hunks) - failed}/{len(hunks)} diffs translated!", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
 def main():
     """Main entry point for testing"""
+    # `translation_agent.py serve`: long-lived daemon (see translation_server.py)
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from translation_server import main as serve
+        serve(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description='KoboToolbox Translation Agent - Test Version'
     )
     parser.add_argument(
         '--file',
-        required=True,
         help='Path to source file to translate (e.g., docs/en/test_simple.md)'
     )
     parser.add_argument(
         '--language',
+        nargs='+',
         choices=['es', 'fr', 'ar'],
-        required=True,
-        help='Target language'
+        help='Target language(s). Several languages are translated concurrently.'
+    )
+    parser.add_argument(
+        '--jobs',
+        nargs='+',
+        metavar='FILE:LANG',
+        help='Translate several file/language pairs concurrently '
+             '(e.g., docs/en/a.md:es docs/en/b.md:fr). Replaces --file/--language.'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Maximum concurrent API requests for multi-job and --sections runs (default: {DEFAULT_CONCURRENCY})'
     )
     parser.add_argument(
         '--complexity',
@@ -828,6 +1868,18 @@ def main():
         action='store_true',
         help='Save translation to file (default: just display)'
     )
+    parser.add_argument(
+        '--sections',
+        action='store_true',
+        help=f'Split documents of {SECTION_MIN_CHARS}+ characters at H2 headings and '
+             'translate the sections in parallel'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream the response, writing it to docs/<lang>/ as it arrives '
+             '(implies --save; single full-file translation only)'
+    )
     parser.add_argument(
         '--test',
         action='store_true',
@@ -853,6 +1905,13 @@ def main():
         type=str,
         help='Old content to replace (used with --update-mode to find where to apply diff)'
     )
+    parser.add_argument(
+        '--diff-batch',
+        metavar='HUNKS_JSONL',
+        help='Translate many diffs with one request per language. One JSON object per line: '
+             '{"file", "language", "diff", "old_content"}. With --save the translated diffs are '
+             'applied to docs/<lang>/; otherwise each hunk is printed with its "translation"'
+    )
     parser.add_argument(
         '--use-templates',
         action='store_true',
@@ -882,18 +1941,98 @@ def main():
         help='Include KoboCollect Android UI strings in the prompt (~60-70k chars). '
              'Use when translating KoboCollect-specific content.'
     )
+    parser.add_argument(
+        '--ui-strings',
+        choices=['full', 'retrieval'],
+        default='full',
+        help="'full' (default): paste the tables enabled by --include-transifex/--include-collect. "
+             "'retrieval': inject only the Transifex and KoboCollect rows whose English "
+             "string appears in the document."
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always call the API, ignoring the translation cache in .cache/'
+    )
+    parser.add_argument(
+        '--translation-memory',
+        action='store_true',
+        help='Reuse approved paragraph translations from docs/<lang>; only new '
+             'paragraphs are sent to Claude'
+    )
+    parser.add_argument(
+        '--route',
+        nargs='?',
+        const='',
+        metavar='ROUTES_JSON',
+        help='Pick model and max_tokens by complexity and mode (simple articles and '
+             'tiny diffs go to a faster model). Optionally a JSON file overriding '
+             'routes; see model_routing.py'
+    )
 
     args = parser.parse_args()
 
-    # Verify source file exists
-    if not Path(args.file).exists():
-        print(f"❌ Source file not found: {args.file}")
+    try:
+        args.routes = load_routes(args.route) if args.route is not None else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid --route table: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.diff_batch:
+        if args.file or args.language or args.jobs or args.update_mode:
+            print("❌ --diff-batch cannot be combined with --file/--language, --jobs or --update-mode",
+                  file=sys.stderr)
+            sys.exit(1)
+        _run_diff_batch(args)
+        return
+
+    # Collect (file, language) jobs
+    if args.jobs:
+        if args.file or args.language:
+            print("❌ --jobs cannot be combined with --file/--language", file=sys.stderr)
+            sys.exit(1)
+        jobs = []
+        for job in args.jobs:
+            file_path, sep, lang = job.rpartition(':')
+            if not sep or lang not in ('es', 'fr', 'ar'):
+                print(f"❌ Invalid job (expected FILE:LANG with LANG in es, fr, ar): {job}", file=sys.stderr)
+                sys.exit(1)
+            jobs.append((file_path, lang))
+    elif args.file and args.language:
+        jobs = [(args.file, lang) for lang in args.language]
+    else:
+        print("❌ Either --file and --language, or --jobs, must be provided", file=sys.stderr)
         sys.exit(1)
 
+    # Verify source files exist
+    for file_path in dict.fromkeys(f for f, _ in jobs):
+        if not Path(file_path).exists():
+            print(f"❌ Source file not found: {file_path}")
+            sys.exit(1)
+
     # Validate update mode arguments
     if args.update_mode and not args.diff:
         print("❌ --update-mode requires --diff to be provided", file=sys.stderr)
         sys.exit(1)
+    if args.update_mode and len(jobs) > 1:
+        print("❌ --update-mode supports a single file and language", file=sys.stderr)
+        sys.exit(1)
+
+    if args.stream and (args.update_mode or len(jobs) > 1):
+        print("❌ --stream supports a single full-file translation", file=sys.stderr)
+        sys.exit(1)
+    if args.sections and (args.update_mode or args.stream):
+        print("❌ --sections cannot be combined with --update-mode or --stream", file=sys.stderr)
+        sys.exit(1)
+    if args.sections and args.translation_memory:
+        print(SECTIONS_MEMORY_NOTICE, file=sys.stderr)
+
+    # --jobs always reports per-job status lines (the workflows count them)
+    if len(jobs) > 1 or (args.jobs and not args.update_mode and not args.stream):
+        _run_concurrent_jobs(args, jobs)
+        return
+
+    args.file, args.language = jobs[0]
 
     # Resolve auto-transifex
     use_transifex = args.include_transifex
@@ -923,6 +2062,10 @@ def main():
             po_repo_path=args.po_repo if args.use_templates else None,
             include_transifex=use_transifex,
             include_collect=args.include_collect,
+            use_cache=not args.no_cache,
+            use_memory=args.translation_memory,
+            ui_strings=args.ui_strings,
+            routes=args.routes,
         )
         
         # Translate
@@ -970,31 +2113,34 @@ def main():
         else:
             # Full file translation
             print(f"\n🔄 Translating complete file to {args.language.upper()}...")
-            translation = agent.translate_file(
-                args.file,
-                args.language,
-                args.complexity
-            )
+            if args.stream:
+                translation, target_path = agent.translate_file_streaming(
+                    args.file,
+                    args.language,
+                    args.complexity
+                )
+            elif args.sections:
+                translation = agent.translate_sections(
+                    args.file,
+                    args.language,
+                    args.complexity,
+                    max_concurrency=args.concurrency
+                )
+            else:
+                translation = agent.translate_file(
+                    args.file,
+                    args.language,
+                    args.complexity
+                )
             
             # Validate
             print(f"\n✓ Translation complete!")
-            print(f"\n🔍 Validating translation...")
-            validation = agent.validate_translation(args.file, translation, args.language)
-            
-            print("\nValidation Results:")
-            for check, passed in validation.items():
-                if check == 'passed':
-                    continue
-                status = "✅" if passed else "❌"
-                print(f"  {status} {check}")
-            
-            if validation['passed']:
-                print(f"\n✅ All validation checks passed!")
-            else:
-                print(f"\n⚠️  Some validation checks failed - review translation carefully", file=sys.stderr)
+            _report_validation(agent, args.file, translation, args.language)
             
             # Save or display
-            if args.save:
+            if args.stream:
+                print(f"\n💾 Translation saved to: {target_path}", file=sys.stderr)
+            elif args.save:
                 target_path = agent.save_translation(translation, args.file, args.language)
                 print(f"\n💾 Translation saved to: {target_path}", file=sys.stderr)
             else:
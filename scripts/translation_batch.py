@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Message Batches backend for bulk retranslation.
+
+Instead of sending one request per file/language pair and sleeping between
+files, every pair is submitted in a single Message Batch (split into several
+batches only if the payload exceeds the API limits). Batches are processed
+asynchronously by the API at half the standard price and without
+client-side rate limiting; this module polls until they have ended and then
+hands each result back to the agent that prepared it.
+
+Requests are built by TranslationAgent.prepare_batch_request(), so they are
+byte-identical to the ones the synchronous path sends (same cached skill
+prefix, translation memory, translation cache).
+
+Usage:
+    # Via bulk_retranslate.py
+    python scripts/bulk_retranslate.py --language es fr ar --batch
+
+    # Check on a batch submitted earlier
+    python scripts/translation_batch.py --status msgbatch_...
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List, Tuple
+
+
+# Seconds between batch status checks
+DEFAULT_POLL_INTERVAL = 30
+
+# API limits for a single Message Batch (requests, request body bytes);
+# the byte limit leaves headroom below the documented 256 MB
+MAX_BATCH_REQUESTS = 100_000
+MAX_BATCH_BYTES = 200 * 1024 * 1024
+
+
+def custom_id(index: int) -> str:
+    """custom_id of the index-th job in a run"""
+    return f"job-{index:04d}"
+
+
+def chunk_requests(requests: List[Dict]) -> List[List[Dict]]:
+    """Split batch requests into groups that respect the per-batch limits"""
+    chunks = [[]]
+    size = 0
+    for request in requests:
+        request_size = len(json.dumps(request, ensure_ascii=False).encode('utf-8'))
+        current = chunks[-1]
+        if current and (len(current) >= MAX_BATCH_REQUESTS or size + request_size > MAX_BATCH_BYTES):
+            chunks.append([])
+            size = 0
+        chunks[-1].append(request)
+        size += request_size
+    return [chunk for chunk in chunks if chunk]
+
+
+class BatchRunner:
+    """Submits translation jobs as Message Batches and collects the results"""
+
+    def __init__(self, client=None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            client: anthropic.Anthropic client (default: one for ANTHROPIC_API_KEY)
+            poll_interval: Seconds between batch status checks
+        """
+        if client is None:
+            import anthropic
+            client = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.client = client
+        self.poll_interval = poll_interval
+
+    def run(self, jobs: List[Tuple['TranslationAgent', str, str]]) -> Dict:
+        """
+        Translate (agent, source_path, target_lang) jobs through the Batches API.
+
+        Returns:
+            Dictionary mapping (source_path, target_lang) to the translation,
+            or to the exception for that job
+        """
+        results = {}
+        pending = {}
+        requests = []
+        for index, (agent, source_path, target_lang) in enumerate(jobs):
+            job = (source_path, target_lang)
+            try:
+                state = agent.prepare_batch_request(source_path, target_lang)
+            except Exception as e:
+                results[job] = e
+                continue
+            if state['request'] is None:
+                results[job] = state['cached']
+                continue
+            pending[custom_id(index)] = (agent, state)
+            requests.append({'custom_id': custom_id(index), 'params': state['request']})
+
+        if not requests:
+            return results
+
+        for chunk in chunk_requests(requests):
+            batch = self.client.messages.batches.create(requests=chunk)
+            print(f"📦 Submitted batch {batch.id} ({len(chunk)} requests)")
+            self.wait(batch.id)
+
+            for entry in self.client.messages.batches.results(batch.id):
+                agent, state = pending.pop(entry.custom_id)
+                job = (state['source_path'], state['target_lang'])
+                results[job] = self._complete(agent, state, entry.result)
+
+        # Requests the API never reported on
+        for agent, state in pending.values():
+            results[(state['source_path'], state['target_lang'])] = RuntimeError("No batch result returned")
+
+        return results
+
+    def wait(self, batch_id: str):
+        """Poll a batch until processing has ended; returns the final batch"""
+        while True:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            print(f"  ⏳ {batch_id}: {batch.processing_status} — "
+                  f"{counts.succeeded} succeeded, {counts.errored} errored, "
+                  f"{counts.processing} processing", file=sys.stderr)
+            if batch.processing_status == 'ended':
+                return batch
+            time.sleep(self.poll_interval)
+
+    def _complete(self, agent, state: Dict, result):
+        """Translation for one batch result, or the exception describing its failure"""
+        name = f"{os.path.basename(state['source_path'])} → {state['target_lang'].upper()}"
+        if result.type != 'succeeded':
+            error = getattr(getattr(result, 'error', None), 'error', None)
+            detail = getattr(error, 'message', None) or result.type
+            print(f"  ❌ Batch request failed ({name}): {detail}", file=sys.stderr)
+            return RuntimeError(f"Batch request {result.type}: {detail}")
+
+        print(f"  ✅ {name}")
+        try:
+            translation = agent.complete_batch_result(state, result.message)
+            if translation is None:
+                # Placeholders were lost; retranslate this one file synchronously
+                translation = agent.translate_file(state['source_path'], state['target_lang'])
+            return translation
+        except Exception as e:
+            return e
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect a translation Message Batch')
+    parser.add_argument('--status', required=True, metavar='BATCH_ID', help='Batch to inspect')
+    args = parser.parse_args()
+
+    batch = BatchRunner().client.messages.batches.retrieve(args.status)
+    counts = batch.request_counts
+    print(f"📦 {batch.id}: {batch.processing_status}")
+    print(f"  ✅ Succeeded: {counts.succeeded}")
+    print(f"  ❌ Errored: {counts.errored}")
+    print(f"  ⏳ Processing: {counts.processing}")
+    print(f"  🚫 Canceled/expired: {counts.canceled + counts.expired}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Content-addressed translation cache for the KoboToolbox Translation Agent.
+
+Stores finished translations in a local SQLite database (default:
+.cache/translations.sqlite3). The cache key is a hash of everything that
+determines the output of a full-file translation:
+
+  - the source markdown after template resolution
+  - the target language
+  - the hash of the assembled skill context for that language
+  - the model id and temperature
+
+Any change to one of these produces a new key, so stale entries are never
+served; editing the French skill does not invalidate Spanish entries.
+
+Usage:
+    # Show cache statistics
+    python scripts/translation_cache.py --stats
+
+    # Remove every cached translation
+    python scripts/translation_cache.py --clear
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+
+DEFAULT_CACHE_PATH = Path('.cache') / 'translations.sqlite3'
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a string"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """Persistent on-disk cache of translations keyed by content hash"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite database file (default: .cache/translations.sqlite3).
+                  The file and its directory are created on first use.
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(source_content: str, target_lang: str, skill_hash: str,
+                 model: str, temperature: float) -> str:
+        """Build the cache key for one full-file translation request"""
+        material = json.dumps({
+            'source': hash_text(source_content),
+            'language': target_lang,
+            'skill': skill_hash,
+            'model': model,
+            'temperature': temperature,
+        }, sort_keys=True)
+        return hash_text(material)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    key         TEXT PRIMARY KEY,
+                    translation TEXT NOT NULL,
+                    source_path TEXT,
+                    language    TEXT,
+                    model       TEXT,
+                    created_at  TEXT
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached translation for key, or None on a miss"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, translation: str, source_path: str = None,
+            target_lang: str = None, model: str = None):
+        """Store a translation under key (replacing any previous entry)"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO translations "
+                "(key, translation, source_path, language, model, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, translation, source_path, target_lang, model,
+                 datetime.now().isoformat(timespec='seconds')),
+            )
+            conn.commit()
+
+    def stats(self) -> dict:
+        """Return entry counts per language"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT language, COUNT(*) FROM translations GROUP BY language"
+            ).fetchall()
+        return {lang or '?': count for lang, count in rows}
+
+    def clear(self) -> int:
+        """Delete every entry; returns the number of entries removed"""
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM translations").rowcount
+            conn.commit()
+        return removed
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or clear the translation cache')
+    parser.add_argument(
+        '--path',
+        default=str(DEFAULT_CACHE_PATH),
+        help=f'Cache database (default: {DEFAULT_CACHE_PATH})'
+    )
+    parser.add_argument('--stats', action='store_true', help='Show entry counts per language')
+    parser.add_argument('--clear', action='store_true', help='Remove every cached translation')
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"ℹ️  No cache at {args.path}", file=sys.stderr)
+        return
+
+    cache = TranslationCache(Path(args.path))
+    if args.clear:
+        removed = cache.clear()
+        print(f"🗑️  Removed {removed} cached translations")
+    else:
+        stats = cache.stats()
+        print(f"💾 {args.path}: {sum(stats.values())} cached translations")
+        for lang, count in sorted(stats.items()):
+            print(f"  • {lang}: {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Thin client for the translation daemon (scripts/translation_server.py).
+
+Uses only the standard library, so a job costs one local HTTP round trip
+and not a fresh interpreter that loads anthropic, PyGithub and the skill
+files. Output follows translation_agent.py: the translation (or translated
+diff) goes to stdout, progress to stderr, and the exit status is 1 if the
+job failed.
+
+Usage:
+    # Start the daemon once
+    python scripts/translation_agent.py serve &
+    python scripts/translation_client.py --wait 30
+
+    # Full translation, saved to docs/es/
+    python scripts/translation_client.py --file docs/en/quick_start.md --language es --save
+
+    # Diff translation (translated diff on stdout)
+    python scripts/translation_client.py --file docs/en/quick_start.md --language fr \\
+        --update-mode --diff "New paragraph"
+
+    # Stop the daemon
+    python scripts/translation_client.py --shutdown
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import http.client
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_SOCKET = os.getenv('TRANSLATION_AGENT_SOCKET') or str(Path('.cache') / 'translation-agent.sock')
+
+# Translations of long articles can take several minutes
+DEFAULT_TIMEOUT = 900
+
+
+class DaemonError(Exception):
+    """The daemon is unreachable or reported a failed job"""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def request(method: str, path: str, body: Optional[Dict] = None,
+            address: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT) -> Dict:
+    """
+    Send one request to the daemon.
+
+    Args:
+        address: 'http://host:port' or a Unix socket path (default: DEFAULT_SOCKET)
+
+    Raises:
+        DaemonError: if the daemon cannot be reached or answers with ok=false
+    """
+    address = address or DEFAULT_SOCKET
+    if address.startswith('http://'):
+        host, _, port = address[len('http://'):].rstrip('/').partition(':')
+        conn = http.client.HTTPConnection(host, int(port or 80), timeout=timeout)
+    else:
+        conn = _UnixHTTPConnection(address[len('unix:'):] if address.startswith('unix:') else address,
+                                   timeout)
+    try:
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        conn.request(method, path, body=data, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        result = json.loads(response.read() or b'{}')
+    except (OSError, http.client.HTTPException, json.JSONDecodeError) as e:
+        raise DaemonError(f"Translation daemon not reachable at {address}: {e}") from e
+    finally:
+        conn.close()
+    if not result.get('ok'):
+        raise DaemonError(result.get('error') or f"HTTP {response.status}")
+    return result
+
+
+def translate(job: Dict, address: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT) -> Dict:
+    """Run a job on the daemon; returns its result (translation, saved_to, validation)"""
+    return request('POST', '/translate', job, address, timeout)
+
+
+def health(address: Optional[str] = None) -> Dict:
+    return request('GET', '/health', address=address, timeout=5)
+
+
+def shutdown(address: Optional[str] = None) -> Dict:
+    return request('POST', '/shutdown', {}, address, timeout=5)
+
+
+def wait_until_ready(address: Optional[str] = None, timeout: float = 30) -> Dict:
+    """Poll /health until the daemon answers (raises DaemonError after timeout seconds)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return health(address)
+        except DaemonError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send a job to the translation daemon')
+    parser.add_argument('--address', help=f'Unix socket or http://host:port (default: {DEFAULT_SOCKET})')
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument('--health', action='store_true', help='Show daemon status')
+    actions.add_argument('--wait', type=float, metavar='SECONDS', help='Wait until the daemon is ready')
+    actions.add_argument('--shutdown', action='store_true', help='Stop the daemon')
+    parser.add_argument('--file', help='Source file to translate')
+    parser.add_argument('--language', choices=['es', 'fr', 'ar'], help='Target language')
+    parser.add_argument('--complexity', choices=['simple', 'standard', 'complex'])
+    parser.add_argument('--save', action='store_true', help='Save the translation to docs/<lang>/')
+    parser.add_argument('--sections', action='store_true', help='Section-parallel translation')
+    parser.add_argument('--update-mode', action='store_true', help='Translate only --diff')
+    parser.add_argument('--diff', help='Changed content to translate (with --update-mode)')
+    parser.add_argument('--old-content', help='Content the translated diff replaces (with --save)')
+    parser.add_argument('--include-transifex', action='store_true')
+    parser.add_argument('--auto-transifex', action='store_true')
+    parser.add_argument('--include-collect', action='store_true')
+    parser.add_argument('--ui-strings', choices=['full', 'retrieval'], default='full')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--translation-memory', action='store_true')
+    parser.add_argument('--route', nargs='?', const='', metavar='ROUTES_JSON')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds to wait for the job (default: {DEFAULT_TIMEOUT})')
+    args = parser.parse_args()
+
+    try:
+        if args.health:
+            print(json.dumps(health(args.address), indent=2))
+            return
+        if args.wait is not None:
+            status = wait_until_ready(args.address, args.wait)
+            print(f"✅ Translation daemon ready (pid {status['pid']})", file=sys.stderr)
+            return
+        if args.shutdown:
+            shutdown(args.address)
+            print("👋 Translation daemon stopping", file=sys.stderr)
+            return
+
+        if not args.file or not args.language:
+            parser.error('--file and --language are required')
+        if args.update_mode and not args.diff:
+            parser.error('--update-mode requires --diff')
+
+        job = {
+            'file': args.file,
+            'language': args.language,
+            'complexity': args.complexity,
+            'save': args.save,
+            'sections': args.sections,
+            'diff': args.diff if args.update_mode else None,
+            'old_content': args.old_content,
+            'include_transifex': args.include_transifex,
+            'auto_transifex': args.auto_transifex,
+            'include_collect': args.include_collect,
+            'ui_strings': args.ui_strings,
+            'use_cache': not args.no_cache,
+            'translation_memory': args.translation_memory,
+            'route': args.route,
+        }
+        result = translate(job, args.address, args.timeout)
+    except DaemonError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    validation = result.get('validation')
+    if validation is not None and not validation.get('passed'):
+        print("⚠️  Some validation checks failed - review translation carefully", file=sys.stderr)
+    if result.get('saved_to'):
+        print(f"💾 Translation saved to: {result['saved_to']} ({result['elapsed_s']:.2f}s)", file=sys.stderr)
+    else:
+        print(result['translation'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Staleness manifest: which inputs each translation was produced from.
+
+docs/translation-manifest.json records, for every English article and
+target language, the hash of the source content, the hash of the
+language's skill bundle (skill, official and preferred references; see
+TranslationAgent.skill_bundle_hash) and the model the article routes to:
+
+    {
+      "quick_start.md": {
+        "es": {"source": "<sha256>", "skill": "<sha256>", "model": "...", "updated": "2026-10-18"}
+      }
+    }
+
+TranslationAgent updates the entry whenever it saves a translation, and the
+file is committed with the translations, so every checkout knows what is
+out of date. bulk_retranslate.py --stale-only translates just the pairs
+whose source, skill bundle or model changed (or that have no entry).
+
+Set TRANSLATION_MANIFEST to use another file, or to "off" to not record.
+
+Usage:
+    # Record the current translations as up to date (first use)
+    python scripts/translation_manifest.py --init --language es fr ar
+
+    # List the stale file/language pairs
+    python scripts/translation_manifest.py --stale --language es fr ar
+
+    # Fail if any pair has no entry (it would be translated at full price)
+    python scripts/translation_manifest.py --stale --fail-on-new --language es
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from datetime import date
+from typing import Dict, List, Optional
+
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from document_profile import read_document
+from translation_cache import hash_text
+
+
+DEFAULT_MANIFEST_PATH = Path('docs') / 'translation-manifest.json'
+
+
+def manifest_path() -> Optional[Path]:
+    """Manifest file for this process, or None if recording is disabled"""
+    configured = os.getenv('TRANSLATION_MANIFEST')
+    if configured is None:
+        return DEFAULT_MANIFEST_PATH
+    if configured.strip().lower() in ('', 'off', 'none', '0'):
+        return None
+    return Path(configured)
+
+
+def source_hash(source_path) -> str:
+    """Hash of an English article's current content"""
+    return hash_text(read_document(source_path))
+
+
+class TranslationManifest:
+    """Inputs of every translation, keyed by article file name and language"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: Manifest file (default: manifest_path()). With recording
+                  disabled, entries are only kept for this process.
+        """
+        self.path = Path(path) if path else manifest_path()
+        self._entries: Optional[Dict[str, Dict[str, Dict]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Dict]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None and self.path.exists():
+                self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+        return self._entries
+
+    def entry(self, source_path: str, language: str) -> Optional[Dict]:
+        """Recorded inputs of a translation, or None"""
+        with self._lock:
+            return self._load().get(Path(source_path).name, {}).get(language)
+
+    def record(self, source_path: str, language: str, source: str, skill: str, model: str):
+        """Record the inputs a translation was just produced from"""
+        with self._lock:
+            entries = self._load()
+            entries.setdefault(Path(source_path).name, {})[language] = {
+                'source': source, 'skill': skill, 'model': model,
+                'updated': date.today().isoformat(),
+            }
+            if self.path is None:
+                return
+            # Sorted and indented so manifest changes read well in PR diffs
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            part = self.path.with_name(f".{self.path.name}.part")
+            part.write_text(json.dumps(entries, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+            os.replace(part, self.path)
+
+    def stale_reasons(self, source_path: str, language: str, source: str, skill: str,
+                      model: str) -> List[str]:
+        """
+        Why a translation is out of date: 'new' (no entry), 'source', 'skill'
+        and/or 'model' changed. Empty if it is up to date.
+        """
+        entry = self.entry(source_path, language)
+        if entry is None:
+            return ['new']
+        current = {'source': source, 'skill': skill, 'model': model}
+        return [field for field, value in current.items() if entry.get(field) != value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or initialise the translation staleness manifest')
+    parser.add_argument('--language', '-l', nargs='+', choices=['es', 'fr', 'ar'], default=['es', 'fr', 'ar'],
+                        help='Target languages (default: all)')
+    parser.add_argument('--source-dir', default='docs/en', help='English articles (default: docs/en)')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--init', action='store_true',
+                        help='Record existing translations without an entry as up to date')
+    action.add_argument('--stale', action='store_true', help='List stale file/language pairs')
+    parser.add_argument('--fail-on-new', action='store_true',
+                        help='With --stale: exit with an error if any pair has no manifest entry')
+    args = parser.parse_args()
+
+    # Only skill hashes are computed, no request is sent: no real key is needed
+    os.environ.setdefault('ANTHROPIC_API_KEY', 'offline-manifest')
+    from translation_agent import TranslationAgent
+    agent = TranslationAgent(test_mode=True, use_cache=False)
+    manifest = TranslationManifest()
+
+    counts = {'recorded': 0, 'stale': 0, 'current': 0, 'new': 0}
+    for source in sorted(Path(args.source_dir).glob('*.md')):
+        for lang in args.language:
+            inputs = (source_hash(source), agent.skill_bundle_hash(lang), agent._file_model(str(source)))
+            if args.init:
+                if manifest.entry(str(source), lang) is None and agent._target_path(str(source), lang).exists():
+                    manifest.record(str(source), lang, *inputs)
+                    counts['recorded'] += 1
+                continue
+            reasons = manifest.stale_reasons(str(source), lang, *inputs)
+            if reasons:
+                counts['stale'] += 1
+                if reasons == ['new']:
+                    counts['new'] += 1
+                print(f"  • {source.name} → {lang.upper()}: {', '.join(reasons)}")
+            else:
+                counts['current'] += 1
+
+    if args.init:
+        print(f"✅ Recorded {counts['recorded']} translations in {manifest.path}")
+    else:
+        print(f"🧾 {counts['stale']} stale ({counts['new']} without an entry), {counts['current']} up to date")
+        if args.fail_on_new and counts['new']:
+            print(f"❌ {counts['new']} pairs have no manifest entry and would be translated from scratch",
+                  file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
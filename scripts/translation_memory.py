@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Paragraph-level translation memory for full-document translation.
+
+Splits markdown into blocks (paragraphs, headings, lists, tables, fenced code)
+and pairs the blocks of each docs/en article with the blocks of its approved
+docs/<lang> translation. When a new document is translated, blocks that
+already have an approved translation are replaced by placeholders before the
+request is sent; only the remaining blocks are translated by Claude and the
+known translations are stitched back in afterwards.
+
+Articles are only paired when both versions have the same block structure
+(same number of blocks, same block kinds), so a paragraph is never matched
+to the wrong translation.
+
+Usage:
+    # Show how much of a document the memory already covers
+    python scripts/translation_memory.py --file docs/en/quick_start.md --language es
+"""
+
+import re
+import sys
+import argparse
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Blocks shorter than this are too context-dependent to reuse
+MIN_BLOCK_CHARS = 20
+
+PLACEHOLDER = "<!-- TM:{id} -->"
+PLACEHOLDER_PATTERN = re.compile(r'<!-- TM:(\d+) -->')
+
+MEMORY_INSTRUCTIONS = """
+TRANSLATION MEMORY: Lines of the form <!-- TM:0 --> are placeholders for paragraphs
+that already have an approved translation. Copy every placeholder EXACTLY as-is, on its
+own line, at the same position. Do NOT translate, remove, or renumber placeholders.
+"""
+
+
+def split_blocks(content: str) -> List[Tuple[int, int]]:
+    """
+    Split markdown into blocks separated by blank lines.
+    Fenced code blocks are kept whole even if they contain blank lines.
+
+    Returns:
+        List of (start, end) character offsets, one per block
+    """
+    blocks = []
+    start = None
+    in_fence = False
+    offset = 0
+
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            in_fence = not in_fence
+        if not stripped and not in_fence:
+            if start is not None:
+                blocks.append((start, offset))
+                start = None
+        elif start is None:
+            start = offset
+        offset += len(line)
+
+    if start is not None:
+        blocks.append((start, offset))
+    return blocks
+
+
+def block_kind(block: str) -> str:
+    """Structural kind of a block (h1-h6, code, table, list, quote, image, html, p)"""
+    text = block.lstrip()
+    heading = re.match(r'(#{1,6}) ', text)
+    if heading:
+        return f"h{len(heading.group(1))}"
+    if text.startswith('```'):
+        return 'code'
+    if text.startswith('|'):
+        return 'table'
+    if re.match(r'([-*+]|\d+\.) ', text):
+        return 'list'
+    if text.startswith('>'):
+        return 'quote'
+    if text.startswith('!['):
+        return 'image'
+    if text.startswith('<'):
+        return 'html'
+    return 'p'
+
+
+def normalize(block: str) -> str:
+    """Whitespace-insensitive form of a block used for fuzzy-exact matching"""
+    return ' '.join(block.split())
+
+
+def _texts(content: str) -> List[str]:
+    return [content[start:end].rstrip() for start, end in split_blocks(content)]
+
+
+class TranslationMemory:
+    """EN → target block memory built from approved docs/<lang> translations"""
+
+    def __init__(self, target_lang: str, docs_root: Path = Path('docs')):
+        """
+        Args:
+            target_lang: Target language code (es, fr, ar)
+            docs_root: Directory containing en/ and <lang>/ subdirectories
+        """
+        self.target_lang = target_lang
+        self.docs_root = Path(docs_root)
+        self.exact: Dict[str, str] = {}
+        self.normalized: Dict[str, str] = {}
+        self.articles_used = 0
+        self._build()
+
+    def _build(self):
+        exact_votes = defaultdict(Counter)
+        normalized_votes = defaultdict(Counter)
+
+        target_dir = self.docs_root / self.target_lang
+        for source in sorted((self.docs_root / 'en').glob('*.md')):
+            target = target_dir / source.name
+            if not target.exists():
+                continue
+
+            en_blocks = _texts(source.read_text(encoding='utf-8'))
+            tr_blocks = _texts(target.read_text(encoding='utf-8'))
+            if len(en_blocks) != len(tr_blocks):
+                continue
+            if [block_kind(b) for b in en_blocks] != [block_kind(b) for b in tr_blocks]:
+                continue
+
+            self.articles_used += 1
+            for en, tr in zip(en_blocks, tr_blocks):
+                if not self._reusable(en):
+                    continue
+                exact_votes[en][tr] += 1
+                normalized_votes[normalize(en)][tr] += 1
+
+        self.exact = {en: votes.most_common(1)[0][0] for en, votes in exact_votes.items()}
+        self.normalized = {en: votes.most_common(1)[0][0] for en, votes in normalized_votes.items()}
+
+    @staticmethod
+    def _reusable(block: str) -> bool:
+        # H1 titles are article-specific (and enforced from article-titles.md)
+        return len(block) >= MIN_BLOCK_CHARS and block_kind(block) != 'h1'
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def lookup(self, block: str) -> Optional[str]:
+        """Return the approved translation of a block (exact, then normalized match)"""
+        block = block.rstrip()
+        if not self._reusable(block):
+            return None
+        if block in self.exact:
+            return self.exact[block]
+        return self.normalized.get(normalize(block))
+
+    def mask(self, content: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Replace every block with a known translation by a placeholder.
+
+        Returns:
+            Tuple of (masked_content, {placeholder_id: translation})
+        """
+        matches = {}
+        parts = []
+        cursor = 0
+        for start, end in split_blocks(content):
+            block = content[start:end].rstrip()
+            translation = self.lookup(block)
+            if translation is None:
+                continue
+            placeholder_id = str(len(matches))
+            matches[placeholder_id] = translation
+            parts.append(content[cursor:start])
+            parts.append(PLACEHOLDER.format(id=placeholder_id))
+            cursor = start + len(block)
+        parts.append(content[cursor:])
+        return ''.join(parts), matches
+
+    @staticmethod
+    def unmask(translation: str, matches: Dict[str, str]) -> Optional[str]:
+        """
+        Stitch the known translations back in.
+
+        Returns:
+            The completed translation, or None if placeholders were dropped,
+            duplicated or invented (the caller should then retranslate in full)
+        """
+        found = PLACEHOLDER_PATTERN.findall(translation)
+        if sorted(found) != sorted(matches):
+            return None
+        return PLACEHOLDER_PATTERN.sub(lambda m: matches[m.group(1)], translation)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report translation memory coverage for a document')
+    parser.add_argument('--file', required=True, help='English source document')
+    parser.add_argument('--language', required=True, choices=['es', 'fr', 'ar'], help='Target language')
+    parser.add_argument('--docs-root', default='docs', help='Docs root (default: docs)')
+    args = parser.parse_args()
+
+    memory = TranslationMemory(args.language, Path(args.docs_root))
+    content = Path(args.file).read_text(encoding='utf-8')
+    masked, matches = memory.mask(content)
+
+    print(f"📚 Memory: {len(memory)} blocks from {memory.articles_used} aligned articles", file=sys.stderr)
+    print(f"🔁 Reused blocks: {len(matches)} of {len(split_blocks(content))}")
+    print(f"📏 Characters sent for translation: {len(masked)} of {len(content)}")
+
+
+if __name__ == '__main__':
+    main()
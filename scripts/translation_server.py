@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Long-lived translation daemon.
+
+Running translation_agent.py once per file × language pays the start-up
+cost every time. Each run imports anthropic and PyGithub, loads .env,
+reads every skill reference file and opens a new HTTPS connection. The
+daemon pays that cost once. It keeps the following warm between jobs:
+
+  - one TranslationAgent per option set (Transifex/Collect tables,
+    UI-string mode, cache, memory, routes), with its per-language skill
+    contexts, template resolvers and translation memories;
+  - one Anthropic client, whose connection pool all agents share;
+  - the UI string index, article titles and document profiles.
+
+Jobs arrive as JSON over HTTP, on a Unix socket (default) or a local TCP
+port:
+
+  GET  /health      {"ok": true, "pid": ..., "jobs": ..., "agents": ..., "uptime_s": ...}
+  POST /translate   job → {"ok": true, "translation": ..., "saved_to": ..., "validation": ...}
+  POST /shutdown    stop the daemon
+
+A job holds "file" and "language". Optional fields: "diff" (update mode),
+"old_content" (apply the translated diff when saving), "save", "complexity",
+"sections", "include_transifex", "auto_transifex", "include_collect",
+"ui_strings", "use_cache", "translation_memory", "route".
+
+Use scripts/translation_client.py to send jobs.
+
+Usage:
+    # Start the daemon on the default socket (.cache/translation-agent.sock)
+    python scripts/translation_agent.py serve
+
+    # On a TCP port instead
+    python scripts/translation_agent.py serve --port 8766
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from translation_agent import TranslationAgent, DEFAULT_CONCURRENCY
+from model_routing import load_routes
+
+
+DEFAULT_SOCKET = os.getenv('TRANSLATION_AGENT_SOCKET') or str(Path('.cache') / 'translation-agent.sock')
+
+# Agent options a job may set, with their defaults
+AGENT_OPTIONS = {
+    'include_transifex': False,
+    'include_collect': False,
+    'ui_strings': 'full',
+    'use_cache': True,
+    'translation_memory': False,
+    'route': None,
+}
+
+
+class JobError(Exception):
+    """A job that cannot be run as given (reported with HTTP 400)"""
+
+
+def _job_options(job: Dict) -> Dict:
+    """The agent options of a job, with defaults; JobError if one is invalid"""
+    options = {name: job.get(name, default) for name, default in AGENT_OPTIONS.items()}
+    for name, default in AGENT_OPTIONS.items():
+        if isinstance(default, bool) and not isinstance(options[name], bool):
+            raise JobError(f"'{name}' must be true or false, not {options[name]!r}")
+    if options['ui_strings'] not in ('full', 'retrieval'):
+        raise JobError(f"'ui_strings' must be 'full' or 'retrieval', not {options['ui_strings']!r}")
+    if options['route'] is not None and not isinstance(options['route'], str):
+        raise JobError(f"'route' must be a route table path, not {options['route']!r}")
+    return options
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TranslationServer:
+    """Serves translation jobs from warm TranslationAgents"""
+
+    def __init__(self, socket_path: Optional[str] = None, host: str = '127.0.0.1',
+                 port: Optional[int] = None,
+                 agent_factory: Callable[..., TranslationAgent] = TranslationAgent):
+        """
+        Args:
+            socket_path: Unix socket to listen on (default: DEFAULT_SOCKET)
+            host / port: Listen on TCP instead when port is given (0 = any free port)
+            agent_factory: Builds agents from TranslationAgent keyword arguments
+        """
+        self.agent_factory = agent_factory
+        self.agents: Dict[Tuple, TranslationAgent] = {}
+        self.claude = None
+        self.skill_files = None
+        self.jobs = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+        handler = self._handler()
+        if port is not None:
+            self.httpd = ThreadingHTTPServer((host, port), handler)
+            self.address = f"http://{host}:{self.httpd.server_address[1]}"
+        else:
+            self.socket_path = Path(socket_path or DEFAULT_SOCKET)
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            self.socket_path.unlink(missing_ok=True)  # left over from a daemon that was killed
+            self.httpd = _UnixHTTPServer(str(self.socket_path), handler)
+            self.address = f"unix:{self.socket_path}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if isinstance(self.httpd, _UnixHTTPServer):
+            self.socket_path.unlink(missing_ok=True)
+
+    def agent(self, options: Dict) -> TranslationAgent:
+        """The warm agent for an option set, created on first use"""
+        key = tuple(sorted(options.items()))
+        with self._lock:
+            agent = self.agents.get(key)
+            if agent is None:
+                try:
+                    routes = load_routes(options['route']) if options['route'] is not None else None
+                except (OSError, ValueError) as e:
+                    raise JobError(f"Invalid route table: {e}") from e
+                agent = self.agent_factory(
+                    test_mode=True,
+                    include_transifex=options['include_transifex'],
+                    include_collect=options['include_collect'],
+                    use_cache=options['use_cache'],
+                    use_memory=options['translation_memory'],
+                    ui_strings=options['ui_strings'],
+                    routes=routes,
+                )
+                # One connection pool and one set of skill files for every agent
+                if self.claude is None:
+                    self.claude, self.skill_files = agent.claude, (agent.skill_files, agent._skill_files_lock)
+                agent.claude = self.claude
+                agent.skill_files, agent._skill_files_lock = self.skill_files
+                self.agents[key] = agent
+                print(f"🧠 Agent #{len(self.agents)} ready: "
+                      f"{', '.join(f'{k}={v}' for k, v in key)}", file=sys.stderr)
+            return agent
+
+    def health(self) -> Dict:
+        return {
+            'ok': True,
+            'pid': os.getpid(),
+            'jobs': self.jobs,
+            'agents': len(self.agents),
+            'uptime_s': round(time.monotonic() - self.started, 1),
+        }
+
+    def run_job(self, job: Dict) -> Dict:
+        """Run one translation job (see the module docstring for its fields)"""
+        source_path, target_lang = job.get('file'), job.get('language')
+        if not source_path or target_lang not in ('es', 'fr', 'ar'):
+            raise JobError("A job needs 'file' and 'language' (es, fr or ar)")
+        if not Path(source_path).exists():
+            raise JobError(f"Source file not found: {source_path}")
+
+        options = _job_options(job)
+        if job.get('auto_transifex') and not options['include_transifex']:
+            options['include_transifex'] = TranslationAgent.needs_transifex(source_path)
+        agent = self.agent(options)
+
+        started = time.monotonic()
+        name = f"{Path(source_path).name} → {target_lang.upper()}"
+        print(f"📥 Job: {name}{' (update)' if job.get('diff') else ''}", file=sys.stderr)
+        result = {'ok': True, 'saved_to': None, 'validation': None}
+
+        if job.get('diff'):
+            translation = agent.translate_diff(job['diff'], target_lang, source_path=source_path)
+            target_path = agent._target_path(source_path, target_lang)
+            if job.get('save') and job.get('old_content') and target_path.exists():
+                updated = agent.apply_translated_diff(
+                    target_path.read_text(encoding='utf-8'), translation,
+                    old_content=job['old_content'],
+                )
+                result['saved_to'] = str(agent.save_translation(updated, source_path, target_lang))
+        else:
+            if job.get('sections'):
+                translation = agent.translate_sections(
+                    source_path, target_lang, job.get('complexity'),
+                    max_concurrency=job.get('concurrency', DEFAULT_CONCURRENCY),
+                )
+            else:
+                translation = agent.translate_file(source_path, target_lang, job.get('complexity'))
+            result['validation'] = agent.validate_translation(source_path, translation, target_lang)
+            if job.get('save'):
+                result['saved_to'] = str(agent.save_translation(translation, source_path, target_lang))
+
+        with self._lock:
+            self.jobs += 1
+        result['translation'] = translation
+        result['elapsed_s'] = round(time.monotonic() - started, 3)
+        print(f"📤 Done: {name} in {result['elapsed_s']:.2f}s", file=sys.stderr)
+        return result
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: Dict):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path != '/health':
+                    return self._send(404, {'ok': False, 'error': f'Unknown path {self.path}'})
+                self._send(200, server.health())
+
+            def do_POST(self):
+                if self.path == '/shutdown':
+                    self._send(200, {'ok': True})
+                    threading.Thread(target=server.httpd.shutdown, daemon=True).start()
+                    return
+                if self.path != '/translate':
+                    return self._send(404, {'ok': False, 'error': f'Unknown path {self.path}'})
+                try:
+                    job = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                    self._send(200, server.run_job(job))
+                except (JobError, json.JSONDecodeError) as e:
+                    self._send(400, {'ok': False, 'error': str(e)})
+                except Exception as e:
+                    print(f"❌ Job failed: {e}", file=sys.stderr)
+                    self._send(500, {'ok': False, 'error': str(e)})
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='translation_agent.py serve',
+        description='Run the translation daemon (send jobs with scripts/translation_client.py)'
+    )
+    parser.add_argument('--socket', help=f'Unix socket to listen on (default: {DEFAULT_SOCKET})')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP host (with --port)')
+    parser.add_argument('--port', type=int, help='Listen on this TCP port instead of a Unix socket')
+    args = parser.parse_args(argv)
+
+    server = TranslationServer(socket_path=args.socket, host=args.host, port=args.port)
+    print(f"🚀 Translation daemon listening on {server.address} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print("👋 Translation daemon stopped", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Relevance-filtered UI string retrieval for translation prompts.
+
+Instead of pasting the whole Transifex table (transifex-ui-strings.md, ~174 KB)
+and the whole KoboCollect table (collect-strings.json, ~172 KB) into every
+prompt, this module indexes the English strings of both sources once and
+returns only the rows whose English string actually appears in the document
+being translated.
+
+Matching uses an Aho-Corasick automaton over the lower-cased English strings,
+so a document is scanned once regardless of how many strings are indexed.
+Matches must start and end on word boundaries ("Add" does not match "Address").
+
+Usage:
+    # Show the rows that would be injected for a document
+    python scripts/ui_string_index.py --file docs/en/quick_start.md --language es
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Set
+
+
+# Column order of the language columns in transifex-ui-strings.md
+TRANSIFEX_COLUMNS = ('es', 'fr', 'ar')
+
+# Shorter English strings match too much ordinary prose to be useful
+MIN_STRING_CHARS = 2
+
+
+@dataclass(frozen=True)
+class UIString:
+    """One English UI string with its translations"""
+    source: str                   # 'transifex' or 'collect'
+    english: str
+    translations: tuple           # ((lang, text), ...)
+    key: str = ''                 # Android resource key (collect only)
+
+    def translation(self, lang: str) -> str:
+        return dict(self.translations).get(lang, '')
+
+
+class AhoCorasick:
+    """Minimal Aho-Corasick automaton for multi-pattern substring search"""
+
+    def __init__(self, patterns: Dict[str, int]):
+        """
+        Args:
+            patterns: Mapping of pattern → payload id
+        """
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[tuple]] = [[]]
+
+        for pattern, payload in patterns.items():
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append((len(pattern), payload))
+
+        # Breadth-first construction of failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, payload) for every occurrence of every pattern"""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, payload in self.output[node]:
+                yield i - length + 1, i + 1, payload
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """True if index sits outside a word (start/end of text or non-alphanumeric)"""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+def parse_transifex_table(markdown: str) -> List[UIString]:
+    """Parse the rows of transifex-ui-strings.md"""
+    strings = []
+    # Some separator rows are followed by a literal "\n" and the first data row
+    for line in markdown.replace('\\n', '\n').splitlines():
+        line = line.strip()
+        if not line.startswith('|'):
+            continue
+        cols = [c.strip() for c in line.strip('|').split(' | ')]
+        if len(cols) < 1 + len(TRANSIFEX_COLUMNS):
+            continue
+        english = cols[0]
+        if not english or set(english) <= set('-') or english == 'English UI String':
+            continue
+        translations = tuple(zip(TRANSIFEX_COLUMNS, cols[1:1 + len(TRANSIFEX_COLUMNS)]))
+        strings.append(UIString('transifex', english, translations))
+    return strings
+
+
+def parse_collect_strings(json_text: str) -> List[UIString]:
+    """Parse collect-strings.json"""
+    try:
+        data = json.loads(json_text)
+        entries = data.get('strings', {})
+    except (json.JSONDecodeError, AttributeError):
+        return []
+
+    strings = []
+    for key, translations in entries.items():
+        if not isinstance(translations, dict):
+            continue
+        english = str(translations.get('en', '')).strip()
+        if not english:
+            continue
+        strings.append(UIString(
+            'collect',
+            english,
+            tuple((lang, str(translations.get(lang, ''))) for lang in TRANSIFEX_COLUMNS),
+            key=key,
+        ))
+    return strings
+
+
+class UIStringIndex:
+    """Searchable index over the Transifex and KoboCollect UI strings"""
+
+    def __init__(self, strings: List[UIString]):
+        self.strings = strings
+        patterns: Dict[str, Set[int]] = {}
+        for i, ui_string in enumerate(strings):
+            pattern = ui_string.english.lower()
+            if len(pattern) >= MIN_STRING_CHARS:
+                patterns.setdefault(pattern, set()).add(i)
+        self._groups = list(patterns.values())
+        self._automaton = AhoCorasick({p: n for n, p in enumerate(patterns)})
+        self.digest = hashlib.sha256(
+            json.dumps([(s.source, s.key, s.english, s.translations) for s in strings],
+                       ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+
+    @classmethod
+    def from_skill(cls, skill_root: Path = Path('skills/kobo-translation')) -> 'UIStringIndex':
+        """Build the index from the base skill's reference files"""
+        references = Path(skill_root) / 'references'
+        strings = []
+        transifex = references / 'transifex-ui-strings.md'
+        if transifex.exists():
+            strings += parse_transifex_table(transifex.read_text(encoding='utf-8'))
+        collect = references / 'collect-strings.json'
+        if collect.exists():
+            strings += parse_collect_strings(collect.read_text(encoding='utf-8'))
+        return cls(strings)
+
+    def find(self, document: str) -> List[UIString]:
+        """Return the UI strings whose English text appears in the document"""
+        text = document.lower()
+        hits = set()
+        for start, end, group in self._automaton.iter_matches(text):
+            if _is_boundary(text, start - 1) and _is_boundary(text, end):
+                hits.update(self._groups[group])
+        return [self.strings[i] for i in sorted(hits)]
+
+    def render(self, document: str, target_lang: str) -> str:
+        """
+        Render the relevant rows as markdown tables for the prompt.
+        Returns an empty string when no UI string appears in the document.
+        """
+        matches = self.find(document)
+        transifex = [s for s in matches if s.source == 'transifex' and s.translation(target_lang)]
+        collect = [s for s in matches if s.source == 'collect' and s.translation(target_lang)]
+
+        def cell(text: str) -> str:
+            return text.replace('|', '\\|')
+
+        sections = []
+        if transifex:
+            lines = [
+                "Web UI strings from Transifex that appear in this document — use these exact translations.",
+                "",
+                "| English UI String | Translation |",
+                "|-------------------|-------------|",
+            ]
+            lines += [f"| {cell(s.english)} | {cell(s.translation(target_lang))} |" for s in transifex]
+            sections.append("\n".join(lines))
+        if collect:
+            lines = [
+                "KoboCollect Android UI strings that appear in this document — use these exact translations.",
+                "",
+                "| Key | English | Translation |",
+                "|-----|---------|-------------|",
+            ]
+            lines += [f"| {s.key} | {cell(s.english)} | {cell(s.translation(target_lang))} |" for s in collect]
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+
+@lru_cache(maxsize=None)
+def load_index(skill_root: str = 'skills/kobo-translation') -> UIStringIndex:
+    """Build the index once per process and skill directory"""
+    return UIStringIndex.from_skill(Path(skill_root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the UI strings retrieved for a document')
+    parser.add_argument('--file', required=True, help='Source markdown document')
+    parser.add_argument('--language', required=True, choices=['es', 'fr', 'ar'], help='Target language')
+    args = parser.parse_args()
+
+    index = load_index()
+    document = Path(args.file).read_text(encoding='utf-8')
+    rendered = index.render(document, args.language)
+
+    print(f"📚 Indexed {len(index.strings)} UI strings", file=sys.stderr)
+    print(f"🔍 Relevant rows: {len(index.find(document))} ({len(rendered)} chars)", file=sys.stderr)
+    print(rendered)
+
+
+if __name__ == '__main__':
+    main()
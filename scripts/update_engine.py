@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Hunk-aware update engine for existing translations.
+
+The workflow used to collect every added line of a file into one blob and
+let apply_diff_translation.py fuzzy-place it (or append it to the end). This
+engine keeps each change where it belongs:
+
+  1. The English change is parsed into unified-diff hunks (-U0), each with
+     its line anchors in the old and new source.
+  2. The blocks of the old source are paired with the blocks of the
+     translation by the persistent alignment index (alignment_index.py),
+     so a hunk is located with a lookup instead of a text search.
+  3. Each hunk becomes an update of the translation. When the blocks it
+     touches have the same number of lines in both files (one-line
+     paragraphs, list items, table rows), only the changed lines are
+     replaced. Otherwise the hunk is widened to whole blocks and those
+     blocks are translated again from the new source.
+  4. The updates of all files for one language are translated together
+     (TranslationAgent.translate_diff_batch) and applied bottom-up.
+
+Changes that cannot be aligned are reported, so the caller can fall back to
+a full translation of that file only.
+
+Usage:
+    # Update the Spanish and French translations of the files changed since HEAD~1
+    python scripts/update_engine.py --base HEAD~1 \\
+        --jobs docs/en/a.md:es docs/en/a.md:fr docs/en/b.md:es --save
+
+    # Show the planned updates without calling the API
+    python scripts/update_engine.py --base HEAD~1 --jobs docs/en/a.md:es --dry-run
+"""
+
+import re
+import sys
+import difflib
+import argparse
+import subprocess
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from alignment_index import Alignment, AlignmentIndex, align, block_spans
+
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+@dataclass(frozen=True)
+class Hunk:
+    """One change of a unified diff, as 0-based line ranges [start, end)"""
+    old_start: int
+    old_end: int
+    new_start: int
+    new_end: int
+    removed: Tuple[str, ...] = ()
+    added: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Update:
+    """
+    A change to apply to the translation: target lines [target_start,
+    target_end) are replaced by the translation of source_text (English, from
+    the new source). target_start is None if the change could not be aligned.
+    """
+    source_text: str
+    target_start: Optional[int]
+    target_end: Optional[int]
+    old_text: str = ''
+
+    @property
+    def aligned(self) -> bool:
+        return self.target_start is not None
+
+
+def parse_unified_diff(diff_text: str) -> Dict[str, List[Hunk]]:
+    """
+    Hunks of a unified diff per file ('+++ b/path' name, prefix removed).
+    A diff without file headers is returned under the key ''.
+    """
+    files: Dict[str, List[Hunk]] = {}
+    current = files.setdefault('', [])
+    lines = diff_text.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith('+++ '):
+            name = line[4:].split('\t')[0].strip()
+            name = name[2:] if name.startswith(('a/', 'b/')) else name
+            current = files.setdefault(name, [])
+        match = _HUNK_HEADER.match(line)
+        if not match:
+            i += 1
+            continue
+        old_start, old_count, new_start, new_count = (
+            int(value) if value is not None else 1 for value in match.groups()
+        )
+        removed, added = [], []
+        i += 1
+        while i < len(lines) and not lines[i].startswith(('@@', 'diff ', '--- ', '+++ ')):
+            if lines[i].startswith('-'):
+                removed.append(lines[i][1:])
+            elif lines[i].startswith('+'):
+                added.append(lines[i][1:])
+            i += 1
+        # A count of 0 means "after line start": the range starts at start (0-based)
+        old_first = old_start if old_count == 0 else old_start - 1
+        new_first = new_start if new_count == 0 else new_start - 1
+        current.append(Hunk(old_first, old_first + old_count, new_first, new_first + new_count,
+                            tuple(removed), tuple(added)))
+    if not files['']:
+        del files['']
+    return files
+
+
+def diff_hunks(old: str, new: str) -> List[Hunk]:
+    """Hunks (without context lines) turning old into new"""
+    diff = difflib.unified_diff(old.split('\n'), new.split('\n'), n=0, lineterm='')
+    return parse_unified_diff('\n'.join(diff)).get('', [])
+
+
+class _Aligner:
+    """Maps line boundaries of the old source to line boundaries of the translation"""
+
+    def __init__(self, source: List[str], target: List[str], alignment: Alignment):
+        self.source, self.target = source, target
+        self.alignment = alignment
+        self.pairs = alignment.pairs
+        self.target_starts = [start for start, _ in block_spans(target)]
+
+    def parallel(self, block: int) -> bool:
+        """Whether a source block and its target block have the same number of lines"""
+        pair = self.pairs[block]
+        return pair.target is not None and \
+            pair.source[1] - pair.source[0] == pair.target[1] - pair.target[0]
+
+    def position(self, line: int) -> Optional[int]:
+        """Target line boundary matching the boundary before source line `line`"""
+        if line >= len(self.source):
+            return len(self.target)
+        block = self.alignment.block_at(line)
+        if block is not None:
+            pair = self.pairs[block]
+            if pair.target is None:
+                return None
+            if line == pair.source[0] or self.parallel(block):
+                return pair.target[0] + line - pair.source[0]
+            return None
+
+        # A blank line: anchor on the block before it (or the top of the file)
+        block = self.alignment.block_before(line)
+        if block is None:
+            return min(line, self.target_starts[0] if self.target_starts else len(self.target))
+        pair = self.pairs[block]
+        if pair.target is None:
+            return None
+        following = bisect_right(self.target_starts, pair.target[0])
+        limit = self.target_starts[following] if following < len(self.target_starts) else len(self.target)
+        return min(pair.target[1] + line - pair.source[1], limit)
+
+    def widen(self, start: int, end: int) -> Tuple[int, int]:
+        """Grow [start, end) to whole source blocks where its ends fall inside a block"""
+        block = self.alignment.block_at(start)
+        if block is not None and self.position(start) is None:
+            start = self.pairs[block].source[0]
+        block = self.alignment.block_at(end) if end < len(self.source) else None
+        if block is not None and self.position(end) is None:
+            end = self.pairs[block].source[1]
+        return start, end
+
+
+def plan_updates(old_source: str, new_source: str, translation: str,
+                 hunks: Optional[List[Hunk]] = None,
+                 alignment: Optional[Alignment] = None) -> List[Update]:
+    """
+    The updates that bring a translation of old_source up to date with
+    new_source, top to bottom.
+
+    Args:
+        hunks: The changes (default: diff_hunks(old_source, new_source))
+        alignment: Block alignment of old_source and translation (default: computed)
+    """
+    source, new, target = old_source.split('\n'), new_source.split('\n'), translation.split('\n')
+    if hunks is None:
+        hunks = diff_hunks(old_source, new_source)
+    if alignment is None:
+        alignment = Alignment(align(old_source, translation))
+    aligner = _Aligner(source, target, alignment)
+
+    # Widen hunks to whole blocks where needed, merging those that then overlap
+    spans: List[List[int]] = []
+    for hunk in hunks:
+        old_start, old_end = aligner.widen(hunk.old_start, hunk.old_end)
+        new_start = hunk.new_start - (hunk.old_start - old_start)
+        new_end = hunk.new_end + (old_end - hunk.old_end)
+        if spans and old_start < spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], old_end)
+            spans[-1][3] = max(spans[-1][3], new_end)
+        else:
+            spans.append([old_start, old_end, new_start, new_end])
+
+    updates = []
+    for old_start, old_end, new_start, new_end in spans:
+        target_start, target_end = aligner.position(old_start), aligner.position(old_end)
+        if target_start is None or target_end is None or target_end < target_start:
+            target_start = target_end = None
+        updates.append(Update(
+            source_text='\n'.join(new[new_start:new_end]),
+            target_start=target_start,
+            target_end=target_end,
+            old_text='\n'.join(source[old_start:old_end]),
+        ))
+    return updates
+
+
+def _with_padding(source_text: str, translated: str) -> List[str]:
+    """Translated lines, with the blank lines that surrounded the source text"""
+    lines = source_text.split('\n')
+    lead = len(lines) - len(source_text.lstrip('\n').split('\n'))
+    trail = len(lines) - len(source_text.rstrip('\n').split('\n'))
+    return [''] * lead + translated.strip('\n').split('\n') + [''] * trail
+
+
+def apply_updates(translation: str, updates: List[Update],
+                  translations: List[Optional[str]]) -> Tuple[str, List[bool]]:
+    """
+    Apply aligned updates with their translated text (bottom-up, so earlier
+    line numbers stay valid). Updates without a translation, or that are not
+    aligned, are left out.
+
+    Returns:
+        The updated translation and, per update, whether it was applied
+    """
+    lines = translation.split('\n')
+    applied = [False] * len(updates)
+    order = sorted(range(len(updates)), key=lambda i: updates[i].target_start or 0, reverse=True)
+    for index in order:
+        update, translated = updates[index], translations[index]
+        if not update.aligned:
+            continue
+        if update.source_text.strip():
+            if translated is None:
+                continue
+            replacement = _with_padding(update.source_text, translated)
+        else:
+            replacement = update.source_text.split('\n') if update.source_text else []
+        lines[update.target_start:update.target_end] = replacement
+        applied[index] = True
+    return '\n'.join(lines), applied
+
+
+def _git_show(revision: str, path: str) -> Optional[str]:
+    """A file's content at a revision (None if it did not exist there)"""
+    result = subprocess.run(['git', 'show', f'{revision}:{path}'], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def update_translations(agent, jobs: List[Tuple[str, str]], base: str, save: bool = False,
+                        index: Optional[AlignmentIndex] = None) -> Dict[Tuple[str, str], Dict]:
+    """
+    Bring the translations of (source_path, language) jobs up to date with
+    the changes to their sources since revision base. Alignments come from
+    the index (default: the agent's), and saving refreshes them.
+
+    Returns:
+        Per job: status ('updated', 'unchanged', 'full' when a change could not
+        be aligned or there is no base version, or 'failed'), hunk counts and
+        the updated translation
+    """
+    index = index or agent.alignment
+    plans = {}
+    results = {}
+    for source_path, lang in jobs:
+        old_source = _git_show(base, source_path)
+        target_path = agent._target_path(source_path, lang)
+        if old_source is None or not target_path.exists():
+            results[(source_path, lang)] = {'status': 'full', 'hunks': 0, 'applied': 0}
+            continue
+        new_source = Path(source_path).read_text(encoding='utf-8')
+        translation = target_path.read_text(encoding='utf-8')
+        alignment = index.get(source_path, lang, old_source, translation)
+        updates = plan_updates(old_source, new_source, translation, alignment=alignment)
+        if not updates:
+            results[(source_path, lang)] = {'status': 'unchanged', 'hunks': 0, 'applied': 0}
+        elif not all(update.aligned for update in updates):
+            results[(source_path, lang)] = {'status': 'full', 'hunks': len(updates), 'applied': 0}
+        else:
+            plans[(source_path, lang)] = updates
+
+    # One batch of translations per language
+    translated: Dict[Tuple[str, str], List[Optional[str]]] = {job: [] for job in plans}
+    for lang in dict.fromkeys(lang for _, lang in plans):
+        pending = [(job, i) for job, updates in plans.items() if job[1] == lang
+                   for i, update in enumerate(updates) if update.source_text.strip()]
+        texts = agent.translate_diff_batch(
+            [(job[0], plans[job][i].source_text.strip('\n')) for job, i in pending], lang
+        ) if pending else []
+        for job in plans:
+            if job[1] == lang:
+                translated[job] = [None] * len(plans[job])
+        for (job, i), text in zip(pending, texts):
+            translated[job][i] = text
+
+    for job, updates in plans.items():
+        source_path, lang = job
+        target_path = agent._target_path(source_path, lang)
+        updated, applied = apply_updates(target_path.read_text(encoding='utf-8'), updates, translated[job])
+        results[job] = {
+            'status': 'updated' if all(applied) else 'failed',
+            'hunks': len(updates),
+            'applied': sum(applied),
+            'translation': updated,
+        }
+        if save and all(applied):
+            agent.save_translation(updated, source_path, lang)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply English source changes to existing translations, hunk by hunk')
+    parser.add_argument('--base', required=True, help='Git revision the translations match (e.g. HEAD~1)')
+    parser.add_argument('--jobs', nargs='+', required=True, metavar='FILE:LANG',
+                        help='Source files and languages to update (e.g. docs/en/a.md:es)')
+    parser.add_argument('--save', action='store_true', help='Write the updated translations')
+    parser.add_argument('--dry-run', action='store_true', help='Show the planned updates without calling the API')
+    parser.add_argument('--include-transifex', action='store_true',
+                        help='Include Transifex UI strings in the prompt (~150k chars)')
+    parser.add_argument('--include-collect', action='store_true',
+                        help='Include KoboCollect Android UI strings in the prompt (~60-70k chars)')
+    parser.add_argument('--ui-strings', choices=['full', 'retrieval'], default='full',
+                        help="'full' (default): paste the tables enabled above. 'retrieval': inject only "
+                             "the rows whose English string appears in the changes")
+    parser.add_argument('--route', nargs='?', const='', metavar='ROUTES_JSON',
+                        help='Route requests by complexity (see model_routing.py)')
+    args = parser.parse_args()
+
+    jobs = []
+    for job in args.jobs:
+        file_path, sep, lang = job.rpartition(':')
+        if not sep or lang not in ('es', 'fr', 'ar'):
+            parser.error(f"Invalid job (expected FILE:LANG with LANG in es, fr, ar): {job}")
+        jobs.append((file_path, lang))
+
+    if args.dry_run:
+        index = AlignmentIndex()
+        for source_path, lang in jobs:
+            old_source = _git_show(args.base, source_path)
+            target_path = Path('docs') / lang / Path(source_path).name
+            if old_source is None or not target_path.exists():
+                print(f"  • {source_path} → {lang.upper()}: full translation (no base version or translation)")
+                continue
+            translation = target_path.read_text(encoding='utf-8')
+            updates = plan_updates(old_source, Path(source_path).read_text(encoding='utf-8'), translation,
+                                   alignment=index.get(source_path, lang, old_source, translation))
+            print(f"  • {source_path} → {lang.upper()}: {len(updates)} update(s)")
+            for update in updates:
+                where = (f"lines {update.target_start + 1}-{update.target_end}" if update.aligned
+                         else "NOT ALIGNED")
+                print(f"      {where}: {update.source_text.strip()[:60]!r}")
+        return
+
+    from translation_agent import TranslationAgent
+    from model_routing import load_routes
+
+    agent = TranslationAgent(
+        test_mode=True,
+        include_transifex=args.include_transifex,
+        include_collect=args.include_collect,
+        ui_strings=args.ui_strings,
+        routes=load_routes(args.route) if args.route is not None else None,
+    )
+    results = update_translations(agent, jobs, args.base, save=args.save)
+
+    failed = 0
+    for (source_path, lang), result in results.items():
+        label = f"{source_path}:{lang}"
+        if result['status'] == 'updated':
+            print(f"✅ UPDATE OK: {label} ({result['applied']} hunk(s))", file=sys.stderr)
+            if not args.save:
+                print(result['translation'])
+        elif result['status'] == 'unchanged':
+            print(f"ℹ️  UPDATE SKIPPED: {label} (no changes)", file=sys.stderr)
+        elif result['status'] == 'full':
+            print(f"↩️  NEEDS FULL: {label}", file=sys.stderr)
+        else:
+            failed += 1
+            print(f"❌ UPDATE FAILED: {label} ({result['applied']}/{result['hunks']} hunks applied)",
+                  file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
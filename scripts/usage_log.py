@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Structured usage and cost telemetry for translation API calls.
+
+Every Claude API call made by TranslationAgent and SRTTranslationAgent
+appends one JSON record to a JSONL log (default: .cache/usage.jsonl,
+override with the TRANSLATION_USAGE_LOG environment variable, or set it
+to "off" to disable logging). Each record holds:
+
+  run, time, file, language, mode (new / diff / section / batch / continuation /
+  srt chunk), model, input_tokens, output_tokens, cache_read_tokens,
+  cache_write_tokens, latency_s, cost_usd, and truncated: true when the
+  output stopped at max_tokens
+
+Records from one process share a run id (TRANSLATION_RUN_ID if set, e.g. the
+CI run number), so a run's cost can be totalled without parsing logs.
+
+Pricing lives here and is used for every cost estimate in the scripts.
+
+Usage:
+    # Totals per language for the last run
+    python scripts/usage_log.py --last --by language
+
+    # Total cost of a CI run, as a bare number
+    python scripts/usage_log.py --run "$TRANSLATION_RUN_ID" --total-cost
+
+    # Prompt-cache hit rate of the last run, per mode (new / diff / section)
+    python scripts/usage_log.py --last --cache
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+DEFAULT_LOG_PATH = Path('.cache') / 'usage.jsonl'
+
+# USD per million tokens
+PRICING = {
+    'claude-sonnet-4-5-20250929': {
+        'input': 3.00,
+        'output': 15.00,
+        'cache_write': 3.75,  # 25% premium
+        'cache_read': 0.30,   # 90% discount
+    },
+    'claude-haiku-4-5-20251001': {
+        'input': 1.00,
+        'output': 5.00,
+        'cache_write': 1.25,
+        'cache_read': 0.10,
+    },
+}
+DEFAULT_PRICING = PRICING['claude-sonnet-4-5-20250929']
+
+# Message Batches are billed at half the standard rate
+BATCH_DISCOUNT = 0.5
+
+RUN_ID = os.getenv('TRANSLATION_RUN_ID') or datetime.now().strftime('%Y%m%dT%H%M%S') + f"-{os.getpid()}"
+
+_lock = threading.Lock()
+
+# Records written by this process, for in-process cost totals
+_session: List[Dict] = []
+
+
+def log_path() -> Optional[Path]:
+    """Log file for this process, or None if logging is disabled"""
+    configured = os.getenv('TRANSLATION_USAGE_LOG')
+    if configured is None:
+        return DEFAULT_LOG_PATH
+    if configured.strip().lower() in ('', 'off', 'none', '0'):
+        return None
+    return Path(configured)
+
+
+def token_counts(usage) -> Dict[str, int]:
+    """Token counts from a response.usage object"""
+    return {
+        'input_tokens': usage.input_tokens,
+        'output_tokens': usage.output_tokens,
+        'cache_read_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        'cache_write_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+    }
+
+
+def estimate_cost(tokens: Dict[str, int], model: str = None, batch: bool = False) -> float:
+    """Cost in USD of one call, from token_counts()"""
+    prices = PRICING.get(model, DEFAULT_PRICING)
+    cost = (
+        tokens['input_tokens'] * prices['input']
+        + tokens['output_tokens'] * prices['output']
+        + tokens['cache_write_tokens'] * prices['cache_write']
+        + tokens['cache_read_tokens'] * prices['cache_read']
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+def record(file: Optional[str], language: str, mode: str, usage, model: str,
+           latency: Optional[float] = None, batch: bool = False,
+           stop_reason: Optional[str] = None) -> Dict:
+    """
+    Build the usage record for one API call and append it to the log.
+
+    Args:
+        file: Source file the call translated (None if unknown)
+        language: Target language code
+        mode: 'new', 'diff', 'section', 'continuation', 'srt chunk', ...
+        usage: response.usage from the API
+        model: Model id the call used
+        latency: Wall-clock seconds for the call (None for batch results)
+        batch: True if the call was part of a Message Batch
+        stop_reason: response.stop_reason; output cut off at max_tokens is
+                     recorded as truncated
+
+    Returns:
+        The record (also returned when logging is disabled)
+    """
+    tokens = token_counts(usage)
+    entry = {
+        'run': RUN_ID,
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'file': str(file) if file else None,
+        'language': language,
+        'mode': mode,
+        'model': model,
+        **tokens,
+        'latency_s': round(latency, 3) if latency is not None else None,
+        'cost_usd': round(estimate_cost(tokens, model, batch), 6),
+    }
+    if batch:
+        entry['batch'] = True
+    if stop_reason == 'max_tokens':
+        entry['truncated'] = True
+
+    path = log_path()
+    with _lock:
+        _session.append(entry)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as log:
+                log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    return entry
+
+
+def session_records(file: Optional[str] = None, language: Optional[str] = None) -> List[Dict]:
+    """Records of this process's API calls, optionally for one file and/or language"""
+    with _lock:
+        return [
+            entry for entry in _session
+            if (file is None or entry['file'] == str(file))
+            and (language is None or entry['language'] == language)
+        ]
+
+
+def session_cost(file: Optional[str] = None, language: Optional[str] = None) -> float:
+    """Cost in USD of this process's API calls, optionally for one file and/or language"""
+    return sum(entry['cost_usd'] for entry in session_records(file, language))
+
+
+def _empty_totals() -> Dict:
+    return {
+        'calls': 0, 'input_tokens': 0, 'output_tokens': 0,
+        'cache_read_tokens': 0, 'cache_write_tokens': 0, 'cache_hits': 0,
+        'truncated': 0, 'cost_usd': 0.0, 'latency_s': 0.0,
+    }
+
+
+def total_tokens(totals: Dict) -> int:
+    """Every billed token of a record or totals: uncached, cache read/write and output"""
+    return sum(totals.get(field) or 0 for field in
+               ('input_tokens', 'cache_read_tokens', 'cache_write_tokens', 'output_tokens'))
+
+
+def read_records(path: Path) -> List[Dict]:
+    """Read every record of a usage log (malformed lines are skipped)"""
+    records = []
+    if not path.exists():
+        return records
+    with open(path, encoding='utf-8') as log:
+        for line in log:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def summarize(records: Iterable[Dict], by: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Total calls, tokens, cost and latency, grouped by a record field.
+
+    cache_hits counts the calls that read their prompt prefix from cache;
+    cache_hit_rate is the share of prompt tokens that were cache reads;
+    truncated counts the calls whose output stopped at max_tokens.
+
+    Returns:
+        {group: totals}; the single group is 'total' when by is None
+    """
+    groups: Dict[str, Dict] = {}
+    for entry in records:
+        key = str(entry.get(by)) if by else 'total'
+        totals = groups.get(key)
+        if totals is None:
+            totals = groups[key] = _empty_totals()
+        totals['calls'] += 1
+        totals['cache_hits'] += bool(entry.get('cache_read_tokens'))
+        totals['truncated'] += bool(entry.get('truncated'))
+        for field in ('input_tokens', 'output_tokens', 'cache_read_tokens',
+                      'cache_write_tokens', 'cost_usd'):
+            totals[field] += entry.get(field) or 0
+        totals['latency_s'] += entry.get('latency_s') or 0
+    for totals in groups.values():
+        prompt_tokens = totals['input_tokens'] + totals['cache_read_tokens'] + totals['cache_write_tokens']
+        totals['cache_hit_rate'] = totals['cache_read_tokens'] / prompt_tokens if prompt_tokens else 0.0
+    return groups
+
+
+def totals(records: Iterable[Dict]) -> Dict:
+    """summarize() of records as a single group (all zeros if there are none)"""
+    return summarize(records).get('total') or {**_empty_totals(), 'cache_hit_rate': 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize translation API usage and cost')
+    parser.add_argument('--log', help=f'Usage log (default: $TRANSLATION_USAGE_LOG or {DEFAULT_LOG_PATH})')
+    runs = parser.add_mutually_exclusive_group()
+    runs.add_argument('--run', help='Only records of this run id')
+    runs.add_argument('--last', action='store_true', help='Only records of the most recent run')
+    parser.add_argument('--by', choices=['file', 'language', 'mode', 'run', 'model'],
+                        help='Group totals by this field')
+    parser.add_argument('--cache', action='store_true',
+                        help='Report prompt-cache hits and reads (grouped by mode unless --by is given)')
+    parser.add_argument('--json', action='store_true', help='Print the totals as JSON')
+    parser.add_argument('--total-cost', action='store_true',
+                        help='Print only the total cost in USD (for scripts)')
+    args = parser.parse_args()
+
+    path = Path(args.log) if args.log else (log_path() or DEFAULT_LOG_PATH)
+    records = read_records(path)
+    if args.last and records:
+        args.run = records[-1].get('run')
+    if args.run:
+        records = [r for r in records if r.get('run') == args.run]
+
+    if args.total_cost:
+        print(f"{sum(r.get('cost_usd') or 0 for r in records):.4f}")
+        return
+
+    if args.cache and not args.by:
+        args.by = 'mode'
+    groups = summarize(records, args.by)
+    if args.json:
+        print(json.dumps(groups, indent=2))
+        return
+
+    if not records:
+        print(f"ℹ️  No usage records in {path}", file=sys.stderr)
+        return
+
+    print(f"📊 {len(records)} API calls from {path}" + (f" (run {args.run})" if args.run else ""))
+    if args.cache:
+        for key, totals in sorted(groups.items()):
+            print(f"  • {key}: {totals['cache_hits']}/{totals['calls']} calls read from cache, "
+                  f"{totals['cache_hit_rate']:.0%} of prompt tokens "
+                  f"({totals['cache_read_tokens']:,} read / {totals['cache_write_tokens']:,} write / "
+                  f"{totals['input_tokens']:,} uncached)")
+        return
+    for key, totals in sorted(groups.items()):
+        throughput = totals['output_tokens'] / totals['latency_s'] if totals['latency_s'] else 0
+        label = f"{key}: " if args.by else ""
+        print(f"  • {label}{totals['calls']} calls, "
+              f"{totals['input_tokens']:,} in / {totals['output_tokens']:,} out, "
+              f"cache {totals['cache_read_tokens']:,} read / {totals['cache_write_tokens']:,} write, "
+              f"{totals['latency_s']:.1f}s ({throughput:.0f} tok/s), "
+              f"${totals['cost_usd']:.4f}"
+              + (f", {totals['truncated']} truncated at max_tokens" if totals['truncated'] else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Stand-ins for the Anthropic API shared by the translation script tests:
+  - make_response / stub_claude: canned Message responses on a mocked client
+  - FakeAsyncAnthropic: async client that tracks requests in flight
+  - MessagesStub / api_error: local /v1/messages endpoint for real SDK errors
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+import translation_agent
+
+
+def make_response(text: str, input_tokens: int = 100, output_tokens: int = 50):
+    """Build an object shaped like an anthropic Message response."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        ),
+        stop_reason="end_turn",
+    )
+
+
+def stub_claude(agent, *responses):
+    """
+    Replace the agent's API client with a Mock and return its messages.create.
+    One response is returned for every call; several are returned in turn.
+    Strings are wrapped with make_response(); responses and exceptions are
+    used as they are.
+    """
+    responses = [make_response(r) if isinstance(r, str) else r for r in responses]
+    agent.claude = mock.Mock()
+    create = agent.claude.messages.create
+    if len(responses) == 1 and not isinstance(responses[0], Exception):
+        create.return_value = responses[0]
+    elif responses:
+        create.side_effect = responses
+    return create
+
+
+class FakeAsyncAnthropic:
+    """Stand-in for anthropic.AsyncAnthropic that tracks concurrency."""
+
+    instances = []
+
+    def __init__(self, api_key=None, delay: float = 0.05, fail_for=(), max_retries=None):
+        self.delay = delay
+        self.fail_for = set(fail_for)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.messages = SimpleNamespace(create=self._create)
+        FakeAsyncAnthropic.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            prompt = kwargs["messages"][0]["content"][-1]["text"]
+            lang = prompt.split("TARGET LANGUAGE: ")[1].split("\n")[0]
+            if lang in self.fail_for:
+                raise RuntimeError(f"boom {lang}")
+            return make_response(f"# translated {lang}")
+        finally:
+            self.in_flight -= 1
+
+
+class MessagesStub:
+    """Local /v1/messages endpoint that replays a script of HTTP statuses"""
+
+    LIMIT_HEADERS = {
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "49",
+        "anthropic-ratelimit-input-tokens-limit": "30000",
+        "anthropic-ratelimit-input-tokens-remaining": "29000",
+        "anthropic-ratelimit-output-tokens-limit": "8000",
+        "anthropic-ratelimit-output-tokens-remaining": "7900",
+    }
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                stub.calls += 1
+                if status == 200:
+                    body = {
+                        "id": "msg_1", "type": "message", "role": "assistant",
+                        "model": translation_agent.MODEL,
+                        "content": [{"type": "text", "text": "# Traducido"}],
+                        "stop_reason": "end_turn", "stop_sequence": None,
+                        "usage": {"input_tokens": 10, "output_tokens": 5,
+                                  "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0},
+                    }
+                    headers = stub.LIMIT_HEADERS
+                else:
+                    body = {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}}
+                    headers = {"retry-after-ms": "10"}
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
+
+
+MINIMAL_REQUEST = {
+    "model": translation_agent.MODEL,
+    "max_tokens": 100,
+    "messages": [{"role": "user", "content": [{"type": "text", "text": "Hello"}]}],
+}
+
+
+def api_error(status: int):
+    """A real SDK exception for an HTTP status, produced by the local stub"""
+    with MessagesStub([status]) as stub:
+        client = translation_agent.anthropic.Anthropic(api_key="stub", base_url=stub.url, max_retries=0)
+        try:
+            client.messages.create(**MINIMAL_REQUEST)
+        except translation_agent.anthropic.APIStatusError as e:
+            return e
+    raise AssertionError("stub did not fail")
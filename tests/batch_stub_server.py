@@ -0,0 +1,165 @@
+"""
+Local stand-in for the Message Batches endpoints of the Anthropic API.
+
+Implements just enough of the API for BatchRunner:
+  POST /v1/messages/batches                 create a batch
+  GET  /v1/messages/batches/<id>            status (ends after `polls_until_ended` checks)
+  GET  /v1/messages/batches/<id>/results    JSONL results
+
+Each request is "translated" by echoing its source document prefixed with
+the target language, e.g. "[ES] # Title". Requests whose target language is
+in `fail_languages` come back as errored results.
+
+Used by tests/test_translation_agent.py; it can also be run by hand to try
+bulk_retranslate.py --batch without an API key:
+
+    python tests/batch_stub_server.py --port 8765
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=stub \\
+        python scripts/bulk_retranslate.py --language es --files quick_start.md --batch --poll-interval 1
+"""
+
+import re
+import json
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+TIMESTAMP = "2025-01-01T00:00:00Z"
+
+
+def echo_translation(params: dict) -> str:
+    """The stub's 'translation' of a messages.create() request"""
+    prompt = params["messages"][0]["content"][-1]["text"]
+    lang = re.search(r"TARGET LANGUAGE: (\w+)", prompt).group(1)
+    source = prompt.split("---BEGIN SOURCE DOCUMENT---\n")[1].split("\n---END SOURCE DOCUMENT---")[0]
+    return f"[{lang}] {source}"
+
+
+class StubBatchServer:
+    """Threaded HTTP server that mimics the Message Batches API"""
+
+    def __init__(self, port: int = 0, polls_until_ended: int = 2, fail_languages=()):
+        self.polls_until_ended = polls_until_ended
+        self.fail_languages = {lang.upper() for lang in fail_languages}
+        self.batches = {}
+        self.polls = {}
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
+
+    def _batch(self, batch_id: str) -> dict:
+        requests = self.batches[batch_id]
+        ended = self.polls[batch_id] >= self.polls_until_ended
+        failed = sum(1 for r in requests if self._fails(r))
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(requests),
+                "succeeded": len(requests) - failed if ended else 0,
+                "errored": failed if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+            "created_at": TIMESTAMP,
+            "expires_at": TIMESTAMP,
+            "ended_at": TIMESTAMP if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+        }
+
+    def _fails(self, request: dict) -> bool:
+        return echo_translation(request["params"]).split("]")[0][1:] in self.fail_languages
+
+    def _result(self, request: dict) -> dict:
+        if self._fails(request):
+            return {
+                "custom_id": request["custom_id"],
+                "result": {
+                    "type": "errored",
+                    "error": {"type": "error", "error": {"type": "api_error", "message": "stub failure"}},
+                },
+            }
+        text = echo_translation(request["params"])
+        return {
+            "custom_id": request["custom_id"],
+            "result": {
+                "type": "succeeded",
+                "message": {
+                    "id": f"msg_{request['custom_id']}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["params"]["model"],
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {
+                        "input_tokens": 1000,
+                        "output_tokens": len(text.split()),
+                        "cache_creation_input_tokens": 0,
+                        "cache_read_input_tokens": 0,
+                    },
+                },
+            },
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type: str = "application/json"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path.split("?")[0] != "/v1/messages/batches":
+                    return self._send(404, json.dumps({"type": "error"}))
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                batch_id = f"msgbatch_{len(server.batches):04d}"
+                server.batches[batch_id] = body["requests"]
+                server.polls[batch_id] = 0
+                self._send(200, json.dumps(server._batch(batch_id)))
+
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if parts[:3] != ["v1", "messages", "batches"] or len(parts) < 4 \
+                        or parts[3] not in server.batches:
+                    return self._send(404, json.dumps({"type": "error"}))
+                batch_id = parts[3]
+                if len(parts) == 5 and parts[4] == "results":
+                    lines = [json.dumps(server._result(r)) for r in server.batches[batch_id]]
+                    return self._send(200, "\n".join(lines) + "\n", "application/binary")
+                server.polls[batch_id] += 1
+                self._send(200, json.dumps(server._batch(batch_id)))
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the stand-in Message Batches server")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    with StubBatchServer(port=args.port) as stub:
+        print(f"🧪 Stub Message Batches API on {stub.url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
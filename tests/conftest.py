@@ -0,0 +1,69 @@
+"""
+Shared setup for the translation script tests: environment, import path and
+the agent fixtures every module builds on.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Dummy key so TranslationAgent can be constructed without network access
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-key-not-used")
+# Keep test API calls out of the real usage log (tests that need it set their own)
+os.environ["TRANSLATION_USAGE_LOG"] = "off"
+# Likewise for the alignment index and staleness manifest refreshed on every save
+os.environ["TRANSLATION_ALIGNMENT_INDEX"] = "off"
+os.environ["TRANSLATION_MANIFEST"] = "off"
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from translation_agent import TranslationAgent
+from api_stubs import stub_claude
+
+
+@pytest.fixture
+def agent():
+    return TranslationAgent(test_mode=True, use_cache=False)
+
+
+@pytest.fixture
+def cached_agent(tmp_path):
+    return TranslationAgent(test_mode=True, cache_path=str(tmp_path / "cache.sqlite3"))
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "sample.md"
+    path.write_text("# Sample\n\nSome KoboToolbox text.\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    A repository checkout in tmp_path, used as the working directory: the real
+    skills (loaded relative to it) and an empty docs/en for the articles
+    """
+    (tmp_path / "skills").symlink_to(SCRIPTS_DIR.parent / "skills")
+    (tmp_path / "docs" / "en").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def make_bulk():
+    """
+    Build a BulkRetranslator (no cache) whose API client answers every request
+    with a canned translation; pass response=... for another one
+    """
+    import bulk_retranslate
+
+    def make(languages=("es", "fr"), response="# Traducción\n", **kwargs):
+        bulk = bulk_retranslate.BulkRetranslator(list(languages), use_cache=False, **kwargs)
+        stub_claude(bulk.agent, response)
+        return bulk
+
+    return make
@@ -0,0 +1,51 @@
+"""
+Tests for scripts/alignment_index.py:
+  - persistent EN ↔ target block alignment index
+"""
+
+from unittest import mock
+
+import alignment_index
+
+
+class TestAlignmentIndex:
+    SOURCE = ("# Title\n\nA paragraph wrapped\nover two lines.\n\n"
+              "- See [the guide](guide.md)\n- Step 2\n\n| A | B |\n|---|---|\n\nLast of 3 paragraphs.\n")
+    TRANSLATION = ("# Título\n\nUn párrafo en una línea.\n\n> Nota del traductor.\n\n"
+                   "- Vea [la guía](guide.md)\n- Paso 2\n\n| A | B |\n|---|---|\n\nÚltimo de 3 párrafos.\n")
+
+    def test_blocks_pair_on_structural_fingerprints(self):
+        pairs = alignment_index.align(self.SOURCE, self.TRANSLATION)
+        assert [(p.source, p.target) for p in pairs] == [
+            ((0, 1), (0, 1)), ((2, 4), (2, 3)), ((5, 7), (6, 8)), ((8, 10), (9, 11)), ((11, 12), (12, 13)),
+        ]
+        assert pairs[2].fingerprint == "list|2|guide.md|2"
+
+        alignment = alignment_index.Alignment(pairs)
+        assert alignment.block_at(3) == 1 and alignment.block_at(4) is None
+        assert alignment.block_before(4) == 1 and alignment.block_before(0) is None
+
+    def test_index_is_persisted_and_rebuilt_when_texts_change(self, tmp_path):
+        path = tmp_path / "alignment.sqlite3"
+        alignment_index.AlignmentIndex(path).update("docs/en/a.md", "es", self.SOURCE, self.TRANSLATION)
+
+        reopened = alignment_index.AlignmentIndex(path)
+        with mock.patch.object(alignment_index, "align", wraps=alignment_index.align) as align:
+            stored = reopened.get("docs/en/a.md", "es", self.SOURCE, self.TRANSLATION)
+            assert align.call_count == 0
+            assert stored.coverage == 1.0
+            reopened.get("docs/en/a.md", "es", self.SOURCE, self.TRANSLATION + "\nEditado.\n")
+            assert align.call_count == 1
+        assert reopened.stats() == {"entries": 1}
+
+    def test_saving_a_translation_refreshes_its_alignment(self, agent, tmp_path, monkeypatch):
+        (tmp_path / "docs" / "en").mkdir(parents=True)
+        source = tmp_path / "docs" / "en" / "a.md"
+        source.write_text(self.SOURCE, encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+        agent.alignment = alignment_index.AlignmentIndex(tmp_path / "alignment.sqlite3")
+
+        agent.save_translation(self.TRANSLATION, "docs/en/a.md", "es")
+
+        entry = agent.alignment._load("docs/en/a.md", "es")
+        assert entry is not None and len(entry[2]) == 5
@@ -0,0 +1,148 @@
+"""
+Tests for scripts/bulk_retranslate.py:
+  - worker pool over file × language pairs (--workers)
+  - exact per-language/per-file usage and --max-cost / --max-tokens budgets
+"""
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+import translation_agent
+import usage_log
+from model_routing import STANDARD_MODEL
+import run_estimate
+from job_journal import JobJournal
+from api_stubs import FakeAsyncAnthropic, make_response
+
+
+class TestBulkWorkers:
+    @pytest.fixture
+    def workdir(self, workdir):
+        for name in ("a", "b", "c"):
+            (workdir / "docs" / "en" / f"{name}.md").write_text(f"# {name}\n\nText.\n", encoding="utf-8")
+        return workdir
+
+    def track_requests(self, bulk):
+        """Answer slowly, fail b.md → FR and return the peak number of requests in flight"""
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def create(**request):
+            source = request["messages"][0]["content"][-1]["text"]
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            try:
+                # Later jobs finish first; one pair fails
+                time.sleep(0.05 if "# a" in source else 0.01)
+                if "# b" in source and "TARGET LANGUAGE: FR" in source:
+                    raise RuntimeError("overloaded")
+                return make_response("# Traducción\n")
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        bulk.agent.claude.messages.create.side_effect = create
+        return peak
+
+    def test_pairs_run_concurrently_with_ordered_output_and_isolated_failures(self, workdir, make_bulk, capsys):
+        import bulk_retranslate
+
+        bulk = make_bulk(workers=6)
+        peak = self.track_requests(bulk)
+        bulk.run(source_dir=workdir / "docs" / "en")
+
+        assert peak[0] > 1
+        assert (bulk.stats["successful"], bulk.stats["failed"]) == (5, 1)
+        assert bulk.failed_files == [("b.md", "fr")]
+        out = capsys.readouterr().out
+        headers = [line for line in out.splitlines() if line.startswith("[")]
+        assert headers == [f"[{i}/6] {n}.md → {l}" for i, (n, l) in enumerate(
+            [(n, l) for n in "abc" for l in ("ES", "FR")], 1)]
+        block = out.split("[4/6] b.md → FR\n", 1)[1].split("\n[5/6]", 1)[0]
+        assert "overloaded" in block and "❌" in block
+        assert (workdir / "docs" / "fr" / "c.md").exists()
+        assert not isinstance(sys.stdout, bulk_retranslate._ThreadOutput)
+
+    def test_one_worker_sends_one_request_at_a_time(self, workdir, make_bulk):
+        bulk = make_bulk(workers=1)
+        peak = self.track_requests(bulk)
+        bulk.run(source_dir=workdir / "docs" / "en")
+        assert peak[0] == 1 and bulk.stats["successful"] == 5
+
+
+class TestBulkUsageAndBudget:
+    RESPONSE = make_response("# Traducción\n", input_tokens=1000, output_tokens=500)
+
+    @pytest.fixture
+    def source_dir(self, workdir):
+        source_dir = workdir / "docs" / "en"
+        for name in ("a", "b", "c"):
+            (source_dir / f"{name}.md").write_text(f"# {name}\n\nText.\n", encoding="utf-8")
+        return source_dir
+
+    def test_exact_usage_per_language_and_file(self, make_bulk, source_dir, capsys):
+        bulk = make_bulk(response=self.RESPONSE, workers=2)
+        bulk.run(source_dir=source_dir)
+
+        tokens = {"input_tokens": 1000, "output_tokens": 500, "cache_read_tokens": 0, "cache_write_tokens": 0}
+        call_cost = usage_log.estimate_cost(tokens, STANDARD_MODEL)
+        assert bulk.stats["total_tokens"] == 6 * 1500
+        assert bulk.stats["total_cost"] == pytest.approx(6 * call_cost)
+        es = bulk.usage["language"]["es"]
+        assert (es["calls"], es["input_tokens"], es["output_tokens"]) == (3, 3000, 1500)
+        assert bulk.usage["file"]["b.md"]["cost_usd"] == pytest.approx(2 * call_cost)
+        out = capsys.readouterr().out
+        assert f"💰 Cost: ${6 * call_cost:.2f} (9,000 tokens)" in out
+        assert "• FR: " in out and "b.md: $" in out
+
+    def test_jobs_return_only_the_usage_they_produced(self, make_bulk, source_dir):
+        bulk = make_bulk(response=self.RESPONSE)
+        # Another call for the same pair in this process, outside the job
+        usage_log.record(str(source_dir / "a.md"), "es", "new", SimpleNamespace(input_tokens=7, output_tokens=7),
+                         STANDARD_MODEL)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(bulk.translate_file(source_dir / "a.md", "es")))
+                   for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for success, records in results:
+            assert success and [entry["input_tokens"] for entry in records] == [1000]
+        assert bulk._spent["calls"] == 2
+
+    def test_workers_stop_scheduling_at_the_token_budget(self, make_bulk, source_dir, tmp_path, capsys):
+        journal = JobJournal(tmp_path / "journal.sqlite3")
+        bulk = make_bulk(response=self.RESPONSE, workers=1, max_tokens=1500, journal=journal)
+        bulk.run(source_dir=source_dir)
+
+        assert (bulk.stats["successful"], bulk.stats["over_budget"]) == (1, 5)
+        assert bulk.agent.claude.messages.create.call_count == 1
+        assert journal.stats() == {"pending": 5, "done": 1, "failed": 0}
+        out = capsys.readouterr().out
+        assert "🛑 Budget reached (1,500 tokens used, --max-tokens 1,500): 5 translations not scheduled" in out
+
+    def test_file_by_file_runs_stop_at_the_cost_budget(self, make_bulk, source_dir):
+        bulk = make_bulk(response=self.RESPONSE, max_cost=0.000001)
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            bulk.run(source_dir=source_dir)
+        # The first file's languages were already in flight
+        assert (bulk.stats["successful"], bulk.stats["over_budget"]) == (2, 4)
+        assert bulk.stats["total_cost"] > bulk.max_cost
+
+    def test_batches_are_trimmed_to_the_estimated_budget(self, make_bulk, source_dir):
+        bulk = make_bulk(response=self.RESPONSE, batch=True)
+        jobs = [(bulk.agent, str(source_dir / f"{name}.md"), "es") for name in "abc"]
+        estimates = run_estimate.estimate_jobs(jobs, bulk.concurrency, batch=True,
+                                               calibration=run_estimate.calibrate(bulk.agent))
+        bulk.max_tokens = estimates[0].prompt_tokens + estimates[0].output_tokens
+
+        assert bulk._within_budget(jobs) == jobs[:1]
+        assert bulk.stats["over_budget"] == 2
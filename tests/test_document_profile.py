@@ -0,0 +1,56 @@
+"""
+Tests for scripts/document_profile.py:
+  - cached document profile shared by the source heuristics
+"""
+
+from pathlib import Path
+from unittest import mock
+
+from translation_agent import split_sections
+from document_profile import profile_file, profile_text, read_document
+
+
+class TestDocumentProfile:
+    def test_complexity_levels(self, agent, tmp_path):
+        cases = {
+            "simple": "# Short\n\nPlain text.\n",
+            "standard": "# Guide\n\nKoboToolbox " + "text " * 300,
+            "complex": "# Long\n\n" + "KoboToolbox XLSForm " * 200,
+        }
+        for expected, text in cases.items():
+            path = tmp_path / f"{expected}.md"
+            path.write_text(text, encoding="utf-8")
+            assert agent.determine_complexity(str(path)) == expected
+
+    def test_needs_transifex_scores_ui_markers(self):
+        assert not profile_text("# Title\n\nOrdinary prose about surveys.\n").needs_transifex
+        ui_heavy = "Open the **Settings** tab, click **DEPLOY** and the 'Export data' button.\n"
+        profile = profile_text(ui_heavy)
+        assert (profile.bold_ui, profile.quoted_ui) == (2, 1)
+        assert profile.needs_transifex
+
+    def test_structure_counts_ignore_fenced_code(self):
+        text = ("# Title\n\nSee [docs](https://example.org) and {{ui:Save}}.\n"
+                "## One\n\n```\n## not a section\n```\n\n## Two\n\nText.\n")
+        profile = profile_text(text)
+        assert profile.headings == 3
+        assert profile.code_blocks == 1
+        assert (profile.links, profile.templates) == (1, 1)
+        assert sum(profile.section_sizes) == len(text)
+        assert profile.section_sizes == tuple(len(s) for s in split_sections(text))
+
+    def test_profiles_are_cached_by_content(self, tmp_path):
+        first, second = tmp_path / "a.md", tmp_path / "b.md"
+        for path in (first, second):
+            path.write_text("# Same\n\nKoboToolbox.\n", encoding="utf-8")
+        assert profile_file(first) is profile_file(second)
+
+    def test_source_is_reread_after_edit(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# One\n", encoding="utf-8")
+        assert read_document(path) == "# One\n"
+        with mock.patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+            assert read_document(path) == "# One\n"
+        path.write_text("# Two, longer\n", encoding="utf-8")
+        assert read_document(path) == "# Two, longer\n"
+        assert profile_file(path).length == len("# Two, longer\n")
@@ -0,0 +1,56 @@
+"""
+Tests for scripts/job_journal.py:
+  - resumable bulk runs with a job journal (bulk --resume)
+"""
+
+import pytest
+
+from job_journal import JobJournal
+from api_stubs import make_response
+
+
+class TestJobJournal:
+    def test_done_only_for_the_same_inputs(self, tmp_path):
+        journal = JobJournal(tmp_path / "journal.sqlite3")
+        journal.mark("docs/en/a.md", "es", "src1", "skill1", "pending")
+        assert not journal.is_done("docs/en/a.md", "es", "src1", "skill1")
+        journal.mark("docs/en/a.md", "es", "src1", "skill1", "done", cost=0.02)
+        assert journal.is_done("docs/en/a.md", "es", "src1", "skill1")
+        assert not journal.is_done("docs/en/a.md", "es", "src2", "skill1")
+        assert not journal.is_done("docs/en/a.md", "es", "src1", "skill2")
+        assert not journal.is_done("docs/en/a.md", "fr", "src1", "skill1")
+        assert JobJournal(tmp_path / "journal.sqlite3").stats() == {"pending": 0, "done": 1, "failed": 0}
+        with pytest.raises(ValueError):
+            journal.mark("docs/en/a.md", "es", "src1", "skill1", "started")
+
+    def test_resume_retries_only_unfinished_pairs(self, workdir, make_bulk):
+        source_dir = workdir / "docs" / "en"
+        for name in ("a", "b"):
+            (source_dir / f"{name}.md").write_text(f"# {name}\n\nText.\n", encoding="utf-8")
+        journal = JobJournal(workdir / "journal.sqlite3")
+
+        def run(fail=None):
+            bulk = make_bulk(workers=2, journal=journal, resume=True)
+
+            def create(**request):
+                text = request["messages"][0]["content"][-1]["text"]
+                if fail and fail in text:
+                    raise RuntimeError("timeout")
+                return make_response("# Traducción\n")
+
+            bulk.agent.claude.messages.create.side_effect = create
+            bulk.run(source_dir=source_dir)
+            return bulk
+
+        first = run(fail="# b")
+        assert (first.stats["successful"], first.stats["failed"]) == (2, 2)
+        assert journal.stats() == {"pending": 0, "done": 2, "failed": 2}
+
+        second = run()
+        assert (second.stats["skipped"], second.stats["successful"]) == (2, 2)
+        assert second.agent.claude.messages.create.call_count == 2
+
+        (source_dir / "a.md").write_text("# a\n\nEdited.\n", encoding="utf-8")
+        third = run()
+        assert (third.stats["skipped"], third.stats["successful"]) == (2, 2)
+        assert {j[0] for j in journal.jobs("done")} == {str(source_dir / "a.md"), str(source_dir / "b.md")}
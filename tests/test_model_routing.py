@@ -0,0 +1,102 @@
+"""
+Tests for scripts/model_routing.py and scripts/evaluate_routes.py:
+  - complexity-based model routing
+"""
+
+import json
+
+import pytest
+
+from translation_agent import TranslationAgent
+from model_routing import (DEFAULT_ROUTES, FAST_MODEL, FIXED_ROUTES, MIN_OUTPUT_TOKENS, STANDARD_MODEL, Route,
+                           load_routes)
+import evaluate_routes
+from api_stubs import stub_claude
+
+
+class TestModelRouting:
+    @pytest.fixture
+    def simple_file(self, tmp_path):
+        path = tmp_path / "simple.md"
+        path.write_text("# Short note\n\nA few plain words.\n", encoding="utf-8")
+        return path
+
+    def routed_agent(self, routes=DEFAULT_ROUTES, use_cache=False, **kwargs):
+        agent = TranslationAgent(test_mode=True, use_cache=use_cache, routes=routes, **kwargs)
+        stub_claude(agent, "# Hola")
+        return agent
+
+    def sent(self, agent):
+        return agent.claude.messages.create.call_args.kwargs
+
+    def test_without_routes_everything_uses_the_standard_model(self, simple_file):
+        agent = self.routed_agent(routes=None)
+        agent.translate_file(str(simple_file), "es")
+        assert (self.sent(agent)["model"], self.sent(agent)["max_tokens"]) == (STANDARD_MODEL, MIN_OUTPUT_TOKENS)
+        agent.translate_diff("A short change.", "es")
+        assert (self.sent(agent)["model"], self.sent(agent)["max_tokens"]) == (STANDARD_MODEL, MIN_OUTPUT_TOKENS)
+
+    def test_simple_documents_and_small_diffs_use_the_fast_model(self, simple_file, source_file):
+        agent = self.routed_agent()
+        agent.translate_file(str(simple_file), "es")
+        assert self.sent(agent)["model"] == FAST_MODEL
+        agent.translate_file(str(source_file), "es")  # mentions KoboToolbox: standard
+        assert self.sent(agent)["model"] == STANDARD_MODEL
+        agent.translate_diff("A short change.", "es")
+        assert self.sent(agent)["model"] == FAST_MODEL
+
+    def test_cache_entries_are_per_model(self, simple_file, tmp_path):
+        cache_path = str(tmp_path / "cache.sqlite3")
+        routed = self.routed_agent(use_cache=True, cache_path=cache_path)
+        routed.translate_file(str(simple_file), "es")
+        fixed = self.routed_agent(routes=None, use_cache=True, cache_path=cache_path)
+        fixed.translate_file(str(simple_file), "es")
+        assert fixed.claude.messages.create.call_count == 1
+
+        rerouted = self.routed_agent(use_cache=True, cache_path=cache_path)
+        assert rerouted.translate_file(str(simple_file), "es") == "# Hola"
+        assert rerouted.claude.messages.create.call_count == 0
+
+    def test_route_file_overrides(self, tmp_path):
+        path = tmp_path / "routes.json"
+        path.write_text(json.dumps({"new/standard": {"model": FAST_MODEL, "max_tokens": 9000}}))
+        routes = load_routes(str(path))
+        assert routes[("new", "standard")] == Route(FAST_MODEL, 9000)
+        assert routes[("new", "complex")] == FIXED_ROUTES[("new", "complex")]
+
+        path.write_text(json.dumps({"full/simple": {"model": FAST_MODEL, "max_tokens": 1}}))
+        with pytest.raises(ValueError, match="Unknown route"):
+            load_routes(str(path))
+
+    def test_evaluation_compares_routes_with_the_baseline(self, simple_file, source_file):
+        agents = []
+
+        def factory(routes):
+            agents.append(self.routed_agent(routes))
+            return agents[-1]
+
+        corpus = evaluate_routes.select_corpus([str(simple_file), str(source_file)], per_class=1)
+        tables = {"routed": DEFAULT_ROUTES, "baseline": FIXED_ROUTES}
+        results = evaluate_routes.evaluate(corpus, ["es"], tables, modes=("new",), agent_factory=factory)
+
+        assert [(r["table"], r["complexity"], r["model"]) for r in results] == [
+            ("routed", "simple", FAST_MODEL),
+            ("routed", "standard", STANDARD_MODEL),
+            ("baseline", "simple", STANDARD_MODEL),
+            ("baseline", "standard", STANDARD_MODEL),
+        ]
+        # The standard document's route is the same in both tables: sent once
+        assert [a.claude.messages.create.call_count for a in agents] == [2, 1]
+
+        groups = evaluate_routes.summarize_results(results)
+        assert groups["routed: new/simple"]["model"] == FAST_MODEL
+        assert groups["baseline: new/simple"]["calls"] == 1
+        assert all(0 <= g["pass_rate"] <= 1 for g in groups.values())
+
+    def test_diff_samples_and_checks(self):
+        content = "# Title\n\n![img](a.png)\n\n" + "Open the **Data** page and see [the guide](x.md). " * 3
+        sample = evaluate_routes.diff_sample(content)
+        assert sample.startswith("Open the")
+        translated = sample.replace("Open the", "Abra la")
+        assert evaluate_routes.validate_diff(sample, translated)["passed"]
+        assert not evaluate_routes.validate_diff(sample, "---BEGIN DIFF---")["passed"]
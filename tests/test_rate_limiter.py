@@ -0,0 +1,112 @@
+"""
+Tests for scripts/rate_limiter.py:
+  - rate-limit-aware scheduler shared by every API call
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+import translation_agent
+from rate_limiter import RateLimiter, TokenBucket, estimate_tokens, raw_create
+from api_stubs import FakeAsyncAnthropic, MessagesStub, MINIMAL_REQUEST, api_error, stub_claude
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")  # SDK model deprecation notice
+class TestRateLimiter:
+    def limiter(self, **kwargs):
+        return RateLimiter(base_delay=0.01, max_delay=0.05, **kwargs)
+
+    def test_retries_429_and_529_then_learns_limits(self):
+        limiter = self.limiter()
+        with MessagesStub([429, 529]) as stub:
+            client = translation_agent.anthropic.Anthropic(api_key="stub", base_url=stub.url, max_retries=0)
+            response = limiter.call(raw_create(client.messages), MINIMAL_REQUEST)
+
+        assert response.content[0].text == "# Traducido"
+        assert stub.calls == 3
+        assert limiter.retries == 2
+        assert limiter.buckets["requests"].capacity == 50
+        assert limiter.buckets["input_tokens"].capacity == 30000
+        assert limiter.buckets["output_tokens"].level == pytest.approx(7900, abs=50)
+
+    def test_non_retryable_errors_are_raised_immediately(self):
+        limiter = self.limiter()
+        with MessagesStub([400]) as stub:
+            client = translation_agent.anthropic.Anthropic(api_key="stub", base_url=stub.url, max_retries=0)
+            with pytest.raises(translation_agent.anthropic.BadRequestError):
+                limiter.call(raw_create(client.messages), MINIMAL_REQUEST)
+
+        assert stub.calls == 1
+
+    def test_gives_up_after_max_retries(self):
+        limiter = self.limiter(max_retries=2)
+        with MessagesStub([429, 429, 429, 429]) as stub:
+            client = translation_agent.anthropic.Anthropic(api_key="stub", base_url=stub.url, max_retries=0)
+            with pytest.raises(translation_agent.anthropic.RateLimitError):
+                limiter.call(raw_create(client.messages), MINIMAL_REQUEST)
+
+        assert stub.calls == 3
+
+    def test_async_client_retries(self):
+        limiter = self.limiter()
+
+        async def run(url):
+            async with translation_agent.anthropic.AsyncAnthropic(
+                api_key="stub", base_url=url, max_retries=0
+            ) as client:
+                return await limiter.call_async(raw_create(client.messages), MINIMAL_REQUEST)
+
+        with MessagesStub([529]) as stub:
+            response = asyncio.run(run(stub.url))
+
+        assert response.content[0].text == "# Traducido"
+        assert stub.calls == 2
+
+    def test_agent_calls_go_through_the_limiter(self, agent, source_file):
+        agent.limiter = self.limiter()
+        stub_claude(agent, api_error(429), "# Hola")
+
+        assert agent.translate_file(str(source_file), "es") == "# Hola"
+        assert agent.claude.messages.create.call_count == 2
+        assert agent.limiter.retries == 1
+
+    def test_async_engine_retries_failed_jobs(self, agent, source_file):
+        agent.limiter = self.limiter()
+        error = api_error(529)
+
+        class FlakyAsyncAnthropic(FakeAsyncAnthropic):
+            async def _create(self, **kwargs):
+                if not self.requests:
+                    self.requests.append(kwargs)
+                    raise error
+                return await super()._create(**kwargs)
+
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FlakyAsyncAnthropic):
+            results = agent.translate_languages(str(source_file), ["fr"])
+
+        assert results == {"fr": "# translated FR"}
+
+    def test_bucket_delays_only_when_exhausted(self):
+        bucket = TokenBucket(capacity=60)  # one unit per second
+        assert bucket.reserve(60, now=bucket.updated) == 0
+        assert bucket.reserve(3, now=bucket.updated) == pytest.approx(3.0)
+        bucket.refund(3, now=bucket.updated)
+        assert bucket.reserve(1, now=bucket.updated + 2) == 0
+
+    def test_unknown_limits_never_delay(self):
+        limiter = RateLimiter()
+        assert limiter.reserve({"requests": 1, "input_tokens": 10**9, "output_tokens": 10**9}) == 0
+
+    def test_estimate_skips_cached_prefix(self):
+        request = {
+            "max_tokens": 16000,
+            "messages": [{"role": "user", "content": [
+                {"type": "text", "text": "x" * 70_000, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": "y" * 700},
+            ]}],
+        }
+        estimate = estimate_tokens(request)
+        assert estimate["input_tokens"] == pytest.approx(200)
+        assert estimate["output_tokens"] == pytest.approx(200)
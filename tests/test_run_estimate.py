@@ -0,0 +1,72 @@
+"""
+Tests for scripts/run_estimate.py:
+  - offline token, cost and time estimate (bulk --estimate)
+"""
+
+import pytest
+
+from document_profile import read_document
+from model_routing import STANDARD_MODEL
+import model_routing
+import run_estimate
+
+
+class TestRunEstimate:
+    @pytest.fixture
+    def workdir(self, workdir):
+        for name in ("a", "b"):
+            (workdir / "docs" / "en" / f"{name}.md").write_text(
+                f"# {name}\n\n" + "Open the KoboToolbox form builder. " * 40, encoding="utf-8")
+        return workdir
+
+    def test_token_approximation(self):
+        english = "Open the project and deploy your form to start collecting data."
+        assert 0.8 < run_estimate.approx_tokens(english) / (len(english) / 4) < 1.3
+        assert run_estimate.approx_tokens("مرحبا بالعالم") > run_estimate.approx_tokens("hello world")
+
+    def test_prompt_cache_reads_within_its_lifetime(self):
+        cache = run_estimate.PromptCacheModel()
+        blocks = [("skill", 3000, True), ("tables", 2000, True), ("instructions", 500, False)]
+        assert cache.request("m", blocks, 0, 10) == (500, 0, 5000)
+        assert cache.request("m", blocks, 20, 30) == (500, 5000, 0)
+        changed = blocks[:1] + [("other tables", 2000, True)] + blocks[2:]
+        assert cache.request("m", changed, 40, 50) == (500, 3000, 2000)
+        assert cache.request("m", blocks, 51 + run_estimate.CACHE_TTL_S, 400) == (500, 0, 5000)
+        assert cache.request("m", [("short", 100, True)], 0, 1) == (100, 0, 0)
+
+    def test_run_writes_each_prefix_once_and_skips_cached_translations(self, workdir, cached_agent):
+        jobs = [(cached_agent, f"docs/en/{name}.md", lang) for name in ("a", "b") for lang in ("es", "fr")]
+        estimates = run_estimate.estimate_jobs(jobs, concurrency=2)
+
+        assert [bool(e.cache_write_tokens) for e in estimates] == [True, True, False, False]
+        assert all(e.output_tokens and e.cost_usd and not e.cached for e in estimates)
+        batch = run_estimate.estimate_jobs(jobs, concurrency=2, batch=True)
+        assert sum(e.cost_usd for e in batch) < sum(e.cost_usd for e in estimates)
+
+        key, _ = cached_agent._cache_lookup(read_document("docs/en/a.md"), "es", STANDARD_MODEL)
+        cached_agent.cache.put(key, "# a", "docs/en/a.md", "es")
+        assert run_estimate.estimate_jobs(jobs, concurrency=2)[0].cached
+
+    def test_calibration_from_logged_usage(self, workdir, agent):
+        expected = model_routing.expected_output_tokens(len(read_document("docs/en/a.md")), "es")
+        records = [{"mode": "new", "file": "docs/en/a.md", "language": "es", "input_tokens": 100,
+                    "cache_read_tokens": 9000, "output_tokens": round(expected * 1.5), "latency_s": 12.0}]
+        calibration = run_estimate.Calibration.from_log(records, agent)
+        assert calibration.samples == 1
+        assert calibration.output_scale["es"] == pytest.approx(1.5, rel=0.01)
+        assert calibration.tokens_per_s == pytest.approx(records[0]["output_tokens"] / 10.0)
+        assert calibration.input_scale > 0
+
+    def test_workers_start_jobs_as_soon_as_a_worker_is_free(self, workdir, agent):
+        jobs = [(agent, f"docs/en/{name}.md", lang) for name in ("a", "b") for lang in ("es", "fr")]
+        estimates = run_estimate.estimate_jobs(jobs, concurrency=2, workers=4)
+        assert {e.start_s for e in estimates} == {0.0}
+        serial = run_estimate.estimate_jobs(jobs, concurrency=2, workers=1)
+        assert run_estimate.wall_clock(serial) == pytest.approx(sum(e.latency_s for e in serial))
+
+    def test_bulk_estimate_makes_no_api_calls(self, workdir, make_bulk, capsys):
+        bulk = make_bulk(estimate=True)
+        bulk.run(source_dir=workdir / "docs" / "en")
+
+        assert not bulk.agent.claude.mock_calls
+        assert "Requests: 4" in capsys.readouterr().out
@@ -0,0 +1,634 @@
+"""
+Tests for scripts/translation_agent.py:
+  - concurrent multi-language engine (translate_many / translate_languages)
+  - streaming full-file translation with incremental write-out
+  - section-parallel translation of long documents
+  - post-processing pipeline applied before saving
+  - adaptive max_tokens and continuation of truncated output
+  - pooled agent variants sharing client and skill files (bulk --auto-transifex)
+  - prompt-cache layout shared by full and diff requests, cache-hit report
+  - batched diff translation (one request per language for many hunks)
+  - import-time startup budget (python -X importtime)
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import translation_agent
+import usage_log
+from translation_agent import TranslationAgent, split_sections
+from model_routing import MIN_OUTPUT_TOKENS, expansion_ratio, output_budget
+import model_routing
+from rate_limiter import RateLimiter
+from api_stubs import FakeAsyncAnthropic, api_error, make_response, stub_claude
+
+
+# ---------------------------------------------------------------------------
+# Concurrent engine
+# ---------------------------------------------------------------------------
+
+class TestConcurrentEngine:
+    def setup_method(self):
+        FakeAsyncAnthropic.instances = []
+
+    def test_translate_languages_returns_each_language(self, agent, source_file):
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            results = agent.translate_languages(str(source_file), ["es", "fr", "ar"])
+        assert results == {
+            "es": "# translated ES",
+            "fr": "# translated FR",
+            "ar": "# translated AR",
+        }
+
+    def test_requests_are_sent_concurrently(self, agent, source_file):
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            agent.translate_languages(str(source_file), ["es", "fr", "ar"], max_concurrency=3)
+        assert FakeAsyncAnthropic.instances[0].max_in_flight == 3
+
+    def test_concurrency_limit_is_respected(self, agent, source_file, tmp_path):
+        other = tmp_path / "other.md"
+        other.write_text("# Other\n", encoding="utf-8")
+        jobs = [(str(f), lang) for f in (source_file, other) for lang in ("es", "fr", "ar")]
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            results = agent.translate_many(jobs, max_concurrency=2)
+        assert len(results) == 6
+        assert FakeAsyncAnthropic.instances[0].max_in_flight == 2
+
+    def test_one_failure_does_not_cancel_others(self, agent, source_file):
+        def factory(api_key=None, **kwargs):
+            return FakeAsyncAnthropic(api_key, fail_for={"FR"})
+
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", factory):
+            results = agent.translate_languages(str(source_file), ["es", "fr", "ar"])
+        assert isinstance(results["fr"], RuntimeError)
+        assert results["es"] == "# translated ES"
+        assert results["ar"] == "# translated AR"
+
+    def test_single_pair_jobs_report_job_status(self, workdir, monkeypatch, capsys):
+        (workdir / "docs" / "en" / "a.md").write_text("# A\n\nText.\n", encoding="utf-8")
+        monkeypatch.setattr(sys, "argv", ["translation_agent.py", "--jobs", "docs/en/a.md:es",
+                                          "--save", "--test", "--no-cache"])
+
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            translation_agent.main()
+
+        assert "✅ JOB OK: a.md → ES" in capsys.readouterr().err
+        assert (workdir / "docs" / "es" / "a.md").read_text(encoding="utf-8").startswith("# translated ES")
+
+    def test_async_request_matches_blocking_request(self, agent, source_file):
+        stub_claude(agent, "hola")
+        agent.translate_file(str(source_file), "es")
+        blocking_request = agent.claude.messages.create.call_args.kwargs
+
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            agent.translate_languages(str(source_file), ["es"])
+        assert FakeAsyncAnthropic.instances[0].requests[0] == blocking_request
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+class FakeStream:
+    """Stand-in for the MessageStream context manager returned by messages.stream()"""
+
+    def __init__(self, chunks, stop_reason="end_turn", on_chunk=None, fail_after=None):
+        self.chunks = chunks
+        self.stop_reason = stop_reason
+        self.on_chunk = on_chunk
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise ConnectionError("stream dropped")
+            yield chunk
+            if self.on_chunk:
+                self.on_chunk()
+
+    def get_final_message(self):
+        response = make_response("".join(self.chunks), output_tokens=len(self.chunks))
+        response.stop_reason = self.stop_reason
+        return response
+
+
+class TestStreaming:
+    @pytest.fixture
+    def guide(self, workdir):
+        source = workdir / "docs" / "en" / "guide.md"
+        source.write_text("# Guide\n\nHello KoboToolbox.\n", encoding="utf-8")
+        return source
+
+    def test_writes_part_file_then_renames(self, agent, guide):
+        part = Path("docs/es/.guide.md.part")
+        target = Path("docs/es/guide.md")
+        seen = []
+
+        def on_chunk():
+            seen.append((part.read_text(encoding="utf-8"), target.exists()))
+
+        agent.claude = mock.Mock()
+        agent.claude.messages.stream.return_value = FakeStream(
+            ["# Guía\n\n", "Hola ", "KoboToolbox.\n"], on_chunk=on_chunk
+        )
+
+        translation, path = agent.translate_file_streaming(str(guide), "es")
+
+        assert seen[0] == ("# Guía\n\n", False)
+        assert seen[-1] == ("# Guía\n\nHola KoboToolbox.\n", False)
+        assert path == target
+        assert target.read_text(encoding="utf-8") == translation
+        assert not part.exists()
+
+    def test_interrupted_stream_keeps_existing_translation(self, agent, guide):
+        target = Path("docs/es/guide.md")
+        target.parent.mkdir(parents=True)
+        target.write_text("approved", encoding="utf-8")
+        agent.claude = mock.Mock()
+        agent.claude.messages.stream.return_value = FakeStream(["# Guía", " rota"], fail_after=1)
+
+        with pytest.raises(ConnectionError):
+            agent.translate_file_streaming(str(guide), "es")
+
+        assert target.read_text(encoding="utf-8") == "approved"
+        assert not Path("docs/es/.guide.md.part").exists()
+
+    def test_truncated_output_is_continued_in_the_part_file(self, agent, guide):
+        agent.claude = mock.Mock()
+        agent.claude.messages.stream.side_effect = [
+            FakeStream(["# Guía\n\n", "Hola "], stop_reason="max_tokens"),
+            FakeStream([" KoboToolbox.\n"]),
+        ]
+
+        translation, path = agent.translate_file_streaming(str(guide), "es")
+
+        assert translation == path.read_text(encoding="utf-8") == "# Guía\n\nHola KoboToolbox.\n"
+        follow_up = agent.claude.messages.stream.call_args.kwargs["messages"]
+        assert follow_up[-1] == {"role": "assistant", "content": "# Guía\n\nHola"}
+
+    def test_truncated_output_is_not_renamed(self, agent, guide):
+        agent.claude = mock.Mock()
+        agent.claude.messages.stream.side_effect = lambda **_: FakeStream([" Guía"], stop_reason="max_tokens")
+
+        with pytest.raises(RuntimeError, match="truncated"):
+            agent.translate_file_streaming(str(guide), "es")
+
+        assert not Path("docs/es/guide.md").exists()
+        assert Path("docs/es/.guide.md.part").read_text(encoding="utf-8") == " Guía" * (
+            1 + translation_agent.MAX_CONTINUATIONS)
+
+
+# ---------------------------------------------------------------------------
+# Section-parallel translation
+# ---------------------------------------------------------------------------
+
+class EchoAsyncAnthropic(FakeAsyncAnthropic):
+    """Fake client that 'translates' by upper-casing the source section"""
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            prompt = kwargs["messages"][0]["content"][-1]["text"]
+            source = prompt.split("---BEGIN SOURCE SECTION---\n")[1].split("\n---END SOURCE SECTION---")[0]
+            return make_response(source.upper())
+        finally:
+            self.in_flight -= 1
+
+
+def long_document(sections: int = 4, words: int = 500) -> str:
+    body = " ".join(["word"] * words)
+    parts = ["# Long guide\n\nIntro paragraph.\n"]
+    for i in range(sections):
+        parts.append(f"## Part {i}\n\n{body}\n\n```yaml\n## not a heading\n```\n")
+    return "\n".join(parts)
+
+
+class TestSections:
+    def setup_method(self):
+        FakeAsyncAnthropic.instances = []
+
+    def test_split_sections_round_trips_and_skips_fenced_headings(self):
+        content = long_document(sections=3, words=3)
+        sections = split_sections(content)
+        assert "".join(sections) == content
+        assert len(sections) == 4
+        assert [s.splitlines()[0] for s in sections[1:]] == ["## Part 0", "## Part 1", "## Part 2"]
+
+    def test_sections_translated_in_parallel_and_reassembled(self, agent, tmp_path):
+        source = tmp_path / "long.md"
+        content = long_document()
+        source.write_text(content, encoding="utf-8")
+
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", EchoAsyncAnthropic):
+            translation = agent.translate_sections(str(source), "fr", max_concurrency=8)
+
+        client = FakeAsyncAnthropic.instances[0]
+        assert len(client.requests) == 5
+        assert client.max_in_flight == 5
+        assert translation == content.upper()
+
+        prefixes = {r["messages"][0]["content"][0]["text"] for r in client.requests}
+        assert len(prefixes) == 1  # every section reuses the cached skill prefix
+        tail = client.requests[2]["messages"][0]["content"][-1]["text"]
+        assert "section 3 of 5" in tail
+        assert "## Part 1   ← THIS SECTION" in tail
+        assert "## Part 0" in tail and "## Part 2" in tail
+
+    def test_sectioned_translations_are_post_processed_once_when_saved(self, agent, tmp_path, monkeypatch):
+        source = tmp_path / "long.md"
+        source.write_text(long_document(), encoding="utf-8")
+        postprocess = mock.Mock(side_effect=agent.postprocess_translation)
+        monkeypatch.setattr(agent, "postprocess_translation", postprocess)
+
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", EchoAsyncAnthropic):
+            translation = agent.translate_sections(str(source), "fr", max_concurrency=8)
+        assert postprocess.call_count == 0
+        monkeypatch.chdir(tmp_path)
+        agent.save_translation(translation, str(source), "fr")
+        assert postprocess.call_count == 1
+
+    def test_short_document_uses_single_request(self, agent, source_file):
+        with mock.patch.object(translation_agent.anthropic, "AsyncAnthropic", FakeAsyncAnthropic):
+            translation = agent.translate_sections(str(source_file), "es")
+
+        assert translation == "# translated ES"
+        assert len(FakeAsyncAnthropic.instances[0].requests) == 1
+
+
+# ---------------------------------------------------------------------------
+# Post-processing pipeline
+# ---------------------------------------------------------------------------
+
+def write_titles(skill_root: Path, spanish_title: str):
+    references = skill_root / "references"
+    references.mkdir(parents=True, exist_ok=True)
+    (references / "article-titles.md").write_text(
+        "| File name | English | Spanish |\n"
+        "| --- | --- | --- |\n"
+        f"| sample.md | Sample | {spanish_title} |\n",
+        encoding="utf-8",
+    )
+
+
+class TestPostprocessing:
+    def test_titles_are_parsed_once_and_reloaded_on_change(self, tmp_path):
+        write_titles(tmp_path, "Ejemplo")
+        titles_path = tmp_path / "references" / "article-titles.md"
+        first = translation_agent._load_article_titles(tmp_path)
+        assert first == {"sample.md": {"en": "Sample", "es": "Ejemplo"}}
+        assert translation_agent._load_article_titles(tmp_path) is first
+
+        write_titles(tmp_path, "Muestra")
+        os.utime(titles_path, ns=(0, titles_path.stat().st_mtime_ns + 1_000_000))
+        assert translation_agent._load_article_titles(tmp_path)["sample.md"]["es"] == "Muestra"
+
+    def test_missing_titles_file(self, tmp_path):
+        assert translation_agent._load_article_titles(tmp_path) == {}
+
+    def test_official_h1_replaces_first_heading_only(self):
+        titles = {"sample.md": {"es": "Ejemplo oficial"}}
+        text = "Intro\n# Ejemplo\n\n# Otro\n"
+        fixed, changed = translation_agent._apply_official_h1(text, "sample.md", "es", titles)
+        assert changed
+        assert fixed == "Intro\n# Ejemplo oficial\n\n# Otro\n"
+        assert translation_agent._apply_official_h1(fixed, "sample.md", "es", titles) == (fixed, False)
+
+    def test_worksheet_labels_fixed_in_one_pass(self, agent, capsys):
+        es = agent.postprocess_translation(
+            "Abra **Hoja de trabajo survey** y **hoja de trabajo choices**.", "x.md", "es")
+        assert es == "Abra **hoja survey** y **hoja choices**."
+        fr = agent.postprocess_translation(
+            "Ouvrez **hoja survey :** puis **hoja external-choices**.", "x.md", "fr")
+        assert fr == "Ouvrez **onglet survey :** puis **onglet external-choices**."
+        # Other languages are left alone
+        assert agent.postprocess_translation("**hoja survey**", "x.md", "ar") == "**hoja survey**"
+
+        err = capsys.readouterr().err
+        assert err.count("Worksheet labels normalised (ES): x.md") == 1
+        assert err.count("Worksheet labels normalised (FR): x.md") == 1
+
+    def test_registered_postprocessors_join_the_pipeline(self, agent, monkeypatch):
+        monkeypatch.setattr(translation_agent, "_POSTPROCESSORS", list(translation_agent._POSTPROCESSORS))
+        try:
+            @translation_agent.postprocessor(["es"], r"(?P<nbsp_pct>\d) %", "Percent spacing")
+            def _fix_percent(match):
+                return f"{match.group('nbsp_pct')}\u00a0%"
+
+            fixed = agent.postprocess_translation("**hoja de trabajo survey**: 50 %", "x.md", "es")
+            assert fixed == "**hoja survey**: 50\u00a0%"
+        finally:
+            translation_agent._postprocessor_pipeline.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Output budget and continuation
+# ---------------------------------------------------------------------------
+
+class TestOutputBudget:
+    def test_expansion_ratio_is_the_median_of_the_corpus(self, tmp_path):
+        for name, source, target in (("a", 100, 110), ("b", 200, 240), ("c", 100, 10)):
+            for lang, size in (("en", source), ("es", target)):
+                (tmp_path / lang).mkdir(exist_ok=True)
+                (tmp_path / lang / f"{name}.md").write_text("x" * size, encoding="utf-8")
+        assert expansion_ratio("es", str(tmp_path)) == pytest.approx(1.1)
+        assert expansion_ratio("fr", str(tmp_path)) == model_routing.DEFAULT_EXPANSION
+
+    def test_budget_grows_with_the_source_up_to_the_route_ceiling(self):
+        assert output_budget(200, "es", 16000) == MIN_OUTPUT_TOKENS
+        assert MIN_OUTPUT_TOKENS < output_budget(12000, "es", 16000) < output_budget(12000, "ar", 16000) < 16000
+        assert output_budget(200_000, "es", 16000) == 16000
+        assert output_budget(200, "es", 512) == 512
+
+    def test_truncated_response_is_continued_with_the_cached_prompt(self, agent, source_file):
+        truncated = make_response("# Muestra\n\nAlgo de texto ")
+        truncated.stop_reason = "max_tokens"
+        stub_claude(agent, truncated, " de KoboToolbox.\n")
+
+        translation = agent.translate_file(str(source_file), "es")
+
+        assert translation == "# Muestra\n\nAlgo de texto de KoboToolbox.\n"
+        first, follow_up = (c.kwargs for c in agent.claude.messages.create.call_args_list)
+        assert follow_up["messages"][0] == first["messages"][0]
+        assert follow_up["messages"][1] == {"role": "assistant", "content": "# Muestra\n\nAlgo de texto"}
+        records = usage_log.session_records(file=str(source_file))
+        assert [(r["mode"], r.get("truncated", False)) for r in records[-2:]] == [
+            ("new", True), ("continuation", False),
+        ]
+        assert usage_log.summarize(records[-2:])["total"]["truncated"] == 1
+
+    def test_truncated_diff_is_continued(self, agent):
+        truncated = make_response("Un cambio")
+        truncated.stop_reason = "max_tokens"
+        stub_claude(agent, truncated, " corto.")
+        assert agent.translate_diff("A short change.", "es") == "Un cambio corto."
+
+
+class TestAgentVariants:
+    UI_HEAVY = "# {name}\n\n" + "Open the **SETTINGS** tab and click the **DEPLOY** button.\n" * 3
+
+    @pytest.fixture
+    def reads(self, workdir):
+        paths = []
+        read_text = Path.read_text
+
+        def spy(path, *args, **kwargs):
+            if path.parts[0] == "skills":
+                paths.append(path)
+            return read_text(path, *args, **kwargs)
+
+        with mock.patch.object(Path, "read_text", spy):
+            yield paths
+
+    def test_variants_are_pooled_and_share_client_and_skill_files(self, reads):
+        plain = TranslationAgent(test_mode=True, use_cache=False)
+        blocks = plain._skill_blocks("es")
+        first_reads = len(reads)
+
+        transifex = plain.variant(include_transifex=True)
+        assert transifex is plain.variant(include_transifex=True)
+        assert transifex.variant(include_transifex=False) is plain
+        assert (transifex.claude, transifex.limiter, transifex.manifest) == (
+            plain.claude, plain.limiter, plain.manifest)
+        assert not plain.include_transifex and not transifex.include_collect
+
+        with_transifex = transifex._skill_blocks("es")
+        assert with_transifex[:3] == blocks and "TRANSIFEX UI STRINGS" in with_transifex[3]
+        # Only the Transifex table is read for the variant
+        assert [p.name for p in reads[first_reads:]] == ["transifex-ui-strings.md"]
+
+    def test_bulk_auto_transifex_reuses_one_variant(self, reads, workdir, make_bulk):
+        source_dir = workdir / "docs" / "en"
+        (source_dir / "a.md").write_text("# a\n\nText.\n", encoding="utf-8")
+        for name in ("b", "c"):
+            (source_dir / f"{name}.md").write_text(self.UI_HEAVY.format(name=name), encoding="utf-8")
+
+        bulk = make_bulk(workers=2, auto_transifex=True)
+        bulk.run(source_dir=source_dir)
+
+        assert bulk.stats["successful"] == 6
+        assert bulk.agent.claude.messages.create.call_count == 6
+        assert len(bulk.agent.variants) == 2
+        for call in bulk.agent.claude.messages.create.call_args_list:
+            content = call.kwargs["messages"][0]["content"]
+            ui_heavy = "SETTINGS" in content[-1]["text"]
+            assert ui_heavy == any("TRANSIFEX UI STRINGS" in block["text"] for block in content[:-1])
+        assert len(reads) == len(set(reads))
+
+
+# ---------------------------------------------------------------------------
+# Prompt-cache layout
+# ---------------------------------------------------------------------------
+
+class TestPromptCache:
+    def sent_content(self, agent):
+        return agent.claude.messages.create.call_args.kwargs["messages"][0]["content"]
+
+    def cached_prefix(self, content):
+        return [block for block in content if "cache_control" in block]
+
+    def test_full_and_diff_requests_share_the_cached_prefix(self, agent, source_file):
+        stub_claude(agent, "# Muestra")
+
+        agent.translate_file(str(source_file), "es")
+        full = self.sent_content(agent)
+        agent.translate_diff("Hello", "es")
+        diff = self.sent_content(agent)
+
+        assert "system" not in agent.claude.messages.create.call_args.kwargs
+        prefix = self.cached_prefix(full)
+        assert 2 <= len(prefix) <= 4
+        assert self.cached_prefix(diff) == prefix
+        # Mode-specific instructions come after the last breakpoint
+        assert full[:len(prefix)] == prefix and diff[:len(prefix)] == prefix
+        assert "COMPLETE NEW document" in full[-1]["text"]
+        assert "ONLY A DIFF" in diff[-1]["text"]
+
+    def test_blocks_are_ordered_skill_official_preferred_optional(self):
+        plain = TranslationAgent(test_mode=True, use_cache=False)
+        blocks = plain._skill_blocks("es")
+        assert blocks[0] == plain._get_skill_context("es")["main"]
+        assert blocks[1].startswith("## ARTICLE TITLES") and "## BRAND TERMINOLOGY" in blocks[1]
+        assert blocks[2].startswith("## SENTENCE STRUCTURES") and "## BRAND TERMINOLOGY" not in blocks[2]
+        assert not any("TRANSIFEX UI STRINGS" in block for block in blocks)
+
+        full = TranslationAgent(test_mode=True, use_cache=False, include_transifex=True)
+        with_transifex = full._skill_blocks("es")
+        assert len(with_transifex) == 4
+        assert with_transifex[:3] == blocks
+        assert "TRANSIFEX UI STRINGS" in with_transifex[3]
+
+    def test_cache_hit_report(self, tmp_path, monkeypatch, capsys):
+        records = [
+            {"mode": "new", "input_tokens": 100, "cache_read_tokens": 0, "cache_write_tokens": 900},
+            {"mode": "diff", "input_tokens": 100, "cache_read_tokens": 900, "cache_write_tokens": 0},
+            {"mode": "diff", "input_tokens": 50, "cache_read_tokens": 950, "cache_write_tokens": 0},
+        ]
+        groups = usage_log.summarize(records, by="mode")
+        assert groups["new"]["cache_hits"] == 0 and groups["new"]["cache_hit_rate"] == 0
+        assert groups["diff"]["cache_hits"] == 2
+        assert groups["diff"]["cache_hit_rate"] == pytest.approx(0.925)
+
+        log = tmp_path / "usage.jsonl"
+        log.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+        monkeypatch.setattr(sys, "argv", ["usage_log.py", "--log", str(log), "--cache"])
+        usage_log.main()
+        out = capsys.readouterr().out
+        assert "diff: 2/2 calls read from cache, 92% of prompt tokens" in out
+        assert "new: 0/1 calls read from cache" in out
+
+
+# ---------------------------------------------------------------------------
+# Batched diff translation
+# ---------------------------------------------------------------------------
+
+class TestDiffBatch:
+    HUNKS = [("docs/en/a.md", "First change."), ("docs/en/b.md", "Second change."),
+             ("docs/en/c.md", "Third change.")]
+
+    def batch_agent(self, *responses):
+        agent = TranslationAgent(test_mode=True, use_cache=False)
+        stub_claude(agent, *responses)
+        return agent
+
+    def test_hunks_share_one_request_and_are_parsed_back(self):
+        agent = self.batch_agent(
+            '<segment id="0">Primer cambio.</segment>\n<segment id="1">\nSegundo cambio.\n</segment>\n'
+            '<segment id="2">Tercer cambio.</segment>'
+        )
+
+        assert agent.translate_diff_batch(self.HUNKS, "es") == [
+            "Primer cambio.", "Segundo cambio.", "Tercer cambio."
+        ]
+        [call] = agent.claude.messages.create.call_args_list
+        content = call.kwargs["messages"][0]["content"]
+        assert '<segment id="1" file="b.md">\nSecond change.\n</segment>' in content[-1]["text"]
+        assert all("cache_control" in block for block in content[:-1])
+
+    def test_requests_are_split_by_size_and_missing_segments_retried(self, monkeypatch):
+        monkeypatch.setattr(translation_agent, "DIFF_BATCH_MAX_CHARS", 30)
+        agent = self.batch_agent(
+            '<segment id="0">Primer cambio.</segment>',  # segment 1 missing
+            '<segment id="2">Tercer cambio.</segment>',
+            "Segundo cambio.",                           # retried alone
+        )
+
+        assert agent.translate_diff_batch(self.HUNKS, "es") == [
+            "Primer cambio.", "Segundo cambio.", "Tercer cambio."
+        ]
+        assert agent.claude.messages.create.call_count == 3
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")  # SDK model deprecation notice
+    def test_failed_batches_are_reported_and_retried_per_segment(self, capsys):
+        agent = self.batch_agent()
+        agent.claude.messages.create.side_effect = [
+            api_error(400),
+            make_response("Primer cambio."), make_response("Segundo cambio."), make_response("Tercer cambio."),
+        ]
+
+        assert agent.translate_diff_batch(self.HUNKS, "es") == [
+            "Primer cambio.", "Segundo cambio.", "Tercer cambio."
+        ]
+        assert "Diff batch request failed (3 segments → ES): Error code: 400" in capsys.readouterr().err
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    def test_auth_errors_stop_the_per_segment_fallback(self, capsys):
+        agent = self.batch_agent()
+        agent.claude.messages.create.side_effect = api_error(401)
+
+        assert agent.translate_diff_batch(self.HUNKS, "es") == [None, None, None]
+        assert agent.claude.messages.create.call_count == 1
+        assert "Not retrying the segments one by one" in capsys.readouterr().err
+
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    def test_rate_limits_still_fall_back_per_segment(self, capsys):
+        agent = self.batch_agent()
+        # A 429 that outlasts the limiter's retries reaches the batch
+        agent.limiter = RateLimiter(max_retries=0)
+        agent.claude.messages.create.side_effect = [
+            api_error(429),
+            make_response("Primer cambio."), make_response("Segundo cambio."), make_response("Tercer cambio."),
+        ]
+
+        assert agent.translate_diff_batch(self.HUNKS, "es") == [
+            "Primer cambio.", "Segundo cambio.", "Tercer cambio."
+        ]
+        assert "Not retrying the segments one by one" not in capsys.readouterr().err
+
+    def test_cli_applies_translated_hunks(self, tmp_path, monkeypatch, capsys):
+        (tmp_path / "docs" / "en").mkdir(parents=True)
+        (tmp_path / "docs" / "es").mkdir()
+        (tmp_path / "docs" / "en" / "a.md").write_text("# A\n\nNew text.\n", encoding="utf-8")
+        target = tmp_path / "docs" / "es" / "a.md"
+        target.write_text("# A\n\nTexto viejo.\n", encoding="utf-8")
+        hunks = tmp_path / "hunks.jsonl"
+        hunks.write_text(json.dumps({"file": "docs/en/a.md", "language": "es",
+                                     "diff": "New text.", "old_content": "Texto viejo."}) + "\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, "argv", ["translation_agent.py", "--diff-batch", str(hunks), "--save"])
+
+        with mock.patch.object(TranslationAgent, "translate_diff_batch", return_value=["Texto nuevo."]):
+            translation_agent.main()
+
+        assert target.read_text(encoding="utf-8") == "# A\n\nTexto nuevo.\n"
+        assert "✅ HUNK OK: a.md → ES" in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# Startup
+# ---------------------------------------------------------------------------
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# Cumulative import time budget for translation_agent + bulk_retranslate, in
+# microseconds (about 0.1s locally; importing anthropic alone takes ~2s)
+IMPORT_BUDGET_US = 600_000
+
+HEAVY_DEPENDENCIES = {"anthropic", "github", "polib", "dotenv", "httpx", "pydantic"}
+
+
+def imported_modules(*args):
+    """{module: cumulative_us} from a fresh `python -X importtime` run"""
+    env = {**os.environ, "PYTHONPATH": str(SCRIPTS_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, env=env, cwd=SCRIPTS_DIR.parent, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestStartup:
+    def test_import_stays_within_budget_without_heavy_dependencies(self):
+        modules = imported_modules("-c", "import translation_agent, bulk_retranslate")
+        assert not HEAVY_DEPENDENCIES & {name.split(".")[0] for name in modules}
+        total = modules["translation_agent"] + modules["bulk_retranslate"]
+        assert total < IMPORT_BUDGET_US, f"imports took {total / 1000:.0f} ms"
+
+    def test_help_does_not_import_the_sdk(self):
+        modules = imported_modules("scripts/translation_agent.py", "--help")
+        assert "anthropic" not in modules
+
+    def test_sdk_is_imported_on_first_use(self):
+        assert translation_agent.anthropic.Anthropic.__module__.startswith("anthropic")
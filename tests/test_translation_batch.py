@@ -0,0 +1,73 @@
+"""
+Tests for scripts/translation_batch.py:
+  - Message Batches backend against a local stub server (bulk --batch)
+"""
+
+import pytest
+
+import translation_agent
+from translation_batch import BatchRunner, chunk_requests
+from batch_stub_server import StubBatchServer
+
+
+class TestBatchBackend:
+    @pytest.fixture
+    def sources(self, tmp_path):
+        paths = []
+        for name in ("a.md", "b.md"):
+            path = tmp_path / name
+            path.write_text(f"# {name}\n\nKoboToolbox text.\n", encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    def client(self, stub):
+        return translation_agent.anthropic.Anthropic(api_key="stub", base_url=stub.url, max_retries=0)
+
+    def test_all_pairs_submitted_in_one_batch(self, agent, sources):
+        jobs = [(agent, path, lang) for path in sources for lang in ("es", "fr")]
+        with StubBatchServer() as stub:
+            results = BatchRunner(self.client(stub), poll_interval=0).run(jobs)
+
+        assert len(stub.batches) == 1
+        requests = stub.batches["msgbatch_0000"]
+        assert [r["custom_id"] for r in requests] == ["job-0000", "job-0001", "job-0002", "job-0003"]
+        assert stub.polls["msgbatch_0000"] == 3  # two status polls + results() lookup
+        assert results[(sources[1], "fr")] == "[FR] # b.md\n\nKoboToolbox text.\n"
+
+    def test_errored_results_are_reported_per_job(self, agent, sources):
+        jobs = [(agent, sources[0], lang) for lang in ("es", "ar")]
+        with StubBatchServer(fail_languages=["ar"]) as stub:
+            results = BatchRunner(self.client(stub), poll_interval=0).run(jobs)
+
+        assert results[(sources[0], "es")].startswith("[ES]")
+        assert isinstance(results[(sources[0], "ar")], RuntimeError)
+
+    def test_cached_pairs_are_not_submitted(self, cached_agent, sources):
+        with StubBatchServer() as stub:
+            runner = BatchRunner(self.client(stub), poll_interval=0)
+            first = runner.run([(cached_agent, sources[0], "es")])
+            second = runner.run([(cached_agent, sources[0], "es")])
+
+        assert len(stub.batches) == 1
+        assert first == second
+
+    def test_bulk_batch_mode_saves_with_postprocessing(self, sources, workdir, monkeypatch):
+        import bulk_retranslate
+
+        with StubBatchServer() as stub:
+            monkeypatch.setenv("ANTHROPIC_BASE_URL", stub.url)
+            bulk = bulk_retranslate.BulkRetranslator(
+                ["es"], delay=0, use_cache=False, batch=True, poll_interval=0
+            )
+            bulk.run(source_dir=workdir)
+
+        assert bulk.stats["successful"] == 2
+        saved = (workdir / "docs" / "es" / "a.md").read_text(encoding="utf-8")
+        assert saved.startswith("[ES] # a.md")
+
+    def test_chunking_respects_request_limit(self, monkeypatch):
+        import translation_batch
+
+        monkeypatch.setattr(translation_batch, "MAX_BATCH_REQUESTS", 2)
+        chunks = chunk_requests([{"custom_id": str(i)} for i in range(5)])
+        assert [len(c) for c in chunks] == [2, 2, 1]
@@ -0,0 +1,66 @@
+"""
+Tests for scripts/translation_cache.py:
+  - content-addressed translation cache used by TranslationAgent
+"""
+
+import translation_agent
+from translation_cache import TranslationCache
+from api_stubs import make_response, stub_claude
+
+
+class TestTranslationCache:
+    def test_key_changes_with_each_input(self):
+        base = ("# Doc", "es", "skillhash", "model-a", 0.3)
+        key = TranslationCache.make_key(*base)
+        for i, changed in enumerate(["# Doc 2", "fr", "otherskill", "model-b", 0.5]):
+            args = list(base)
+            args[i] = changed
+            assert TranslationCache.make_key(*args) != key
+
+    def test_roundtrip_and_persistence(self, tmp_path):
+        path = tmp_path / "c.sqlite3"
+        cache = TranslationCache(path)
+        assert cache.get("k") is None
+        cache.put("k", "hola", "docs/en/a.md", "es", "m")
+        cache.close()
+        assert TranslationCache(path).get("k") == "hola"
+
+    def test_no_file_created_until_used(self, tmp_path):
+        TranslationCache(tmp_path / "sub" / "c.sqlite3")
+        assert not (tmp_path / "sub").exists()
+
+    def test_hit_skips_api_call(self, cached_agent, source_file):
+        stub_claude(cached_agent, "hola")
+
+        first = cached_agent.translate_file(str(source_file), "es")
+        second = cached_agent.translate_file(str(source_file), "es")
+
+        assert first == second == "hola"
+        assert cached_agent.claude.messages.create.call_count == 1
+
+    def test_source_change_is_a_miss(self, cached_agent, source_file):
+        stub_claude(cached_agent, "hola")
+        cached_agent.translate_file(str(source_file), "es")
+
+        source_file.write_text("# Changed\n", encoding="utf-8")
+        cached_agent.translate_file(str(source_file), "es")
+        assert cached_agent.claude.messages.create.call_count == 2
+
+    def test_skill_change_only_invalidates_that_language(self, cached_agent, source_file):
+        stub_claude(cached_agent, "x")
+        cached_agent.translate_file(str(source_file), "es")
+        cached_agent.translate_file(str(source_file), "fr")
+
+        cached_agent.skill_cache["fr"] = dict(cached_agent.skill_cache["fr"], main="edited")
+        cached_agent.translate_file(str(source_file), "es")
+        cached_agent.translate_file(str(source_file), "fr")
+        assert cached_agent.claude.messages.create.call_count == 3
+
+    def test_truncated_output_not_cached(self, cached_agent, source_file):
+        truncated = make_response("hol")
+        truncated.stop_reason = "max_tokens"
+        stub_claude(cached_agent, truncated)
+        cached_agent.translate_file(str(source_file), "es")
+        cached_agent.translate_file(str(source_file), "es")
+        # Every continuation stopped at max_tokens too
+        assert cached_agent.claude.messages.create.call_count == 2 * (1 + translation_agent.MAX_CONTINUATIONS)
@@ -0,0 +1,110 @@
+"""
+Tests for scripts/translation_manifest.py:
+  - staleness manifest and --stale-only bulk runs
+"""
+
+import json
+import sys
+
+import pytest
+
+from translation_agent import TranslationAgent
+from model_routing import DEFAULT_ROUTES, STANDARD_MODEL
+from translation_manifest import TranslationManifest, source_hash
+from api_stubs import stub_claude
+
+
+class TestStalenessManifest:
+    def test_stale_reasons(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        manifest = TranslationManifest(path)
+        assert manifest.stale_reasons("docs/en/a.md", "es", "src", "skill", "m1") == ["new"]
+        manifest.record("docs/en/a.md", "es", "src", "skill", "m1")
+
+        reopened = TranslationManifest(path)
+        assert reopened.stale_reasons("docs/en/a.md", "es", "src", "skill", "m1") == []
+        assert reopened.stale_reasons("docs/en/a.md", "es", "src2", "skill", "m1") == ["source"]
+        assert reopened.stale_reasons("docs/en/a.md", "es", "src", "skill2", "m2") == ["skill", "model"]
+        assert reopened.stale_reasons("docs/en/a.md", "fr", "src", "skill", "m1") == ["new"]
+        assert list(json.loads(path.read_text(encoding="utf-8"))) == ["a.md"]
+
+    def test_skill_bundle_hash_ignores_ui_string_options(self):
+        plain = TranslationAgent(test_mode=True, use_cache=False)
+        full = TranslationAgent(test_mode=True, use_cache=False, include_transifex=True)
+        assert plain.skill_bundle_hash("es") == full.skill_bundle_hash("es")
+        assert plain.skill_bundle_hash("es") != plain.skill_bundle_hash("fr")
+
+    def test_saving_a_translation_records_its_inputs(self, agent, workdir):
+        source = workdir / "docs" / "en" / "a.md"
+        source.write_text("# A\n\nText.\n", encoding="utf-8")
+        agent.manifest = TranslationManifest(workdir / "manifest.json")
+
+        agent.save_translation("# A\n\nTexto.\n", "docs/en/a.md", "es")
+
+        entry = agent.manifest.entry("docs/en/a.md", "es")
+        assert entry["source"] == source_hash(source)
+        assert entry["skill"] == agent.skill_bundle_hash("es")
+        assert entry["model"] == STANDARD_MODEL
+
+    def test_the_model_that_produced_the_translation_is_recorded(self, workdir):
+        source = workdir / "docs" / "en" / "a.md"
+        source.write_text("# A\n\nA few plain words.\n", encoding="utf-8")
+        agent = TranslationAgent(test_mode=True, use_cache=False, routes=DEFAULT_ROUTES)
+        agent.manifest = TranslationManifest(workdir / "manifest.json")
+        stub_claude(agent, "# A\n\nPocas palabras.\n")
+
+        # Forcing the complexity routes away from the simple document's fast model
+        translation = agent.translate_file("docs/en/a.md", "es", complexity="complex")
+        agent.save_translation(translation, "docs/en/a.md", "es")
+
+        used = agent.claude.messages.create.call_args.kwargs["model"]
+        assert used != agent._file_model("docs/en/a.md")
+        assert agent.manifest.entry("docs/en/a.md", "es")["model"] == used
+        assert agent.manifest.stale_reasons("docs/en/a.md", "es", source_hash(source),
+                                            agent.skill_bundle_hash("es"),
+                                            agent._file_model("docs/en/a.md")) == ["model"]
+
+    def test_fail_on_new_stops_when_pairs_have_no_entry(self, workdir, monkeypatch, capsys):
+        import translation_manifest
+
+        for lang in ("en", "es"):
+            (workdir / "docs" / lang).mkdir(exist_ok=True)
+            (workdir / "docs" / lang / "a.md").write_text("# A\n\nText.\n", encoding="utf-8")
+        monkeypatch.setenv("TRANSLATION_MANIFEST", str(workdir / "manifest.json"))
+
+        def run(*args):
+            monkeypatch.setattr(sys, "argv", ["translation_manifest.py", *args])
+            translation_manifest.main()
+
+        with pytest.raises(SystemExit):
+            run("--stale", "--fail-on-new", "--language", "es")
+        assert "1 pairs have no manifest entry" in capsys.readouterr().err
+
+        run("--init", "--language", "es")
+        run("--stale", "--fail-on-new", "--language", "es")
+        assert "0 stale (0 without an entry), 1 up to date" in capsys.readouterr().out
+
+    def test_stale_only_translates_changed_pairs(self, workdir, make_bulk, monkeypatch):
+        source_dir = workdir / "docs" / "en"
+        for name in ("a", "b"):
+            (source_dir / f"{name}.md").write_text(f"# {name}\n\nText.\n", encoding="utf-8")
+        monkeypatch.setenv("TRANSLATION_MANIFEST", str(workdir / "manifest.json"))
+
+        def run():
+            bulk = make_bulk(workers=2, stale_only=True)
+            bulk.run(source_dir=source_dir)
+            return bulk
+
+        first = run()
+        assert (first.stats["up_to_date"], first.stats["successful"]) == (0, 4)
+
+        second = run()
+        assert (second.stats["up_to_date"], second.stats["successful"]) == (4, 0)
+        assert second.agent.claude.messages.create.call_count == 0
+
+        (source_dir / "b.md").write_text("# b\n\nEdited.\n", encoding="utf-8")
+        third = run()
+        assert (third.stats["up_to_date"], third.stats["successful"]) == (2, 2)
+        sent = [c.kwargs["messages"][0]["content"][-1]["text"]
+                for c in third.agent.claude.messages.create.call_args_list]
+        assert all("Edited." in text for text in sent)
@@ -0,0 +1,94 @@
+"""
+Tests for scripts/translation_memory.py:
+  - paragraph-level translation memory built from aligned docs/<lang> articles
+"""
+
+import pytest
+
+from translation_agent import TranslationAgent
+from translation_memory import TranslationMemory, split_blocks
+from api_stubs import stub_claude
+
+
+NOTE_EN = '<p class="note"> To learn more, see the Help Center article.</p>'
+NOTE_ES = '<p class="note"> Para obtener más información, consulta el Centro de ayuda.</p>'
+
+
+@pytest.fixture
+def docs_root(tmp_path):
+    root = tmp_path / "docs"
+    (root / "en").mkdir(parents=True)
+    (root / "es").mkdir()
+    (root / "en" / "old.md").write_text(
+        f"# Old article\n\nThis paragraph is specific to the old article.\n\n{NOTE_EN}\n",
+        encoding="utf-8",
+    )
+    (root / "es" / "old.md").write_text(
+        f"# Artículo antiguo\n\nEste párrafo es específico del artículo antiguo.\n\n{NOTE_ES}\n",
+        encoding="utf-8",
+    )
+    # Misaligned pair (different block count) must be ignored
+    (root / "en" / "skewed.md").write_text("# A\n\nOne paragraph here, long enough.\n", encoding="utf-8")
+    (root / "es" / "skewed.md").write_text("# A\n\nUn párrafo.\n\nOtro párrafo extra.\n", encoding="utf-8")
+    return root
+
+
+class TestTranslationMemory:
+    def test_split_blocks_keeps_fenced_code_whole(self):
+        content = "Intro paragraph\n\n```\nline 1\n\nline 2\n```\n\nOutro\n"
+        blocks = [content[a:b].strip() for a, b in split_blocks(content)]
+        assert blocks == ["Intro paragraph", "```\nline 1\n\nline 2\n```", "Outro"]
+
+    def test_builds_from_aligned_articles_only(self, docs_root):
+        memory = TranslationMemory("es", docs_root)
+        assert memory.articles_used == 1
+        assert memory.lookup(NOTE_EN) == NOTE_ES
+        assert memory.lookup("One paragraph here, long enough.") is None
+
+    def test_normalized_match_ignores_whitespace(self, docs_root):
+        memory = TranslationMemory("es", docs_root)
+        assert memory.lookup(NOTE_EN.replace(" To", "\n  To")) == NOTE_ES
+
+    def test_h1_and_short_blocks_are_not_reused(self, docs_root):
+        memory = TranslationMemory("es", docs_root)
+        assert memory.lookup("# Old article") is None
+
+    def test_mask_and_unmask_roundtrip(self, docs_root):
+        memory = TranslationMemory("es", docs_root)
+        masked, matches = memory.mask(f"# New\n\nFresh text to translate.\n\n{NOTE_EN}\n")
+        assert NOTE_EN not in masked
+        assert "<!-- TM:0 -->" in masked
+        translated = "# Nuevo\n\nTexto nuevo.\n\n<!-- TM:0 -->\n"
+        assert TranslationMemory.unmask(translated, matches) == f"# Nuevo\n\nTexto nuevo.\n\n{NOTE_ES}\n"
+
+    def test_unmask_rejects_lost_placeholders(self, docs_root):
+        memory = TranslationMemory("es", docs_root)
+        _, matches = memory.mask(f"Fresh text to translate.\n\n{NOTE_EN}\n")
+        assert TranslationMemory.unmask("Texto nuevo.\n", matches) is None
+
+    def test_agent_sends_only_unmatched_blocks(self, docs_root, tmp_path):
+        source = tmp_path / "new.md"
+        source.write_text(f"# New\n\nFresh text to translate.\n\n{NOTE_EN}\n", encoding="utf-8")
+        agent = TranslationAgent(test_mode=True, use_cache=False, use_memory=True,
+                                 memory_root=str(docs_root))
+        stub_claude(agent, "# Nuevo\n\n<!-- TM:0 -->\n")
+
+        translation = agent.translate_file(str(source), "es")
+
+        prompt = agent.claude.messages.create.call_args.kwargs["messages"][0]["content"][-1]["text"]
+        assert NOTE_EN not in prompt
+        assert "<!-- TM:0 -->" in prompt
+        assert translation == f"# Nuevo\n\n{NOTE_ES}\n"
+
+    def test_agent_falls_back_when_placeholders_dropped(self, docs_root, tmp_path):
+        source = tmp_path / "new.md"
+        source.write_text(f"Fresh text to translate.\n\n{NOTE_EN}\n", encoding="utf-8")
+        agent = TranslationAgent(test_mode=True, use_cache=False, use_memory=True,
+                                 memory_root=str(docs_root))
+        stub_claude(agent, "Texto nuevo.", "Texto nuevo.\n\nNota completa.")
+
+        translation = agent.translate_file(str(source), "es")
+
+        assert translation == "Texto nuevo.\n\nNota completa."
+        retry_prompt = agent.claude.messages.create.call_args.kwargs["messages"][0]["content"][-1]["text"]
+        assert NOTE_EN in retry_prompt
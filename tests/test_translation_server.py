@@ -0,0 +1,101 @@
+"""
+Tests for scripts/translation_server.py and scripts/translation_client.py:
+  - long-lived translation daemon and its thin client
+"""
+
+from pathlib import Path
+
+import pytest
+
+from translation_agent import TranslationAgent
+import translation_client
+from translation_server import JobError, TranslationServer
+from api_stubs import stub_claude
+
+
+class TestTranslationServer:
+    @pytest.fixture
+    def workdir(self, workdir):
+        source = workdir / "docs" / "en" / "sample.md"
+        source.write_text("# Sample\n\nSome KoboToolbox text.\n", encoding="utf-8")
+        return workdir
+
+    @pytest.fixture
+    def factory(self):
+        agents = []
+
+        def make(**kwargs):
+            agent = TranslationAgent(**{**kwargs, "use_cache": False})
+            stub_claude(agent, "# Muestra\n\nTexto de KoboToolbox.\n")
+            agents.append(agent)
+            return agent
+
+        make.agents = agents
+        return make
+
+    def test_jobs_reuse_one_warm_agent_over_a_unix_socket(self, workdir, factory):
+        socket_path = str(workdir / "agent.sock")
+        with TranslationServer(socket_path=socket_path, agent_factory=factory):
+            first = translation_client.translate({"file": "docs/en/sample.md", "language": "es"}, socket_path)
+            second = translation_client.translate(
+                {"file": "docs/en/sample.md", "language": "es", "save": True}, socket_path)
+            status = translation_client.health(socket_path)
+
+        assert first["translation"].startswith("# Muestra")
+        assert first["validation"]["has_content"]
+        assert second["saved_to"] == str(Path("docs/es/sample.md"))
+        assert (workdir / "docs" / "es" / "sample.md").exists()
+        assert (status["jobs"], status["agents"]) == (2, 1)
+        assert len(factory.agents) == 1
+        assert not Path(socket_path).exists()
+
+    def test_option_sets_get_their_own_agent_sharing_one_client(self, workdir, factory):
+        with TranslationServer(port=0, agent_factory=factory) as server:
+            translation_client.translate({"file": "docs/en/sample.md", "language": "es"}, server.address)
+            translation_client.translate(
+                {"file": "docs/en/sample.md", "language": "fr", "ui_strings": "retrieval"}, server.address)
+
+        first, second = factory.agents
+        assert second.ui_strings == "retrieval"
+        assert first.claude is second.claude
+        assert first.skill_files is second.skill_files
+        assert first.claude.messages.create.call_count == 2
+
+    def test_update_jobs_return_the_translated_diff(self, workdir, factory):
+        with TranslationServer(port=0, agent_factory=factory) as server:
+            result = translation_client.translate(
+                {"file": "docs/en/sample.md", "language": "es", "diff": "Some new text."}, server.address)
+        prompt = factory.agents[0].claude.messages.create.call_args.kwargs["messages"][0]["content"][-1]["text"]
+        assert "---BEGIN DIFF TO TRANSLATE---\nSome new text." in prompt
+        assert result["validation"] is None
+
+    def test_saved_updates_go_through_save_translation(self, workdir, factory, monkeypatch):
+        monkeypatch.setenv("TRANSLATION_MANIFEST", str(workdir / "manifest.json"))
+        target = workdir / "docs" / "es" / "sample.md"
+        target.parent.mkdir()
+        target.write_text("# Muestra\n\nTexto viejo.\n", encoding="utf-8")
+        with TranslationServer(port=0, agent_factory=factory) as server:
+            result = translation_client.translate(
+                {"file": "docs/en/sample.md", "language": "es", "diff": "Some KoboToolbox text.",
+                 "old_content": "Texto viejo.", "save": True}, server.address)
+
+        assert result["saved_to"] == str(Path("docs/es/sample.md"))
+        assert "Texto viejo." not in target.read_text(encoding="utf-8")
+        assert factory.agents[0].manifest.entry("docs/en/sample.md", "es") is not None
+
+    def test_invalid_options_are_rejected_as_bad_requests(self, workdir, factory):
+        with TranslationServer(port=0, agent_factory=factory) as server:
+            with pytest.raises(JobError, match="'ui_strings' must be 'full' or 'retrieval'"):
+                server.run_job({"file": "docs/en/sample.md", "language": "es", "ui_strings": "some"})
+            with pytest.raises(JobError, match="'use_cache' must be true or false"):
+                server.run_job({"file": "docs/en/sample.md", "language": "es", "use_cache": "yes"})
+        assert factory.agents == []
+
+    def test_failures_are_reported_to_the_client(self, workdir, factory):
+        with TranslationServer(port=0, agent_factory=factory) as server:
+            with pytest.raises(translation_client.DaemonError, match="Source file not found"):
+                translation_client.translate({"file": "docs/en/missing.md", "language": "es"}, server.address)
+            assert translation_client.shutdown(server.address) == {"ok": True}
+
+        with pytest.raises(translation_client.DaemonError, match="not reachable"):
+            translation_client.health(str(workdir / "no-daemon.sock"))
@@ -0,0 +1,62 @@
+"""
+Tests for scripts/ui_string_index.py:
+  - relevance-filtered UI string retrieval (--ui-strings retrieval)
+"""
+
+from translation_agent import TranslationAgent
+from ui_string_index import AhoCorasick, UIStringIndex, load_index, parse_transifex_table
+from api_stubs import stub_claude
+
+
+TRANSIFEX_SAMPLE = """## Core UI Actions & Buttons
+
+| English UI String | Spanish (Transifex) | French (Transifex) | Arabic (Transifex) |
+|-------------------|---------------------|--------------------|--------------------|\\n| Add | Agregar | Ajouter | إضافة |
+| Deploy | Implementar | Déployer | نشر |
+| Add Question | Agregar pregunta | Ajouter une question | إضافة سؤال |
+"""
+
+
+class TestUIStringIndex:
+    def test_parses_rows_glued_to_separator(self):
+        strings = parse_transifex_table(TRANSIFEX_SAMPLE)
+        assert [s.english for s in strings] == ["Add", "Deploy", "Add Question"]
+        assert strings[0].translation("fr") == "Ajouter"
+
+    def test_aho_corasick_finds_overlapping_patterns(self):
+        automaton = AhoCorasick({"he": 0, "she": 1, "hers": 2})
+        found = sorted((start, payload) for start, _, payload in automaton.iter_matches("ushers"))
+        assert found == [(1, 1), (2, 0), (2, 2)]
+
+    def test_matches_whole_words_case_insensitively(self):
+        index = UIStringIndex(parse_transifex_table(TRANSIFEX_SAMPLE))
+        found = {s.english for s in index.find("Click **DEPLOY**, then add question 2.")}
+        assert found == {"Deploy", "Add", "Add Question"}
+        assert index.find("Enter the Address of the server.") == []
+
+    def test_render_uses_target_language_only(self):
+        index = UIStringIndex(parse_transifex_table(TRANSIFEX_SAMPLE))
+        rendered = index.render("Click Deploy.", "fr")
+        assert "| Deploy | Déployer |" in rendered
+        assert "Implementar" not in rendered
+        assert index.render("Nothing relevant here.", "fr") == ""
+
+    def test_real_references_are_indexed(self):
+        index = load_index()
+        assert any(s.source == "transifex" for s in index.strings)
+        assert any(s.source == "collect" for s in index.strings)
+
+    def test_agent_injects_rows_after_cached_prefix(self, tmp_path):
+        source = tmp_path / "doc.md"
+        source.write_text("# Doc\n\nClick **Deploy** to publish.\n", encoding="utf-8")
+        agent = TranslationAgent(test_mode=True, use_cache=False, ui_strings="retrieval",
+                                 include_transifex=True, include_collect=True)
+        stub_claude(agent, "# Doc")
+
+        agent.translate_file(str(source), "es")
+
+        *prefix, tail = agent.claude.messages.create.call_args.kwargs["messages"][0]["content"]
+        prefix_text = "".join(block["text"] for block in prefix)
+        assert "| Deploy |" in tail["text"]
+        assert "Core UI Actions" not in prefix_text  # full table not pasted
+        assert len(prefix_text) < 100_000
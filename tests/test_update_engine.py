@@ -0,0 +1,99 @@
+"""
+Tests for scripts/update_engine.py:
+  - hunk-aware update engine for existing translations
+"""
+
+import sys
+from unittest import mock
+
+import translation_agent
+from translation_agent import TranslationAgent
+import update_engine
+
+
+class TestUpdateEngine:
+    OLD = ("# Title\n\nA hard-wrapped paragraph\nover two lines.\n\n"
+           "- Open the form\n- Click Deploy\n\n## Next\n\nLast paragraph.\n")
+    TRANSLATION = ("# Título\n\nUn párrafo en una sola línea.\n\n"
+                   "- Abra el formulario\n- Haga clic en Implementar\n\n## Siguiente\n\nÚltimo párrafo.\n")
+
+    def test_parses_hunks_per_file(self):
+        diff = (
+            "diff --git a/docs/en/a.md b/docs/en/a.md\n--- a/docs/en/a.md\n+++ b/docs/en/a.md\n"
+            "@@ -3 +3,2 @@\n-old line\n+new line\n+another\n@@ -9,0 +11 @@\n+inserted\n"
+            "diff --git a/docs/en/b.md b/docs/en/b.md\n--- a/docs/en/b.md\n+++ b/docs/en/b.md\n"
+            "@@ -4,2 +3,0 @@\n-gone\n-also gone\n"
+        )
+        hunks = update_engine.parse_unified_diff(diff)
+        assert hunks["docs/en/a.md"] == [
+            update_engine.Hunk(2, 3, 2, 4, ("old line",), ("new line", "another")),
+            update_engine.Hunk(9, 9, 10, 11, (), ("inserted",)),
+        ]
+        assert hunks["docs/en/b.md"] == [update_engine.Hunk(3, 5, 3, 3, ("gone", "also gone"), ())]
+
+    def test_hunks_land_at_their_aligned_positions(self):
+        new = self.OLD.replace("- Click Deploy", "- Click Deploy now")
+        new = new.replace("Last paragraph.\n", "Last paragraph.\n\nAn added note.\n")
+        new = new.replace("over two lines.", "over two wrapped lines.")
+
+        updates = update_engine.plan_updates(self.OLD, new, self.TRANSLATION)
+        assert [u.source_text.strip() for u in updates] == [
+            "A hard-wrapped paragraph\nover two wrapped lines.",  # widened to the whole block
+            "- Click Deploy now",                                 # list item replaced alone
+            "An added note.",
+        ]
+        assert all(u.aligned for u in updates)
+
+        updated, applied = update_engine.apply_updates(
+            self.TRANSLATION, updates,
+            ["Un párrafo en dos líneas.", "- Haga clic en Implementar ahora", "Una nota añadida."],
+        )
+        assert all(applied)
+        assert updated == ("# Título\n\nUn párrafo en dos líneas.\n\n"
+                           "- Abra el formulario\n- Haga clic en Implementar ahora\n\n"
+                           "## Siguiente\n\nÚltimo párrafo.\n\nUna nota añadida.\n")
+
+    def test_deletions_need_no_translation(self):
+        new = self.OLD.replace("- Open the form\n", "")
+        updates = update_engine.plan_updates(self.OLD, new, self.TRANSLATION)
+        updated, applied = update_engine.apply_updates(self.TRANSLATION, updates, [None])
+        assert applied == [True]
+        assert "Abra el formulario" not in updated and "Implementar" in updated
+
+    def test_changes_without_counterpart_are_not_aligned(self):
+        translation = "# Título\n\nTodo en un solo bloque.\n"  # different headings and blocks
+        new = self.OLD.replace("Last paragraph.", "Final paragraph.")
+        [update] = update_engine.plan_updates(self.OLD, new, translation)
+        assert not update.aligned
+
+    def test_update_translations_batches_per_language_and_saves(self, workdir, monkeypatch):
+        for lang in ("es", "fr"):
+            (workdir / "docs" / lang).mkdir()
+        source = workdir / "docs" / "en" / "a.md"
+        source.write_text(self.OLD.replace("Last paragraph.", "Final paragraph."), encoding="utf-8")
+        (workdir / "docs" / "es" / "a.md").write_text(self.TRANSLATION, encoding="utf-8")
+        (workdir / "docs" / "fr" / "a.md").write_text("# Titre\n\nTout en un bloc.\n", encoding="utf-8")
+        monkeypatch.setattr(update_engine, "_git_show", lambda revision, path: self.OLD)
+
+        agent = TranslationAgent(test_mode=True, use_cache=False)
+        with mock.patch.object(agent, "translate_diff_batch", return_value=["Párrafo final."]) as batch:
+            results = update_engine.update_translations(
+                agent, [("docs/en/a.md", "es"), ("docs/en/a.md", "fr")], "HEAD~1", save=True
+            )
+
+        batch.assert_called_once_with([("docs/en/a.md", "Final paragraph.")], "es")
+        assert results[("docs/en/a.md", "es")]["status"] == "updated"
+        assert results[("docs/en/a.md", "fr")]["status"] == "full"
+        saved = (workdir / "docs" / "es" / "a.md").read_text(encoding="utf-8")
+        assert saved.endswith("## Siguiente\n\nPárrafo final.\n")
+
+    def test_cli_forwards_prompt_options_to_the_agent(self, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["update_engine.py", "--base", "HEAD~1", "--jobs", "docs/en/a.md:es",
+                                          "--include-collect", "--ui-strings", "retrieval"])
+        with mock.patch.object(translation_agent, "TranslationAgent") as agent_class, \
+                mock.patch.object(update_engine, "update_translations", return_value={}):
+            update_engine.main()
+
+        options = agent_class.call_args.kwargs
+        assert (options["include_transifex"], options["include_collect"], options["ui_strings"]) == (
+            False, True, "retrieval")
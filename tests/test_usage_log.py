@@ -0,0 +1,76 @@
+"""
+Tests for scripts/usage_log.py:
+  - JSONL usage and cost telemetry of every API call
+"""
+
+import json
+import sys
+
+import pytest
+
+import translation_agent
+import usage_log
+from api_stubs import make_response, stub_claude
+
+
+class TestUsageLog:
+    @pytest.fixture
+    def log(self, tmp_path, monkeypatch):
+        path = tmp_path / "usage.jsonl"
+        monkeypatch.setenv("TRANSLATION_USAGE_LOG", str(path))
+        return path
+
+    def test_agent_writes_one_record_per_call(self, agent, source_file, log):
+        stub_claude(agent, make_response("# Muestra", input_tokens=1_000_000, output_tokens=100_000))
+
+        agent.translate_file(str(source_file), "es")
+
+        [entry] = usage_log.read_records(log)
+        assert entry["file"] == str(source_file)
+        assert entry["language"] == "es"
+        assert entry["mode"] == "new"
+        assert entry["run"] == usage_log.RUN_ID
+        assert entry["input_tokens"] == 1_000_000
+        assert entry["latency_s"] >= 0
+        assert entry["cost_usd"] == pytest.approx(3.00 + 1.50)
+
+    def test_diff_calls_are_recorded_as_diff(self, agent, source_file, log):
+        stub_claude(agent, "Hola")
+
+        agent.translate_file(str(source_file), "es", is_update=True, diff_content="Hello")
+
+        assert [r["mode"] for r in usage_log.read_records(log)] == ["diff"]
+
+    def test_batch_and_cache_pricing(self):
+        tokens = {"input_tokens": 0, "output_tokens": 1_000_000,
+                  "cache_read_tokens": 1_000_000, "cache_write_tokens": 1_000_000}
+        assert usage_log.estimate_cost(tokens) == pytest.approx(15.00 + 0.30 + 3.75)
+        assert usage_log.estimate_cost(tokens, batch=True) == pytest.approx((15.00 + 0.30 + 3.75) / 2)
+
+    def test_logging_can_be_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("TRANSLATION_USAGE_LOG", "off")
+        entry = usage_log.record("a.md", "fr", "new", make_response("").usage, translation_agent.MODEL)
+        assert entry["cost_usd"] > 0
+        assert usage_log.log_path() is None
+
+    def test_aggregator_filters_by_run_and_groups(self, log, monkeypatch, capsys):
+        records = [
+            {"run": "r1", "file": "a.md", "language": "es", "mode": "new", "cost_usd": 0.5,
+             "input_tokens": 10, "output_tokens": 20, "latency_s": 2.0},
+            {"run": "r1", "file": "a.md", "language": "fr", "mode": "new", "cost_usd": 0.25,
+             "input_tokens": 10, "output_tokens": 20, "latency_s": 1.0},
+            {"run": "r2", "file": "b.md", "language": "es", "mode": "diff", "cost_usd": 9.0},
+        ]
+        log.write_text("\n".join(json.dumps(r) for r in records) + "\nnot json\n", encoding="utf-8")
+
+        groups = usage_log.summarize(usage_log.read_records(log), by="language")
+        assert groups["es"]["calls"] == 2
+        assert groups["es"]["cost_usd"] == pytest.approx(9.5)
+
+        monkeypatch.setattr(sys, "argv", ["usage_log.py", "--run", "r1", "--total-cost"])
+        usage_log.main()
+        assert capsys.readouterr().out.strip() == "0.7500"
+
+        monkeypatch.setattr(sys, "argv", ["usage_log.py", "--last", "--by", "mode"])
+        usage_log.main()
+        assert "diff: 1 calls" in capsys.readouterr().out